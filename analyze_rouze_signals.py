@@ -1,80 +1,194 @@
+import argparse
 import json
-import os
-from collections import Counter
+import sys
 
-def analyze_reddit_signals(filepath, vertical_name):
-    """Analyze Reddit signal JSON"""
+from signal_aggregator import DEFAULT_RANK_BY, DEFAULT_TOP_K, RANKING_KEYS, SignalAggregator
+from signal_binary import DEFAULT_BINARY_DIR
+from signal_checkpoint import DEFAULT_CACHE_PATH, CheckpointCache
+from signal_dedup import deduplicate
+from signal_engine import DEFAULT_CHUNK_BYTES, analyze_files
+
+VERTICALS = [
+    ('signals/reddit_healthcare_adverse_events.json', '🏥 HEALTHCARE - Adverse Events'),
+    ('signals/reddit_healthcare_market_research.json', '🏥 HEALTHCARE - Market Research'),
+    ('signals/reddit_saas_market_analysis.json', '💻 SAAS - Market Analysis'),
+    ('signals/reddit_saas_startups.json', '💻 SAAS - Startups'),
+    ('signals/reddit_ecommerce_validation.json', '🛒 ECOMMERCE - Validation'),
+    ('signals/reddit_ecommerce_dropshipping.json', '🛒 ECOMMERCE - Dropshipping'),
+]
+
+TOP_HEADINGS = {
+    'score': 'most upvoted',
+    'comments': 'most commented',
+    'engagement': 'most engagement',
+}
+
+
+def print_report(aggregator, filepath):
+    """Print the per-vertical engagement report from a full-corpus aggregate"""
+    if not aggregator.total_signals:
+        print(f"⚠️  No items found in {filepath}")
+        return
+
+    print(f"✅ Total signals: {aggregator.total_signals}")
+
+    if not aggregator.count:
+        return
+
+    print(f"\n📈 Engagement metrics:")
+    print(f"   • Average upvotes: {aggregator.total_score // aggregator.count}")
+    print(f"   • Average comments: {aggregator.total_comments // aggregator.count}")
+    print(f"   • Total engagement: {aggregator.total_engagement}")
+
+    for key in aggregator.rank_by:
+        top = aggregator.top(key)
+        if not top:
+            continue
+        print(f"\n🔥 Top {aggregator.top_k} discussions ({TOP_HEADINGS[key]}):")
+        for i, signal in enumerate(top, 1):
+            print(f"   {i}. [{signal['score']} upvotes, {signal['comments']} comments] "
+                  f"{signal['title'][:70]}...")
+
+
+def print_vertical_header(vertical_name):
     print(f"\n{'='*60}")
     print(f"📊 {vertical_name} VERTICAL ANALYSIS")
     print(f"{'='*60}")
-    
-    if not os.path.exists(filepath):
+
+
+def print_result(filepath, result):
+    """Print a vertical's report, or the error its file produced"""
+    if result is None:
         print(f"❌ File not found: {filepath}")
-        return
-    
-    try:
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        # Handle both list and nested data structures
-        items = []
-        if isinstance(data, list):
-            items = data
-        elif isinstance(data, dict) and 'data' in data:
-            if isinstance(data['data'], list):
-                items = data['data']
-            elif 'children' in data['data']:
-                items = [child.get('data', {}) for child in data['data']['children']]
-        
-        if not items:
-            print(f"⚠️  No items found in {filepath}")
-            return
-        
-        print(f"✅ Total signals: {len(items)}")
-        
-        # Extract titles and scores
-        titles = []
-        total_score = 0
-        total_comments = 0
-        
-        for item in items[:100]:  # First 100
-            if isinstance(item, dict):
-                title = item.get('title', '')
-                score = item.get('score', 0)
-                comments = item.get('comments', item.get('num_comments', 0))
-                
-                if title:
-                    titles.append((title, score, comments))
-                    total_score += score
-                    total_comments += comments
-        
-        if titles:
-            avg_engagement = (total_score + total_comments) // len(titles) if titles else 0
-            print(f"\n📈 Engagement metrics:")
-            print(f"   • Average upvotes: {total_score // len(titles)}")
-            print(f"   • Average comments: {total_comments // len(titles)}")
-            print(f"   • Total engagement: {total_score + total_comments}")
-            
-            print(f"\n🔥 Top 10 discussions (most upvoted):")
-            sorted_titles = sorted(titles, key=lambda x: x[1], reverse=True)
-            for i, (title, score, comments) in enumerate(sorted_titles[:10], 1):
-                print(f"   {i}. [{score} upvotes] {title[:70]}...")
-    
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON parsing error: {e}")
-    except Exception as e:
-        print(f"❌ Error: {e}")
-
-# Analyze all verticals
-print("\n\n🎯 ROUZE MARKET DEMAND SIGNALS ANALYSIS\n")
-
-analyze_reddit_signals('signals/reddit_healthcare_adverse_events.json', '🏥 HEALTHCARE - Adverse Events')
-analyze_reddit_signals('signals/reddit_healthcare_market_research.json', '🏥 HEALTHCARE - Market Research')
-analyze_reddit_signals('signals/reddit_saas_market_analysis.json', '💻 SAAS - Market Analysis')
-analyze_reddit_signals('signals/reddit_saas_startups.json', '💻 SAAS - Startups')
-analyze_reddit_signals('signals/reddit_ecommerce_validation.json', '🛒 ECOMMERCE - Validation')
-analyze_reddit_signals('signals/reddit_ecommerce_dropshipping.json', '🛒 ECOMMERCE - Dropshipping')
-
-print("\n\n" + "="*60)
-print("✅ ANALYSIS COMPLETE")
-print("="*60)
+    elif isinstance(result, json.JSONDecodeError):
+        print(f"❌ JSON parsing error: {result}")
+    elif isinstance(result, Exception):
+        print(f"❌ Error: {result}")
+    else:
+        print_report(result, filepath)
+
+
+def analyze_reddit_signals(filepath, vertical_name, top_k=DEFAULT_TOP_K, rank_by=DEFAULT_RANK_BY):
+    """Analyze Reddit signal JSON or JSONL"""
+    print_vertical_header(vertical_name)
+
+    # One streaming pass over the whole corpus: exact totals, bounded top-K
+    result = analyze_files([filepath], workers=1, top_k=top_k, rank_by=rank_by).get(filepath)
+    print_result(filepath, result)
+    return result if isinstance(result, SignalAggregator) else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='ROUZE market demand signals analysis')
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K,
+                        help=f'Number of top discussions to list (default {DEFAULT_TOP_K})')
+    parser.add_argument('--rank-by', default=','.join(DEFAULT_RANK_BY),
+                        help=f"Comma-separated ranking keys: {', '.join(RANKING_KEYS)}")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: CPU count; 1 runs serially)')
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_BYTES // (1024 * 1024),
+                        help='Split JSONL files larger than this into parallel chunks')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH,
+                        help=f'Checkpoint cache file (default {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-parse every file from scratch and leave the cache untouched')
+    parser.add_argument('--binary', action='store_true',
+                        help=f'Read JSON dumps through the mmap binary cache in {DEFAULT_BINARY_DIR} '
+                             '(compiled on first use)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Also report near-duplicate posts across verticals (MinHash/LSH)')
+    parser.add_argument('--top-lines', metavar='FILE',
+                        help='Only print "<score> upvotes | <title>" for the top posts in FILE')
+    args = parser.parse_args(argv)
+    args.rank_by = tuple(key.strip() for key in args.rank_by.split(',') if key.strip())
+    unknown = [key for key in args.rank_by if key not in RANKING_KEYS]
+    if unknown:
+        parser.error(f"unknown ranking key(s): {', '.join(unknown)}")
+    if args.top_k < 0:
+        parser.error('--top-k must be >= 0')
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be >= 1')
+    if args.chunk_mb < 1:
+        parser.error('--chunk-mb must be >= 1')
+    return args
+
+
+def print_top_lines(aggregator):
+    """Plain "<score> upvotes | <title>" lines, as used by generate_market_report.sh"""
+    for signal in aggregator.top('score') if 'score' in aggregator.rank_by else []:
+        print(f"{signal['score']} upvotes | {signal['title']}")
+
+
+def print_dedup_report(report):
+    """Raw vs deduplicated engagement, and where the duplicates come from"""
+    raw, deduped = report['raw'], report['deduplicated']
+    duplicates = raw.count - deduped.count
+    rate = duplicates / raw.count * 100 if raw.count else 0.0
+
+    print(f"\n{'='*60}")
+    print("🧬 NEAR-DUPLICATE SIGNALS (all verticals)")
+    print(f"{'='*60}")
+    print(f"✅ Posts: {raw.count}  •  Unique: {deduped.count}  •  Duplicates: {duplicates} ({rate:.1f}%)")
+    print(f"   • Total engagement (raw): {raw.total_engagement}")
+    print(f"   • Total engagement (deduplicated): {deduped.total_engagement}")
+
+    for label, aggregator in report['deduplicated_by_label'].items():
+        raw_count = report['raw_by_label'][label].count
+        if raw_count != aggregator.count:
+            print(f"   • {label}: {raw_count} → {aggregator.count} posts")
+
+    if report['overlaps']:
+        print(f"\n🔁 Shared posts between verticals:")
+        for (left, right), shared in sorted(report['overlaps'].items(), key=lambda item: -item[1]):
+            print(f"   • {left} ↔ {right}: {shared}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cache = None if args.no_cache else CheckpointCache(args.cache)
+    options = dict(
+        workers=args.workers,
+        top_k=args.top_k,
+        rank_by=args.rank_by,
+        chunk_bytes=args.chunk_mb * 1024 * 1024,
+        cache=cache,
+        binary_dir=DEFAULT_BINARY_DIR if args.binary else None,
+    )
+
+    if args.top_lines:
+        result = analyze_files([args.top_lines], **options).get(args.top_lines)
+        if cache:
+            cache.save()
+        if not isinstance(result, SignalAggregator):
+            return 1
+        print_top_lines(result)
+        return 0
+
+    # Analyze all verticals
+    print("\n\n🎯 ROUZE MARKET DEMAND SIGNALS ANALYSIS\n")
+
+    # Parse every vertical in parallel (skipping unchanged files), then
+    # report in the usual order
+    results = analyze_files([filepath for filepath, _ in VERTICALS], **options)
+    if cache:
+        cache.save()
+
+    for filepath, vertical_name in VERTICALS:
+        print_vertical_header(vertical_name)
+        print_result(filepath, results.get(filepath))
+
+    if args.dedup:
+        sources = {
+            vertical_name: filepath for filepath, vertical_name in VERTICALS
+            if isinstance(results.get(filepath), SignalAggregator)
+        }
+        print_dedup_report(deduplicate(sources, top_k=args.top_k))
+
+    print("\n\n" + "="*60)
+    print("✅ ANALYSIS COMPLETE")
+    print("="*60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+ROUZE SIGNAL BENCHMARKS
+Throughput, wall time and peak RSS for each signal analysis stage
+
+Every stage runs in a fresh (spawned) process so peak RSS belongs to that
+stage alone. Synthetic inputs come from generate_synthetic_signals.py and
+are cached in bench_data/ (deterministic, so regenerating is optional).
+Results are written as JSON; pass --baseline to compare against an
+earlier run and exit non-zero on regressions.
+
+Usage:
+    python3 benchmark_signals.py --posts 10000 1000000
+    python3 benchmark_signals.py --posts 100000 --stages read,aggregate,engine --baseline bench_results/prev.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from queue import Empty
+
+from generate_synthetic_signals import generate_posts, write_signals
+
+DEFAULT_DATA_DIR = 'bench_data'
+DEFAULT_RESULTS_DIR = 'bench_results'
+DEFAULT_THRESHOLD = 0.15  # Flag >15% throughput drops or RSS growth
+DEFAULT_VERTICAL = 'saas'
+DEFAULT_STAGE_TIMEOUT = 3600  # Seconds before a stuck stage is killed
+RESULT_POLL_SECONDS = 1.0
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ---- stages: each takes (inputs, options, scratch dir), returns posts processed ----
+
+def stage_read(inputs, options, scratch):
+    from signal_reader import iter_signals
+    return sum(1 for _ in iter_signals(inputs[options['layout']]))
+
+
+def stage_aggregate(inputs, options, scratch):
+    from signal_aggregator import SignalAggregator
+    from signal_reader import iter_signals
+    return SignalAggregator().update(iter_signals(inputs[options['layout']])).total_signals
+
+
+def stage_engine(inputs, options, scratch):
+    from signal_engine import analyze_files
+    path = inputs[options['layout']]
+    result = analyze_files([path], workers=options['workers'],
+                           chunk_bytes=options['chunk_mb'] * 1024 * 1024)[path]
+    if isinstance(result, Exception):
+        raise result
+    return result.total_signals
+
+
+def stage_checkpoint_warm(inputs, options, scratch):
+    """Second run over an unchanged file (the nightly-refresh case)"""
+    from signal_checkpoint import CheckpointCache
+    from signal_engine import analyze_files
+    path = inputs[options['layout']]
+    cache_path = os.path.join(scratch, 'checkpoints.json')
+    cache = CheckpointCache(cache_path)
+    analyze_files([path], workers=1, cache=cache)
+    cache.save()
+    started = time.perf_counter()
+    result = analyze_files([path], workers=1, cache=CheckpointCache(cache_path))[path]
+    _STAGE_CLOCK['started'] = started  # Only the warm run counts
+    return result.total_signals
+
+
+def stage_store(inputs, options, scratch):
+    from signal_store import SignalStore
+    store = SignalStore.from_files([inputs[options['layout']]])
+    store.summary()
+    store.by_subreddit()
+    return len(store)
+
+
+def stage_binary_compile(inputs, options, scratch):
+    from signal_binary import SignalBinary, compile_signals
+    path = compile_signals(inputs['listing'], os.path.join(scratch, 'bench.sigbin'))
+    with SignalBinary(path) as binary:
+        return len(binary)
+
+
+def stage_binary_scan(inputs, options, scratch):
+    from signal_aggregator import SignalAggregator
+    from signal_binary import SignalBinary, compile_signals
+    path = compile_signals(inputs['listing'], os.path.join(scratch, 'bench.sigbin'))
+    started = time.perf_counter()
+    with SignalBinary(path) as binary:
+        count = SignalAggregator().update(binary.records(with_body=False)).total_signals
+    _STAGE_CLOCK['started'] = started  # Exclude the one-time compile
+    return count
+
+
+def stage_index(inputs, options, scratch):
+    from signal_index import SignalIndex
+    with SignalIndex(os.path.join(scratch, 'index.db')) as index:
+        count = index.update([inputs[options['layout']]])[inputs[options['layout']]]
+        for query in ('churn', '"pricing page" OR onboarding', 'ai AND agents'):
+            index.search(query)
+    if isinstance(count, Exception):
+        raise count
+    return count
+
+
+def stage_dedup(inputs, options, scratch):
+    from signal_dedup import deduplicate
+    return deduplicate({'synthetic': inputs[options['layout']]})['raw'].total_signals
+
+
+def stage_trends(inputs, options, scratch):
+    from signal_reader import iter_signals
+    from signal_trends import TrendDetector
+    return TrendDetector().update(DEFAULT_VERTICAL, iter_signals(inputs[options['layout']]))
+
+
+STAGES = {
+    'read': stage_read,
+    'aggregate': stage_aggregate,
+    'engine': stage_engine,
+    'checkpoint_warm': stage_checkpoint_warm,
+    'store': stage_store,
+    'binary_compile': stage_binary_compile,
+    'binary_scan': stage_binary_scan,
+    'index': stage_index,
+    'dedup': stage_dedup,
+    'trends': stage_trends,
+}
+_STAGE_CLOCK = {}
+
+
+def _run_stage(stage, inputs, options, queue):
+    """Child-process entry point: run one stage and report its measurements"""
+    scratch = tempfile.mkdtemp(prefix='rouze_bench_')
+    try:
+        _STAGE_CLOCK['started'] = time.perf_counter()
+        posts = STAGES[stage](inputs, options, scratch)
+        wall = time.perf_counter() - _STAGE_CLOCK['started']
+        queue.put({'posts': posts, 'wall_s': wall, 'peak_rss_mb': _peak_rss_mb()})
+    except Exception as e:
+        queue.put({'error': f"{type(e).__name__}: {e}"})
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def measure(stage, inputs, options, timeout=DEFAULT_STAGE_TIMEOUT):
+    """Run one stage in a fresh process; a crash (e.g. OOM kill) or timeout comes back as an error"""
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_run_stage, args=(stage, inputs, options, queue))
+    process.start()
+    deadline = time.monotonic() + timeout
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=RESULT_POLL_SECONDS)
+        except Empty:
+            if not process.is_alive():
+                try:  # The result may have landed just before the child exited
+                    result = queue.get(timeout=RESULT_POLL_SECONDS)
+                except Empty:
+                    process.join()
+                    result = {'error': f'Stage process died (exit code {process.exitcode})'}
+            elif time.monotonic() >= deadline:
+                process.kill()
+                result = {'error': f'Timed out after {timeout}s'}
+    process.join()
+    return result
+
+
+def prepare_inputs(n_posts, data_dir=DEFAULT_DATA_DIR, seed=42):
+    """JSONL and listing-JSON corpora of n_posts each, generated once and reused"""
+    inputs = {}
+    for layout, extension in (('jsonl', 'jsonl'), ('listing', 'json')):
+        path = os.path.join(data_dir, f"reddit_{DEFAULT_VERTICAL}_synthetic_{layout}_{n_posts}_s{seed}.{extension}")
+        if not os.path.exists(path):
+            print(f"🔧 Generating {path}")
+            write_signals(path, generate_posts(n_posts, DEFAULT_VERTICAL, seed), layout)
+        inputs[layout] = path
+    return inputs
+
+
+def code_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regressions vs a previous results file: slower throughput or higher peak RSS"""
+    previous = {(r['stage'], r['layout'], r['posts']): r for r in baseline.get('results', [])
+                if 'error' not in r}
+    regressions = []
+    for result in results:
+        before = previous.get((result['stage'], result['layout'], result['posts']))
+        if not before or 'error' in result:
+            continue
+        if result['posts_per_s'] < before['posts_per_s'] * (1 - threshold):
+            regressions.append(f"{result['stage']} @ {result['posts']:,}: throughput "
+                               f"{before['posts_per_s']:,.0f} → {result['posts_per_s']:,.0f} posts/s")
+        if result['peak_rss_mb'] > before['peak_rss_mb'] * (1 + threshold):
+            regressions.append(f"{result['stage']} @ {result['posts']:,}: peak RSS "
+                               f"{before['peak_rss_mb']:.1f} → {result['peak_rss_mb']:.1f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the signal analysis stages')
+    parser.add_argument('--posts', type=int, nargs='+', default=[10000],
+                        help='Corpus sizes to run (e.g. 10000 1000000 10000000)')
+    parser.add_argument('--stages', default=','.join(STAGES),
+                        help=f"Comma-separated stages: {', '.join(STAGES)}")
+    parser.add_argument('--layout', choices=('jsonl', 'listing'), default='jsonl',
+                        help='Input layout for stages that read a single file')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-mb', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--output', help=f'Results JSON (default {DEFAULT_RESULTS_DIR}/signals-<timestamp>.json)')
+    parser.add_argument('--baseline', help='Earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--stage-timeout', type=int, default=DEFAULT_STAGE_TIMEOUT,
+                        help='Seconds before a stage is killed and reported as failed')
+    args = parser.parse_args(argv)
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    options = {'layout': args.layout, 'workers': args.workers, 'chunk_mb': args.chunk_mb}
+    results = []
+    for n_posts in args.posts:
+        inputs = prepare_inputs(n_posts, args.data_dir, args.seed)
+        print(f"\n📏 {n_posts:,} posts ({args.layout})")
+        for stage in stages:
+            measured = measure(stage, inputs, options, args.stage_timeout)
+            result = {'stage': stage, 'layout': args.layout, 'posts': n_posts, **measured}
+            if 'error' in measured:
+                print(f"   ❌ {stage:<16} {measured['error']}")
+            else:
+                result['posts_per_s'] = measured['posts'] / measured['wall_s'] if measured['wall_s'] else 0.0
+                print(f"   • {stage:<16} {result['posts_per_s']:>12,.0f} posts/s  "
+                      f"{measured['wall_s']:>8.2f}s  {measured['peak_rss_mb']:>8.1f}MB peak")
+            results.append(result)
+
+    report = {
+        'version': code_version(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'options': {**options, 'seed': args.seed},
+        'results': results,
+    }
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"signals-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} regression(s) vs {args.baseline}:")
+            for regression in regressions:
+                print(f"   • {regression}")
+            return 1
+        print(f"✅ No regressions vs {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+ROUZE SYNTHETIC SIGNAL GENERATOR
+Deterministic fake Reddit dumps for benchmarking the signal pipeline
+
+Same seed + arguments -> byte-identical file. Posts are written as they
+are generated, so 10M-post files need no more memory than 10-post ones.
+
+Layouts:
+    list      [ {post}, ... ]
+    data      { "data": [ {post}, ... ] }
+    listing   { "kind": "Listing", "data": { "children": [ {"kind": "t3", "data": {post}} ] } }
+    jsonl     one post per line
+
+Usage:
+    python3 generate_synthetic_signals.py --posts 1000000 --layout jsonl --vertical saas
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+LAYOUTS = ('list', 'data', 'listing', 'jsonl')
+START_UTC = 1704067200  # 2024-01-01
+
+VOCABULARY = {
+    'healthcare': {
+        'subreddits': ['medicine', 'pharmacy', 'nursing', 'healthIT', 'FDA'],
+        'topics': ['FDA approval', 'adverse events', 'EHR integration', 'prior authorization',
+                   'clinical trials', 'drug recall', 'patient portal', 'HIPAA compliance',
+                   'telehealth billing', 'nurse staffing'],
+    },
+    'saas': {
+        'subreddits': ['SaaS', 'startups', 'Entrepreneur', 'microsaas', 'indiehackers'],
+        'topics': ['churn', 'pricing page', 'onboarding', 'free trial conversion', 'MRR growth',
+                   'cold outreach', 'product hunt launch', 'AI agents', 'SOC 2', 'usage billing'],
+    },
+    'ecommerce': {
+        'subreddits': ['ecommerce', 'shopify', 'dropship', 'FulfillmentByAmazon', 'EtsySellers'],
+        'topics': ['Shopify fees', 'supplier delays', 'chargebacks', 'TikTok shop', 'ad costs',
+                   'returns rate', 'product validation', 'AliExpress shipping', 'email flows',
+                   'conversion rate'],
+    },
+}
+TEMPLATES = [
+    'Struggling with {topic} - any advice?',
+    'How are you handling {topic} in {year}?',
+    '{topic} is killing our margins',
+    'What tools do you use for {topic}?',
+    'PSA: {topic} changes this month',
+    'Is anyone else seeing problems with {topic}?',
+    'We finally fixed {topic}, here is what worked',
+    'Rant about {topic}',
+]
+FILLER = ('we tried everything and nothing seems to work for our team so far '
+          'looking for real experiences not vendor pitches thanks in advance').split()
+
+
+def generate_posts(n_posts, vertical='saas', seed=42, duplicate_rate=0.05):
+    """Yield n_posts raw Reddit posts in created_utc order"""
+    rng = random.Random(f"{seed}:{vertical}")
+    vocabulary = VOCABULARY[vertical]
+    created = START_UTC
+    recent_titles = []
+
+    for i in range(n_posts):
+        created += int(rng.expovariate(1 / 60)) + 1
+        if recent_titles and rng.random() < duplicate_rate:
+            # Crossposts / re-shares: same title, sometimes lightly edited
+            title = rng.choice(recent_titles)
+            if rng.random() < 0.5:
+                title = f"[Crosspost] {title}"
+        else:
+            title = rng.choice(TEMPLATES).format(topic=rng.choice(vocabulary['topics']),
+                                                 year=2024 + (created - START_UTC) // 31536000)
+            title = f"{title} #{i}" if rng.random() < 0.3 else title
+            recent_titles.append(title)
+            if len(recent_titles) > 500:
+                recent_titles.pop(0)
+
+        score = int(rng.paretovariate(1.2)) - 1
+        yield {
+            'id': f"t3_{seed:x}{i:09x}",
+            'title': title,
+            'selftext': ' '.join(rng.choices(FILLER, k=rng.randint(0, 40))),
+            'subreddit': rng.choice(vocabulary['subreddits']),
+            'score': score,
+            'num_comments': int(score * rng.uniform(0.02, 0.4)) + rng.randint(0, 5),
+            'created_utc': float(created),
+        }
+
+
+def write_signals(path, posts, layout='jsonl'):
+    """Stream posts to `path` in the given layout; returns the number written"""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'. Use: {', '.join(LAYOUTS)}")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    prefix, suffix, wrap = {
+        'list': ('[', ']', None),
+        'data': ('{"data": [', ']}', None),
+        'listing': ('{"kind": "Listing", "data": {"after": null, "children": [', ']}}', 't3'),
+        'jsonl': ('', '', None),
+    }[layout]
+
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(prefix)
+        for post in posts:
+            item = {'kind': wrap, 'data': post} if wrap else post
+            if layout == 'jsonl':
+                f.write(json.dumps(item))
+                f.write('\n')
+            else:
+                if count:
+                    f.write(',\n')
+                f.write(json.dumps(item))
+            count += 1
+        f.write(suffix)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic Reddit signal dump')
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--layout', choices=LAYOUTS, default='jsonl')
+    parser.add_argument('--vertical', choices=sorted(VOCABULARY), default='saas')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05)
+    parser.add_argument('--out', help='Output path (default bench_data/reddit_<vertical>_synthetic_<n>.<ext>)')
+    args = parser.parse_args(argv)
+
+    extension = 'jsonl' if args.layout == 'jsonl' else 'json'
+    out = args.out or os.path.join(
+        'bench_data', f"reddit_{args.vertical}_synthetic_{args.layout}_{args.posts}.{extension}")
+    count = write_signals(out, generate_posts(args.posts, args.vertical, args.seed,
+                                              args.duplicate_rate), args.layout)
+    print(f"✅ Wrote {count:,} posts to {out} ({os.path.getsize(out) / 1024 / 1024:.1f}MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,442 @@
+"""
+ROUZE ANALYSIS JOBS
+Background signal analysis and report generation for paid projects
+
+Checkout enqueues a job (enqueue_analysis). Jobs are rows in SQLite, so
+they survive restarts. A small pool of runner threads claims them one at
+a time, and each signal file is aggregated in a bounded process pool so
+the CPU-heavy parsing never competes with request handling for the GIL.
+Progress, stage and the final report path are written back to the job
+row. The analysis page follows them over Server-Sent Events
+(iter_job_events). Each stream holds a web thread for at most
+EVENT_STREAM_SECONDS, and at most MAX_EVENT_STREAMS run at once per
+process; past that a client gets the current state and polls.
+
+The report path stays server-side: get_job() and latest_job() only say
+whether a report is ready, and get_report_path() is for the download
+route.
+
+Failed jobs are retried up to ANALYSIS_MAX_ATTEMPTS times. Queued jobs
+cancel immediately; running jobs stop after the file in progress.
+
+The signal analysis itself lives in the repository root
+(signal_engine.py, analyze_rouze_signals.py) and is imported from there.
+
+Usage:
+    python3 analysis_jobs.py --daemon    # run jobs outside the web workers
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import secrets
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from sqlite_store import connect, transaction
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANALYSIS_DB = 'instance/analysis_jobs.db'
+REPORT_FOLDER = 'instance/reports'
+ANALYSIS_RUNNERS = 2      # Jobs in progress at once per process
+ANALYSIS_PROCESSES = 2    # Processes parsing signal files for those jobs
+ANALYSIS_MAX_ATTEMPTS = 3
+JOB_LEASE_SECONDS = 1800
+RETRY_DELAY_SECONDS = 60
+IDLE_POLL_SECONDS = 2.0
+EVENT_POLL_SECONDS = 0.5
+EVENT_STREAM_SECONDS = 15  # Browsers reconnect after this, freeing the web worker thread
+MAX_EVENT_STREAMS = 4      # Per process; leaves most of gunicorn's 8 threads for requests
+BUSY_RETRY_MS = 5000       # Reconnect delay for a client turned away by MAX_EVENT_STREAMS
+TOP_K = 10
+
+TERMINAL = ('done', 'failed', 'cancelled')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    job_id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    vertical TEXT,
+    status TEXT NOT NULL,
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    report_path TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analysis_jobs_status ON analysis_jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS analysis_jobs_project ON analysis_jobs(project_id, created_at);
+"""
+
+_COLUMNS = ('job_id', 'project_id', 'vertical', 'status', 'stage', 'progress', 'message',
+            'attempts', 'error', 'created_at', 'updated_at')
+_SELECT_JOB = f"SELECT {', '.join(_COLUMNS)}, report_path IS NOT NULL AS report_ready FROM analysis_jobs"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class NoSignals(Exception):
+    """No source produced any signals; retrying would not change that"""
+
+
+def _db():
+    return connect(ANALYSIS_DB, _SCHEMA)
+
+
+def enqueue_analysis(project_id, vertical=None):
+    """Queue a report for `project_id`; returns the job id (ValueError if the vertical has no corpus)"""
+    if vertical not in supported_verticals():
+        raise ValueError(f'No signal corpus for vertical {vertical!r}')
+    job_id = secrets.token_hex(12)
+    now = time.time()
+    _db().execute(
+        'INSERT INTO analysis_jobs (job_id, project_id, vertical, status, stage, created_at, updated_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)', (job_id, project_id, vertical, 'queued', 'Queued', now, now))
+    _pool.wake()
+    return job_id
+
+
+def _public(row):
+    if row is None:
+        return None
+    job = dict(row)
+    job['report_ready'] = bool(job['report_ready'])
+    return job
+
+
+def get_job(job_id):
+    return _public(_db().execute(f'{_SELECT_JOB} WHERE job_id = ?', (job_id,)).fetchone())
+
+
+def latest_job(project_id):
+    return _public(_db().execute(
+        f'{_SELECT_JOB} WHERE project_id = ? ORDER BY created_at DESC LIMIT 1', (project_id,)).fetchone())
+
+
+def get_report_path(job_id):
+    """Server-side path of a finished job's report, or None"""
+    row = _db().execute("SELECT report_path FROM analysis_jobs WHERE job_id = ? AND status = 'done'",
+                        (job_id,)).fetchone()
+    if row is None or not row['report_path'] or not os.path.exists(row['report_path']):
+        return None
+    return row['report_path']
+
+
+def cancel_job(job_id):
+    """Cancel a job; returns its status afterwards, or None if there is no such job"""
+    now = time.time()
+    with transaction(_db()) as conn:
+        conn.execute("UPDATE analysis_jobs SET status = 'cancelled', stage = 'Cancelled', updated_at = ? "
+                     "WHERE job_id = ? AND status = 'queued'", (now, job_id))
+        conn.execute("UPDATE analysis_jobs SET cancel_requested = 1, updated_at = ? "
+                     "WHERE job_id = ? AND status = 'running'", (now, job_id))
+        row = conn.execute('SELECT status FROM analysis_jobs WHERE job_id = ?', (job_id,)).fetchone()
+    return row['status'] if row else None
+
+
+def _claim_job():
+    """Atomically take the oldest queued (or lease-expired) job"""
+    now = time.time()
+    with transaction(_db()) as conn:
+        conn.execute(
+            "UPDATE analysis_jobs SET status = 'queued' WHERE status = 'running' AND updated_at < ?",
+            (now - JOB_LEASE_SECONDS,))
+        row = conn.execute(
+            "SELECT job_id, project_id, vertical, attempts FROM analysis_jobs "
+            "WHERE status = 'queued' AND (attempts = 0 OR updated_at < ?) "
+            "ORDER BY created_at LIMIT 1", (now - RETRY_DELAY_SECONDS,)).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE analysis_jobs SET status = 'running', attempts = attempts + 1, error = NULL, "
+            "updated_at = ? WHERE job_id = ?", (now, row['job_id']))
+    return dict(row)
+
+
+def _progress(job, progress, stage, message=None):
+    """Record progress; raises JobCancelled if cancellation was requested"""
+    with transaction(_db()) as conn:
+        conn.execute('UPDATE analysis_jobs SET progress = ?, stage = ?, message = ?, updated_at = ? '
+                     'WHERE job_id = ?', (progress, stage, message, time.time(), job['job_id']))
+        row = conn.execute('SELECT cancel_requested FROM analysis_jobs WHERE job_id = ?',
+                           (job['job_id'],)).fetchone()
+    if row['cancel_requested']:
+        raise JobCancelled()
+
+
+def _finish_job(job, status, **fields):
+    fields.update(status=status, updated_at=time.time())
+    assignments = ', '.join(f'{name} = ?' for name in fields)
+    _db().execute(f'UPDATE analysis_jobs SET {assignments} WHERE job_id = ?',
+                  (*fields.values(), job['job_id']))
+
+
+# ----------------------------------------------------------------------
+# Analysis (runs in the process pool)
+# ----------------------------------------------------------------------
+
+def _signal_modules():
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    import analyze_rouze_signals
+    import signal_checkpoint
+    import signal_engine
+    return analyze_rouze_signals, signal_checkpoint, signal_engine
+
+
+def signal_sources(vertical):
+    """(absolute path, label) of the signal corpora for a vertical"""
+    analyze_rouze_signals, _, _ = _signal_modules()
+    return [(os.path.join(ROOT_DIR, filepath), label)
+            for filepath, label in analyze_rouze_signals.VERTICALS
+            if vertical and f'_{vertical}_' in os.path.basename(filepath)]
+
+
+def supported_verticals():
+    """Verticals with at least one signal corpus (e.g. {'healthcare', 'saas', 'ecommerce'})"""
+    analyze_rouze_signals, _, _ = _signal_modules()
+    return {os.path.basename(filepath).split('_')[1] for filepath, _ in analyze_rouze_signals.VERTICALS}
+
+
+def analyze_signal_file(filepath, top_k=TOP_K):
+    """Aggregate one signal file; returns a JSON-ready summary (module-level for pickling)"""
+    _, signal_checkpoint, signal_engine = _signal_modules()
+    cache = signal_checkpoint.CheckpointCache(os.path.join(ROOT_DIR, signal_checkpoint.DEFAULT_CACHE_PATH))
+    result = signal_engine.analyze_files([filepath], workers=1, top_k=top_k, cache=cache).get(filepath)
+    cache.save()
+    if result is None:
+        raise FileNotFoundError(filepath)
+    if isinstance(result, Exception):
+        raise result
+    return {
+        'total_signals': result.total_signals,
+        'posts': result.count,
+        'average_score': result.mean_score,
+        'average_comments': result.mean_comments,
+        'total_engagement': result.total_engagement,
+        'top': {key: result.top(key) for key in result.rank_by},
+    }
+
+
+class _ProcessPool:
+    """
+    ProcessPoolExecutor created lazily per process (not inherited across forks)
+
+    Children are spawned, not forked: the web worker is multi-threaded and
+    holds SQLite connections, and a fork could inherit a lock mid-use.
+    """
+
+    def __init__(self, size=ANALYSIS_PROCESSES):
+        self.size = size
+        self._pid = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _new_executor(self):
+        self._executor = ProcessPoolExecutor(max_workers=self.size,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        self._pid = os.getpid()
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._new_executor()
+            try:
+                return self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A child died (OOM, crash) and took the pool down: replace it
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._new_executor()
+                return self._executor.submit(fn, *args)
+
+
+_processes = _ProcessPool()
+
+
+def run_job(job):
+    """Aggregate the project's signals and write its report"""
+    sources = signal_sources(job['vertical'])
+    report = {
+        'job_id': job['job_id'],
+        'project_id': job['project_id'],
+        'vertical': job['vertical'],
+        'generated_at': datetime.now().isoformat(),
+        'sources': [],
+    }
+
+    for i, (filepath, label) in enumerate(sources):
+        _progress(job, 5 + 80 * i / len(sources), 'Signal Aggregation', f'Analyzing {label}')
+        source = {'label': label, 'file': os.path.basename(filepath)}
+        try:
+            source.update(_processes.submit(analyze_signal_file, filepath).result())
+        except (ValueError, FileNotFoundError) as e:
+            source['error'] = str(e)  # Unreadable corpus: reported, not retried
+        report['sources'].append(source)
+
+    if not any('total_signals' in source for source in report['sources']):
+        errors = '; '.join(f"{source['file']}: {source['error']}" for source in report['sources'])
+        raise NoSignals(f'No signals could be read ({errors})' if errors else
+                        f"No signal sources for vertical {job['vertical']!r}")
+
+    _progress(job, 90, 'Report Compilation', 'Generating final deliverables')
+    report['total_signals'] = sum(source.get('total_signals', 0) for source in report['sources'])
+    os.makedirs(REPORT_FOLDER, exist_ok=True)
+    report_path = os.path.join(REPORT_FOLDER, f"{job['job_id']}.json")
+    tmp = f'{report_path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp, report_path)
+    return report_path
+
+
+def process_job(job):
+    try:
+        _progress(job, 1, 'Data Ingestion', 'Loading signal sources')
+        report_path = run_job(job)
+    except JobCancelled:
+        _finish_job(job, 'cancelled', stage='Cancelled')
+        return False
+    except NoSignals as e:
+        _finish_job(job, 'failed', error=str(e), stage='Failed')
+        print(f"Analysis job {job['job_id']} failed: {e}")
+        return False
+    except Exception as e:
+        retry = job['attempts'] + 1 < ANALYSIS_MAX_ATTEMPTS
+        _finish_job(job, 'queued' if retry else 'failed', error=str(e),
+                    stage='Retrying' if retry else 'Failed')
+        print(f"Analysis job {job['job_id']} failed: {e}")
+        return False
+    _finish_job(job, 'done', progress=100, stage='Complete', message=None, report_path=report_path)
+    return True
+
+
+def run_pending():
+    """Run queued jobs in the calling thread until none are left; returns jobs processed"""
+    processed = 0
+    while True:
+        job = _claim_job()
+        if job is None:
+            return processed
+        process_job(job)
+        processed += 1
+
+
+class _RunnerPool:
+    """Daemon threads claiming jobs; started lazily in each process"""
+
+    def __init__(self, size=ANALYSIS_RUNNERS):
+        self.size = size
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def wake(self):
+        self._ensure_started()
+        self._wakeup.set()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._wakeup = threading.Event()
+            for i in range(self.size):
+                threading.Thread(target=self._run, name=f'analysis-runner-{i}', daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            try:
+                if run_pending():
+                    continue
+            except Exception as e:  # Keep the runner alive through DB hiccups
+                print(f"Analysis runner error: {e}")
+            self._wakeup.wait(IDLE_POLL_SECONDS)
+            self._wakeup.clear()
+
+
+_pool = _RunnerPool()
+
+
+def start_runners():
+    """Start this process's runners now (e.g. to resume jobs after a restart)"""
+    _pool._ensure_started()
+
+
+# ----------------------------------------------------------------------
+# Progress stream
+# ----------------------------------------------------------------------
+
+def _sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+_streams = threading.BoundedSemaphore(MAX_EVENT_STREAMS)
+
+
+def iter_job_events(job_id, max_seconds=EVENT_STREAM_SECONDS):
+    """
+    Server-Sent Events for one job: a 'progress' event whenever the row
+    changes, then 'end' once it is done, failed or cancelled
+
+    The stream closes after `max_seconds`; EventSource reconnects by itself.
+    When MAX_EVENT_STREAMS are already open, only the current state is sent
+    and the client is told to come back in BUSY_RETRY_MS.
+    """
+    streaming = _streams.acquire(blocking=False)
+    try:
+        if not streaming:
+            max_seconds = 0
+            yield f'retry: {BUSY_RETRY_MS}\n\n'
+        else:
+            yield f'retry: {int(EVENT_POLL_SECONDS * 4000)}\n\n'
+        deadline = time.monotonic() + max_seconds
+        last = None
+        while True:
+            job = get_job(job_id)
+            if job is None:
+                yield _sse('end', {'job_id': job_id, 'status': 'missing'})
+                return
+            state = {key: job[key] for key in ('job_id', 'status', 'stage', 'progress', 'message', 'error')}
+            if state != last:
+                yield _sse('progress', state)
+                last = state
+            if job['status'] in TERMINAL:
+                yield _sse('end', state)
+                return
+            if time.monotonic() >= deadline:
+                return
+            time.sleep(EVENT_POLL_SECONDS)
+    finally:
+        if streaming:
+            _streams.release()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ROUZE analysis job runner')
+    parser.add_argument('--daemon', action='store_true', help='Keep running jobs (default: drain and exit)')
+    args = parser.parse_args(argv)
+
+    while True:
+        processed = run_pending()
+        if processed:
+            print(f"[{datetime.now().isoformat()}] Ran {processed} analysis jobs")
+        if not args.daemon:
+            return 0
+        time.sleep(IDLE_POLL_SECONDS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import os
 from flask import Flask
+from static_assets import init_assets
 
 def create_app():
     # Get absolute path to this file's directory
@@ -16,6 +17,7 @@ def create_app():
 
     # Config
     app.config['TEMPLATES_AUTO_RELOAD'] = True
+    init_assets(app)
 
     return app
 
@@ -0,0 +1,258 @@
+"""
+ROUZE AUDIT LOG
+Append-only, segmented JSONL audit trail with a batched background writer
+
+Request handlers only enqueue entries. A writer thread drains the queue
+in batches, appends each batch with a single write() and one fsync
+(group commit), and rotates to a new segment once the current one passes
+AUDIT_SEGMENT_MAX_BYTES, so logging cost stays flat however long the
+history gets. A batch that fails to write is never dropped: the writer
+abandons the segment and retries the batch in a fresh one, backing off
+until the disk recovers.
+
+Each process writes its own segments (the pid is part of the name), so
+concurrent gunicorn workers never interleave or lose entries. The reader
+merges all segments (plus the legacy audit_log.json, if present) in
+timestamp order for compliance exports.
+
+Usage:
+    python3 audit_log.py export audit_export.jsonl [--since 2025-01-01]
+"""
+
+import argparse
+import atexit
+import heapq
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+from config_upload_security import (
+    AUDIT_LOG_DIR,
+    AUDIT_SEGMENT_MAX_BYTES,
+    LEGACY_AUDIT_LOG,
+)
+
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.2  # Seconds a lone entry may wait before it is written
+RETRY_BACKOFF = 0.5  # Seconds before the first retry of a failed batch; doubles up to RETRY_BACKOFF_MAX
+RETRY_BACKOFF_MAX = 30.0
+STOP_ATTEMPTS = 5  # Retries allowed while the process is shutting down
+SEGMENT_PREFIX = 'audit-'
+SEGMENT_SUFFIX = '.jsonl'
+
+_STOP = object()
+
+
+class AuditLogWriter:
+    """Queue + writer thread; one instance per process"""
+
+    def __init__(self, log_dir=AUDIT_LOG_DIR, segment_max_bytes=AUDIT_SEGMENT_MAX_BYTES,
+                 batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.log_dir = log_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._fd = None
+        self._segment_size = 0
+        self._segment_seq = 0
+
+    def _ensure_started(self):
+        # Forked workers (gunicorn --preload) inherit no running thread, so
+        # each process starts its own writer on first use
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._fd = None
+            self._segment_seq = 0
+            self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def write(self, entry):
+        """Enqueue an entry; never blocks on disk"""
+        self._ensure_started()
+        self._queue.put(entry)
+
+    def flush(self):
+        """Block until everything enqueued so far is on disk"""
+        if self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self):
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    # ---- writer thread -------------------------------------------------
+
+    def _open_segment(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._segment_seq += 1
+        name = (f"{SEGMENT_PREFIX}{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+                f"-{os.getpid()}-{self._segment_seq:06d}{SEGMENT_SUFFIX}")
+        self._fd = os.open(os.path.join(self.log_dir, name),
+                           os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        self._segment_size = 0
+
+    def _write_batch(self, batch):
+        if self._fd is None or self._segment_size >= self.segment_max_bytes:
+            if self._fd is not None:
+                os.close(self._fd)
+            self._open_segment()
+        data = ''.join(json.dumps(entry, default=str) + '\n' for entry in batch).encode('utf-8')
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        os.fsync(self._fd)  # One fsync per batch (group commit)
+        self._segment_size += len(data)
+
+    def _abandon_segment(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    def _write_with_retry(self, batch, stopping):
+        """
+        Write a batch, each retry in a new segment (a torn line in the old
+        one is skipped by the reader). Retries until it succeeds, except at
+        shutdown, where the batch goes to stderr rather than vanishing.
+        """
+        attempt = 0
+        while True:
+            try:
+                self._write_batch(batch)
+                return
+            except OSError as e:
+                attempt += 1
+                self._abandon_segment()
+                if stopping and attempt >= STOP_ATTEMPTS:
+                    print(f"❌ Audit log unwritable at shutdown ({e}); {len(batch)} entries follow:",
+                          file=sys.stderr)
+                    for entry in batch:
+                        print(json.dumps(entry, default=str), file=sys.stderr)
+                    return
+                print(f"⚠️  Failed to write audit log (attempt {attempt}, retrying): {e}")
+                time.sleep(min(RETRY_BACKOFF * 2 ** (attempt - 1), RETRY_BACKOFF_MAX))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            items = [first]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = [item for item in items if item is not _STOP]
+            stopping = len(batch) != len(items)
+            try:
+                if batch:
+                    self._write_with_retry(batch, stopping)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+_writer = AuditLogWriter()
+atexit.register(_writer.close)
+
+
+def get_audit_log():
+    return _writer
+
+
+def record(entry):
+    """Append one entry to the process-wide audit log"""
+    _writer.write(entry)
+
+
+def _iter_segment(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # Torn final line from a crash mid-write
+
+
+def iter_audit_entries(log_dir=AUDIT_LOG_DIR, legacy_log=LEGACY_AUDIT_LOG, since=None, until=None):
+    """
+    Replay the full audit trail in timestamp order
+
+    Every segment is already in time order, so segments are k-way merged
+    rather than loaded and sorted. `since`/`until` are ISO timestamps.
+    """
+    sources = []
+    if legacy_log and os.path.exists(legacy_log):
+        with open(legacy_log, 'r') as f:
+            sources.append(iter(json.load(f)))
+    if os.path.isdir(log_dir):
+        for name in sorted(os.listdir(log_dir)):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                sources.append(_iter_segment(os.path.join(log_dir, name)))
+
+    for entry in heapq.merge(*sources, key=lambda entry: entry.get('timestamp') or ''):
+        timestamp = entry.get('timestamp') or ''
+        if since and timestamp < since:
+            continue
+        if until and timestamp >= until:
+            continue
+        yield entry
+
+
+def export_audit_log(output_path, since=None, until=None, log_dir=AUDIT_LOG_DIR,
+                     legacy_log=LEGACY_AUDIT_LOG):
+    """Write a merged JSONL export for compliance requests; returns the entry count"""
+    count = 0
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for entry in iter_audit_entries(log_dir, legacy_log, since, until):
+            out.write(json.dumps(entry, default=str) + '\n')
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ROUZE audit log tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help='Merge all segments into one JSONL file')
+    export.add_argument('output')
+    export.add_argument('--since', help='ISO timestamp (inclusive)')
+    export.add_argument('--until', help='ISO timestamp (exclusive)')
+    export.add_argument('--log-dir', default=AUDIT_LOG_DIR)
+    args = parser.parse_args(argv)
+
+    count = export_audit_log(args.output, args.since, args.until, log_dir=args.log_dir)
+    print(f"✅ Exported {count} audit entries to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
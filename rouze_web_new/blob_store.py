@@ -0,0 +1,134 @@
+"""
+ROUZE BLOB STORE
+Content-addressed, deduplicated storage for client uploads
+
+An upload's bytes are stored once as a blob named by an HMAC of their
+SHA-256. The name is keyed with the master key, so it does not reveal
+the content hash. Each client file id (the anonymized
+secure_filename_generator() name) is a reference to a blob. Re-uploading
+the same export adds a reference instead of another copy.
+
+Deleting a file id drops its reference. Only when a blob's reference
+count reaches zero is the blob renamed to a tombstone, inside the same
+transaction, and handed back for shredding. An identical upload arriving
+meanwhile therefore writes a fresh blob instead of one that is being
+overwritten.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import time
+
+from config_upload_security import BLOB_DB, BLOB_FOLDER, UPLOAD_FOLDER
+from sqlite_store import connect, transaction
+from upload_encryption import derive_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    blob_id TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    refcount INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    file_id TEXT PRIMARY KEY,
+    blob_id TEXT NOT NULL REFERENCES blobs(blob_id),
+    client_id TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refs_blob ON refs(blob_id);
+"""
+
+_blob_key = None
+
+
+def _db():
+    return connect(BLOB_DB, _SCHEMA)
+
+
+def blob_id_for(sha256_hex):
+    global _blob_key
+    if _blob_key is None:
+        _blob_key = derive_key(b'rouze blob id')
+    return hmac.new(_blob_key, bytes.fromhex(sha256_hex), hashlib.sha256).hexdigest()
+
+
+def blob_path(blob_id):
+    return os.path.join(BLOB_FOLDER, blob_id[:2], blob_id)
+
+
+def store(staged_path, file_id, sha256_hex, client_id=None):
+    """
+    Adopt a fully written (encrypted) upload as `file_id`; returns the blob path
+
+    If the content is already stored, the staged copy is removed (not
+    shredded, which would block the request) and `file_id` becomes another
+    reference to the existing blob.
+    """
+    blob_id = blob_id_for(sha256_hex)
+    path = blob_path(blob_id)
+    now = time.time()
+    duplicate = False
+    with transaction(_db()) as conn:
+        row = conn.execute('SELECT refcount FROM blobs WHERE blob_id = ?', (blob_id,)).fetchone()
+        if row:
+            conn.execute('UPDATE blobs SET refcount = refcount + 1 WHERE blob_id = ?', (blob_id,))
+            duplicate = True
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            size = os.path.getsize(staged_path)
+            os.replace(staged_path, path)
+            conn.execute('INSERT INTO blobs VALUES (?, ?, 1, ?)', (blob_id, size, now))
+        conn.execute('INSERT INTO refs VALUES (?, ?, ?, ?)', (file_id, blob_id, client_id, now))
+    if duplicate:
+        # No shredding needed: the same bytes stay stored in the blob, and the
+        # staged copy is ciphertext under its own data key
+        os.remove(staged_path)
+    return path
+
+
+def path_for(file_id):
+    """Blob path behind a file id, or None if it is not a blob reference"""
+    row = _db().execute('SELECT blob_id FROM refs WHERE file_id = ?', (file_id,)).fetchone()
+    return blob_path(row['blob_id']) if row else None
+
+
+def resolve_path(file_id):
+    """Where a file id's (encrypted) bytes live: its blob, or the legacy per-file path"""
+    return path_for(file_id) or os.path.join(UPLOAD_FOLDER, file_id)
+
+
+def release(file_id):
+    """
+    Drop `file_id`'s reference
+
+    Returns a tombstone path that the caller must shred when this was the
+    blob's last reference, else None.
+    """
+    with transaction(_db()) as conn:
+        row = conn.execute('SELECT blob_id FROM refs WHERE file_id = ?', (file_id,)).fetchone()
+        if row is None:
+            return None
+        blob_id = row['blob_id']
+        conn.execute('DELETE FROM refs WHERE file_id = ?', (file_id,))
+        conn.execute('UPDATE blobs SET refcount = refcount - 1 WHERE blob_id = ?', (blob_id,))
+        remaining = conn.execute('SELECT refcount FROM blobs WHERE blob_id = ?', (blob_id,)).fetchone()
+        if remaining['refcount'] > 0:
+            return None
+        conn.execute('DELETE FROM blobs WHERE blob_id = ?', (blob_id,))
+        path = blob_path(blob_id)
+        tombstone = f'{path}.deleting-{secrets.token_hex(4)}'
+        os.replace(path, tombstone)
+    return tombstone
+
+
+def stats():
+    """Logical vs physical bytes, for capacity reporting"""
+    conn = _db()
+    physical, blobs = conn.execute('SELECT COALESCE(SUM(size), 0), COUNT(*) FROM blobs').fetchone()
+    logical, refs = conn.execute(
+        'SELECT COALESCE(SUM(b.size), 0), COUNT(*) FROM refs r JOIN blobs b ON b.blob_id = r.blob_id'
+    ).fetchone()
+    return {'blobs': blobs, 'references': refs, 'physical_bytes': physical, 'logical_bytes': logical}
@@ -0,0 +1,320 @@
+"""
+ROUZE CHUNKED UPLOADS
+Streaming, resumable upload sessions for /upload/chunked
+
+Protocol:
+    POST /upload/chunked                        {filename, size, client_id} -> upload_id
+    PUT  /upload/chunked/<upload_id>?offset=N   raw bytes, appended at N
+    GET  /upload/chunked/<upload_id>            bytes received so far (resume point)
+    POST /upload/chunked/<upload_id>/finalize   hand over to validation + blob store
+
+Chunks are copied from the request stream into a staging file in
+STREAM_BUFFER_SIZE pieces, so worker memory does not depend on file size.
+Each session has a JSON sidecar recording the bytes durably received;
+it is only updated after a chunk is fsynced, and a resumed PUT first
+truncates the staging file back to that size, discarding whatever a
+dropped connection left behind.
+
+With ENCRYPTION_ENABLED, bytes are encrypted on their way to the staging
+file (see upload_encryption.py): each PUT ends with a sealed segment,
+and the sidecar records the segment count so the next PUT can continue
+the stream. Plaintext never touches the disk.
+
+The SHA-256 (of the plaintext) is updated as chunks arrive. hashlib state cannot be shared
+between gunicorn workers, so if consecutive chunks land on different
+workers the digest is recomputed from the staging file at finalize.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import secrets
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from config_upload_security import (
+    ALLOWED_EXTENSIONS,
+    ENCRYPTION_ENABLED,
+    MAX_FILE_SIZE,
+    STAGING_FOLDER,
+    UPLOAD_SESSION_TTL_HOURS,
+    secure_filename_generator,
+)
+from upload_encryption import EncryptingWriter, open_decrypted
+
+STREAM_BUFFER_SIZE = 64 * 1024
+CHUNK_SIZE = 4 * 1024 * 1024  # Suggested PUT size returned to clients
+MAX_CACHED_HASHERS = 256
+
+_UPLOAD_ID = re.compile(r'^[A-Za-z0-9_-]{16,64}$')
+_CLIENT_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')  # Becomes part of the stored file name
+_hashers = OrderedDict()  # upload_id -> (offset, sha256) for sessions this worker has seen
+
+
+class UploadError(Exception):
+    """Client-facing upload failure; `status` is the HTTP status to return"""
+
+    def __init__(self, message, status=400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+def size_limit_message(file_size):
+    return f'File too large. Max: {MAX_FILE_SIZE / 1024 / 1024:.0f}MB, Yours: {file_size / 1024 / 1024:.2f}MB'
+
+
+def file_extension(filename):
+    file_ext = filename.split('.')[-1].lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise UploadError(f'File type .{file_ext} not allowed. Use: {", ".join(ALLOWED_EXTENSIONS)}')
+    return file_ext
+
+
+def copy_stream(stream, f, limit, hasher=None, buffer=None):
+    """
+    Copy `stream` into open file `f` without holding more than one buffer
+    in memory; raises UploadError as soon as more than `limit` bytes arrive
+    """
+    buffer = buffer or bytearray(STREAM_BUFFER_SIZE)
+    view = memoryview(buffer)
+    copied = 0
+    while True:
+        n = stream.readinto(view) if hasattr(stream, 'readinto') else _read_into(stream, view)
+        if not n:
+            return copied
+        copied += n
+        if copied > limit:
+            raise UploadError('Upload exceeds the declared or maximum size', status=413)
+        f.write(view[:n])
+        if hasher is not None:
+            hasher.update(view[:n])
+
+
+def _read_into(stream, view):
+    data = stream.read(len(view))
+    view[:len(data)] = data
+    return len(data)
+
+
+def save_stream(stream, filepath):
+    """Single-shot upload: stream to `filepath`; returns (size, sha256 hex)"""
+    hasher = hashlib.sha256()
+    try:
+        with open(filepath, 'wb') as f:
+            if ENCRYPTION_ENABLED:
+                writer = EncryptingWriter.create(f)
+                size = copy_stream(stream, writer, MAX_FILE_SIZE, hasher)
+                writer.close()
+            else:
+                size = copy_stream(stream, f, MAX_FILE_SIZE, hasher)
+    except UploadError:
+        os.remove(filepath)
+        raise UploadError(size_limit_message(_stream_length(stream)))
+    return size, hasher.hexdigest()
+
+
+def _stream_length(stream):
+    try:
+        return stream.seek(0, os.SEEK_END)
+    except (AttributeError, OSError, ValueError):
+        return MAX_FILE_SIZE + 1
+
+
+# ---- resumable sessions -------------------------------------------------
+
+def _session_paths(upload_id):
+    if not _UPLOAD_ID.match(upload_id or ''):
+        raise UploadError('Upload not found', status=404)
+    base = os.path.join(STAGING_FOLDER, upload_id)
+    return base + '.json', base + '.part', base + '.lock'
+
+
+@contextmanager
+def _locked(upload_id):
+    """Serialize work on one session across threads and gunicorn workers"""
+    _, _, lock_path = _session_paths(upload_id)
+    with open(lock_path, 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _save_session(session):
+    meta_path, _, _ = _session_paths(session['upload_id'])
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(session, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, meta_path)
+
+
+def load_session(upload_id):
+    meta_path, _, _ = _session_paths(upload_id)
+    try:
+        with open(meta_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise UploadError('Upload not found', status=404)
+
+
+def _remove_session(upload_id):
+    _hashers.pop(upload_id, None)
+    for path in _session_paths(upload_id):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def purge_stale_sessions(max_age_hours=UPLOAD_SESSION_TTL_HOURS):
+    """Drop abandoned sessions; cost scales with uploads in flight, not stored files"""
+    if not os.path.isdir(STAGING_FOLDER):
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    purged = 0
+    for name in os.listdir(STAGING_FOLDER):
+        if not name.endswith('.json'):
+            continue
+        try:
+            if os.path.getmtime(os.path.join(STAGING_FOLDER, name)) < cutoff:
+                _remove_session(name[:-len('.json')])
+                purged += 1
+        except (OSError, UploadError):
+            continue
+    return purged
+
+
+def check_client_id(client_id):
+    """Reject client ids that could not be used safely in a file name (e.g. '../x')"""
+    if not isinstance(client_id, str) or not _CLIENT_ID.match(client_id):
+        raise UploadError('Invalid client_id: use letters, digits, "-" or "_" (at most 64)')
+    return client_id
+
+
+def create_session(client_id, original_filename, total_size, deletion_policy=None):
+    """Start a resumable upload; returns the session dict"""
+    check_client_id(client_id)
+    if not original_filename:
+        raise UploadError('Invalid filename')
+    file_ext = file_extension(original_filename)
+    if not isinstance(total_size, int) or total_size < 0:
+        raise UploadError('Declared size must be a non-negative integer')
+    if total_size > MAX_FILE_SIZE:
+        raise UploadError(size_limit_message(total_size), status=413)
+
+    os.makedirs(STAGING_FOLDER, exist_ok=True)
+    purge_stale_sessions()
+
+    session = {
+        'upload_id': secrets.token_urlsafe(24),
+        'client_id': client_id,
+        'original_filename': original_filename,
+        'file_ext': file_ext,
+        'deletion_policy': deletion_policy,
+        'size': total_size,
+        'received': 0,
+        'encrypted': ENCRYPTION_ENABLED,
+        'staged': 0,  # Bytes of the staging file (ciphertext when encrypted)
+        'segments': 0,
+        'created': time.time(),
+    }
+    _, part_path, _ = _session_paths(session['upload_id'])
+    with open(part_path, 'wb') as f:
+        if ENCRYPTION_ENABLED:
+            EncryptingWriter.create(f)
+        session['staged'] = f.tell()
+    _save_session(session)
+    _hashers[session['upload_id']] = (0, hashlib.sha256())
+    return session
+
+
+def write_chunk(upload_id, offset, stream):
+    """
+    Append one chunk at `offset`; returns the updated session
+
+    `offset` must equal the bytes already received. Clients resuming
+    after a disconnect GET the session first to learn where to restart.
+    """
+    with _locked(upload_id):
+        session = load_session(upload_id)
+        if offset != session['received']:
+            raise UploadError('Offset does not match bytes received', status=409,
+                              expected_offset=session['received'])
+
+        cached = _hashers.pop(upload_id, None)
+        hasher = cached[1] if cached and cached[0] == offset else None
+
+        _, part_path, _ = _session_paths(upload_id)
+        with open(part_path, 'r+b') as f:
+            writer = _staging_writer(f, session)
+            written = copy_stream(stream, writer, session['size'] - offset, hasher)
+            if session['encrypted']:
+                writer.flush_segment()
+                session['segments'] = writer.counter
+            f.flush()
+            os.fsync(f.fileno())
+            session['staged'] = f.tell()
+
+        session['received'] = offset + written
+        _save_session(session)
+        if hasher is not None:
+            _hashers[upload_id] = (session['received'], hasher)
+            while len(_hashers) > MAX_CACHED_HASHERS:
+                _hashers.popitem(last=False)
+        return session
+
+
+def _staging_writer(f, session):
+    """Writer positioned at the last durable byte; any torn tail from an interrupted PUT is discarded"""
+    if session['encrypted']:
+        return EncryptingWriter.resume(f, session['segments'], session['staged'])
+    f.seek(session['staged'])
+    f.truncate()
+    return f
+
+
+def _hash_file(path):
+    hasher = hashlib.sha256()
+    buffer = bytearray(STREAM_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open_decrypted(path) as f:
+        while True:
+            n = f.readinto(view)
+            if not n:
+                return hasher.hexdigest()
+            hasher.update(view[:n])
+
+
+def finalize_session(upload_id):
+    """Seal a complete upload; returns (safe_filename, staged path, session)"""
+    with _locked(upload_id):
+        session = load_session(upload_id)
+        if session['received'] != session['size']:
+            raise UploadError('Upload incomplete', status=409, expected_offset=session['received'])
+
+        _, part_path, _ = _session_paths(upload_id)
+        if session['encrypted']:
+            with open(part_path, 'r+b') as f:
+                _staging_writer(f, session).close()  # Authenticated end-of-stream segment
+                f.flush()
+                os.fsync(f.fileno())
+
+        cached = _hashers.get(upload_id)
+        if cached and cached[0] == session['size']:
+            session['sha256'] = cached[1].hexdigest()
+        else:
+            session['sha256'] = _hash_file(part_path)
+
+        safe_filename = secure_filename_generator(session['original_filename'], session['client_id'])
+        staged_path = os.path.join(STAGING_FOLDER, 'complete', safe_filename)
+        os.makedirs(os.path.join(STAGING_FOLDER, 'complete'), exist_ok=True)
+        os.replace(part_path, staged_path)
+        _remove_session(upload_id)
+        return safe_filename, staged_path, session
@@ -7,17 +7,40 @@ import os
 from datetime import timedelta
 
 # File Upload Settings
-UPLOAD_FOLDER = 'uploads/client_data'
+UPLOAD_FOLDER = 'uploads/client_data'  # Legacy per-file storage; new uploads live in BLOB_FOLDER
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls', 'json', 'txt'}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB max
 MAX_TOTAL_UPLOADS_PER_CLIENT = 5
+BLOB_FOLDER = 'uploads/blobs'  # Content-addressed upload storage (see blob_store.py)
+BLOB_DB = 'uploads/blobs.db'
+UPLOAD_INDEX_DB = 'uploads/upload_index.db'  # File metadata, status and quota (see upload_index.py)
+PROFILE_FOLDER = 'uploads/profiles'  # Column profiles from upload_validation.py
+STAGING_FOLDER = 'uploads/staging'  # In-progress chunked uploads (see chunked_upload.py)
+UPLOAD_SESSION_TTL_HOURS = 24  # Abandoned chunked uploads are purged after this
 
 # Security Settings
 ENCRYPTION_ENABLED = True
+ENCRYPTION_KEY_FILE = 'instance/upload_master.key'  # Used only if ROUZE_UPLOAD_MASTER_KEY is unset
 DELETE_AFTER_DAYS = 30  # Auto-delete files after 30 days
+RETENTION_DB = 'uploads/retention.db'  # Expiry index (see retention.py)
+RETENTION_POLICY_DAYS = {
+    'immediate': 1,  # Deleted once analysis is done (we analyze within 24 hours)
+    '30days': 30,
+    'manual': DELETE_AFTER_DAYS,  # Client deletes it; retention period still caps it
+}
+DEFAULT_DELETION_POLICY = '30days'
+SECURE_DELETE_DB = 'uploads/secure_delete.db'  # Durable deletion job queue (see secure_delete.py)
+SECURE_DELETE_WORKERS = 2
+SECURE_DELETE_MAX_ATTEMPTS = 3
+SHRED_CHUNK_SIZE = 1024 * 1024  # Overwrite buffer, reused across files
 REQUIRE_GDPR_CONSENT = True
 AUDIT_LOGGING = True
 
+# Audit trail (append-only JSONL segments, see audit_log.py)
+AUDIT_LOG_DIR = 'uploads/audit_log'
+AUDIT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024  # Rotate segments at 64MB
+LEGACY_AUDIT_LOG = 'uploads/audit_log.json'  # Pre-segment log, still replayed by exports
+
 # File naming (anonymize uploaded files)
 def secure_filename_generator(original_filename, client_id):
     """
@@ -44,16 +67,19 @@ def secure_filename_generator(original_filename, client_id):
 FILE_VALIDATION_RULES = {
     'csv': {
         'max_rows': 100000,
+        'max_columns': 500,
         'allowed_columns': ['*'],  # Allow any columns (client responsible)
         'check': 'csv_structure'
     },
     'xlsx': {
         'max_rows': 50000,
         'max_sheets': 10,
+        'max_columns': 500,
         'check': 'excel_structure'
     },
     'json': {
         'max_size': 5 * 1024 * 1024,  # 5MB
+        'max_columns': 500,  # Distinct keys across all items
         'check': 'json_valid'
     }
 }
@@ -0,0 +1,224 @@
+"""
+ROUZE FUNNEL STORE
+Project state across the questionnaire -> upload -> format -> checkout funnel
+
+Every funnel POST records one step (its form data) against the project
+id. Request handlers only enqueue. A writer thread inserts the queue in
+batches, one SQLite (WAL) transaction per batch, so handlers never wait
+on disk. Steps enqueued but not yet written are kept in a pending
+overlay, and this process's reads see them straight away.
+
+A batch that fails to commit (e.g. 'database is locked') is retried
+with exponential backoff. After MAX_WRITE_ATTEMPTS it is appended to
+FUNNEL_DEAD_LETTER so it can be replayed, never silently dropped.
+
+load_project() rebuilds a project's state from one indexed query on
+(project_id, created_at). Later steps override earlier ones with the
+same name.
+"""
+
+import atexit
+import json
+import os
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+
+from sqlite_store import connect, transaction
+
+FUNNEL_DB = 'instance/funnel.db'
+FUNNEL_DEAD_LETTER = 'instance/funnel_failed.jsonl'
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 0.05  # Seconds a lone step may wait before it is written
+MAX_WRITE_ATTEMPTS = 6
+RETRY_BACKOFF = 0.1  # Seconds before the first retry; doubles each attempt (0.1 .. 1.6)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS funnel_steps (
+    step_id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    vertical TEXT,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS funnel_steps_project ON funnel_steps(project_id, created_at);
+"""
+
+_STOP = object()
+
+
+class FunnelWriter:
+    """Write-behind queue + writer thread; one instance per process"""
+
+    def __init__(self, db_path=FUNNEL_DB, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 max_attempts=MAX_WRITE_ATTEMPTS, dead_letter_path=FUNNEL_DEAD_LETTER):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.dead_letter_path = dead_letter_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._pending = {}  # project_id -> steps enqueued but not yet committed
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._pending = {}
+            self._thread = threading.Thread(target=self._run, name='funnel-writer', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def write(self, step):
+        """Enqueue a step; never blocks on disk"""
+        self._ensure_started()
+        with self._lock:
+            self._pending.setdefault(step['project_id'], []).append(step)
+        self._queue.put(step)
+
+    def pending(self, project_id):
+        if self._pid != os.getpid():
+            return []
+        with self._lock:
+            return list(self._pending.get(project_id, ()))
+
+    def flush(self):
+        """Block until everything enqueued so far is committed"""
+        if self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self):
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    # ---- writer thread -------------------------------------------------
+
+    def _write_batch(self, batch):
+        with transaction(connect(self.db_path, _SCHEMA)) as conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO funnel_steps VALUES (?, ?, ?, ?, ?, ?)',
+                [(step['step_id'], step['project_id'], step['step'], step['vertical'],
+                  json.dumps(step['data'], default=str), step['created_at']) for step in batch])
+
+    def _write_with_retry(self, batch):
+        """Commit a batch, retrying with backoff (INSERT OR IGNORE makes retries safe)"""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self._write_batch(batch)
+                return
+            except (OSError, sqlite3.Error) as e:
+                error = e
+                if attempt < self.max_attempts:
+                    print(f"⚠️  Funnel write failed (attempt {attempt}/{self.max_attempts}): {e}")
+                    time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+        self._dead_letter(batch, error)
+
+    def _dead_letter(self, batch, error):
+        """Keep steps that could not be committed, for replay"""
+        try:
+            os.makedirs(os.path.dirname(self.dead_letter_path) or '.', exist_ok=True)
+            with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+                for step in batch:
+                    f.write(json.dumps({**step, 'error': str(error)}, default=str) + '\n')
+            print(f"❌ {len(batch)} funnel steps not committed after {self.max_attempts} attempts "
+                  f"({error}); saved to {self.dead_letter_path}")
+        except OSError as e:
+            print(f"❌ LOST {len(batch)} funnel steps ({error}; dead letter failed: {e}): "
+                  f"{json.dumps(batch, default=str)}")
+
+    def _settle(self, batch):
+        with self._lock:
+            for step in batch:
+                steps = self._pending.get(step['project_id'], [])
+                if step in steps:
+                    steps.remove(step)
+                if not steps:
+                    self._pending.pop(step['project_id'], None)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            items = [first]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = [item for item in items if item is not _STOP]
+            stopping = len(batch) != len(items)
+            try:
+                if batch:
+                    self._write_with_retry(batch)
+            finally:
+                self._settle(batch)
+                for _ in items:
+                    self._queue.task_done()
+
+
+_writer = FunnelWriter()
+atexit.register(_writer.close)
+
+
+def get_funnel_writer():
+    return _writer
+
+
+def record_step(project_id, step, data, vertical=None):
+    """Record one funnel step (e.g. 'questionnaire', 'upload', 'checkout') for a project"""
+    _writer.write({
+        'step_id': secrets.token_hex(8),
+        'project_id': project_id,
+        'step': step,
+        'vertical': vertical,
+        'data': data,
+        'created_at': time.time(),
+    })
+
+
+def load_project(project_id):
+    """
+    A project's funnel state, or None if it has no recorded steps
+
+        {'project_id', 'vertical', 'current_step', 'created_at',
+         'updated_at', 'steps': {step name: form data}}
+    """
+    pending = _writer.pending(project_id)  # Snapshot before the query, so nothing slips between
+    rows = connect(_writer.db_path, _SCHEMA).execute(
+        'SELECT step_id, step, vertical, data, created_at FROM funnel_steps '
+        'WHERE project_id = ? ORDER BY created_at', (project_id,)).fetchall()
+    steps = [{'step_id': row['step_id'], 'step': row['step'], 'vertical': row['vertical'],
+              'data': json.loads(row['data']), 'created_at': row['created_at']} for row in rows]
+    written = {step['step_id'] for step in steps}
+    steps += [step for step in pending if step['step_id'] not in written]
+    if not steps:
+        return None
+    steps.sort(key=lambda step: step['created_at'])
+
+    project = {
+        'project_id': project_id,
+        'vertical': None,
+        'current_step': steps[-1]['step'],
+        'created_at': steps[0]['created_at'],
+        'updated_at': steps[-1]['created_at'],
+        'steps': {},
+    }
+    for step in steps:
+        project['vertical'] = step['vertical'] or project['vertical']
+        project['steps'][step['step']] = step['data']
+    return project
@@ -1,148 +1,274 @@
-from flask import Flask, render_template, request, redirect, jsonify
+from flask import Flask, render_template, request, redirect, jsonify, abort, Response, send_file, session, stream_with_context, url_for
 from datetime import datetime
+import multiprocessing
 import uuid
 import os
 
+import analysis_jobs
+from funnel_store import load_project, record_step
+from metrics import init_metrics
+from page_cache import PageCache
+from quote_routes import register_quote_routes
+from static_assets import init_assets
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'rouze_secret_key_2025'
+init_assets(app)
+init_metrics(app)
+register_quote_routes(app)
+
+# Pages rendered with no context are served pre-rendered and pre-compressed
+pages = PageCache(app)
+
+def form_data():
+    """Submitted fields (lists kept for multi-value fields) plus uploaded file names"""
+    data = {key: values if len(values) > 1 else values[0] for key, values in request.form.lists()}
+    for key in request.files:
+        data[key] = [f.filename for f in request.files.getlist(key) if f.filename]
+    return data
+
+MAX_SESSION_PROJECTS = 20
+
+def start_project():
+    """New project id, bound to this browser's session (only the session may write or read it)"""
+    project_id = uuid.uuid4().hex
+    session['project_id'] = project_id
+    session['projects'] = (session.get('projects', []) + [project_id])[-MAX_SESSION_PROJECTS:]
+    return project_id
+
+def current_project():
+    """The session's project; a project_id sent by the client is never trusted"""
+    return session.get('project_id') or start_project()
+
+def owned_project(project_id):
+    """Funnel state for `project_id` if this session owns it, else None"""
+    if not project_id or project_id not in session.get('projects', []):
+        return None
+    return load_project(project_id)
+
+def owned_job(job_id):
+    """Analysis job `job_id` if it belongs to one of this session's projects, else None"""
+    job = analysis_jobs.get_job(job_id)
+    if job is None or job['project_id'] not in session.get('projects', []):
+        return None
+    return job
+
+def job_json(job):
+    """Job state for the browser: a download URL, never the server-side report path"""
+    if job is None:
+        return None
+    job = dict(job)
+    job['report_url'] = url_for('analysis_job_report', job_id=job['job_id']) if job.pop('report_ready') else None
+    return job
 
 # HOME & MAIN PAGES
 @app.route('/', methods=['GET'])
 @app.route('/home', methods=['GET'])
 def home():
-    return render_template('index.html')
+    return pages.serve('index.html')
 
 @app.route('/vertical-selector', methods=['GET'])
 def vertical_selector():
-    return render_template('vertical_selector.html')
+    return pages.serve('vertical_selector.html')
 
 @app.route('/methodology', methods=['GET'])
 def methodology():
-    return render_template('methodology.html')
+    return pages.serve('methodology.html')
 
 @app.route('/security', methods=['GET'])
 def security():
-    return render_template('security.html')
+    return pages.serve('security.html')
 
 @app.route('/case-studies', methods=['GET'])
 def case_studies():
-    return render_template('case_studies.html')
+    return pages.serve('case_studies.html')
 
 @app.route('/pricing', methods=['GET'])
 def pricing():
-    return render_template('pricing.html')
+    return pages.serve('pricing.html')
 
 @app.route('/about', methods=['GET'])
 def about():
-    return render_template('about.html')
+    return pages.serve('about.html')
 
 @app.route('/faq', methods=['GET'])
 def faq():
-    return render_template('faq.html')
+    return pages.serve('faq.html')
 
 @app.route('/terms', methods=['GET'])
 def terms():
-    return render_template('terms.html')
+    return pages.serve('terms.html')
 
 @app.route('/privacy', methods=['GET'])
 def privacy():
-    return render_template('privacy.html')
+    return pages.serve('privacy.html')
 
 @app.route('/account', methods=['GET'])
 def account():
-    return render_template('account.html')
+    return pages.serve('account.html')
 
 # QUESTIONNAIRE ROUTES
 @app.route('/questionnaire/healthcare', methods=['GET'])
 def questionnaire_healthcare():
-    return render_template('questionnaire_healthcare.html')
+    return pages.serve('questionnaire_healthcare.html')
 
 @app.route('/questionnaire/healthcare', methods=['POST'])
 def api_questionnaire_healthcare_submit():
-    project_id = str(uuid.uuid4())[:8]
+    project_id = start_project()
+    record_step(project_id, 'questionnaire', form_data(), vertical='healthcare')
     return redirect(f'/upload?vertical=healthcare&project_id={project_id}')
 
 @app.route('/questionnaire/saas', methods=['GET'])
 def questionnaire_saas():
-    return render_template('questionnaire_saas.html')
+    return pages.serve('questionnaire_saas.html')
 
 @app.route('/questionnaire/saas', methods=['POST'])
 def api_questionnaire_saas_submit():
-    project_id = str(uuid.uuid4())[:8]
+    project_id = start_project()
+    record_step(project_id, 'questionnaire', form_data(), vertical='saas')
     return redirect(f'/upload?vertical=saas&project_id={project_id}')
 
 @app.route('/questionnaire/ecommerce', methods=['GET'])
 def questionnaire_ecommerce():
-    return render_template('questionnaire_ecommerce.html')
+    return pages.serve('questionnaire_ecommerce.html')
 
 @app.route('/questionnaire/ecommerce', methods=['POST'])
 def api_questionnaire_ecommerce_submit():
-    project_id = str(uuid.uuid4())[:8]
+    project_id = start_project()
+    record_step(project_id, 'questionnaire', form_data(), vertical='ecommerce')
     return redirect(f'/upload?vertical=ecommerce&project_id={project_id}')
 
 @app.route('/questionnaire/fintech', methods=['GET'])
 def questionnaire_fintech():
-    return render_template('questionnaire_fintech.html')
+    return pages.serve('questionnaire_fintech.html')
 
 @app.route('/questionnaire/fintech', methods=['POST'])
 def api_questionnaire_fintech_submit():
-    project_id = str(uuid.uuid4())[:8]
+    project_id = start_project()
+    record_step(project_id, 'questionnaire', form_data(), vertical='fintech')
     return redirect(f'/upload?vertical=fintech&project_id={project_id}')
 
 @app.route('/questionnaire/realestate', methods=['GET'])
 def questionnaire_realestate():
-    return render_template('questionnaire_realestate.html')
+    return pages.serve('questionnaire_realestate.html')
 
 @app.route('/questionnaire/realestate', methods=['POST'])
 def api_questionnaire_realestate_submit():
-    project_id = str(uuid.uuid4())[:8]
+    project_id = start_project()
+    record_step(project_id, 'questionnaire', form_data(), vertical='realestate')
     return redirect(f'/upload?vertical=realestate&project_id={project_id}')
 
 # DATA UPLOAD & FORMAT SELECTION
 @app.route('/upload', methods=['GET'])
 def upload():
-    return render_template('data_upload.html')
+    return pages.serve('data_upload.html')
 
 @app.route('/upload', methods=['POST'])
 def api_upload_submit():
     vertical = request.args.get('vertical', request.form.get('vertical', 'healthcare'))
-    project_id = request.args.get('project_id', str(uuid.uuid4())[:8])
+    project_id = current_project()
+    record_step(project_id, 'upload', form_data(), vertical=vertical)
     return redirect(f'/format-selection?vertical={vertical}&project_id={project_id}')
 
 @app.route('/format-selection', methods=['GET'])
 def format_selection():
-    return render_template('format_selection.html')
+    return pages.serve('format_selection.html')
 
 @app.route('/format-selection', methods=['POST'])
 def api_format_selection_submit():
     vertical = request.args.get('vertical', 'healthcare')
-    project_id = request.args.get('project_id', str(uuid.uuid4())[:8])
+    project_id = current_project()
+    record_step(project_id, 'format_selection', form_data(), vertical=vertical)
     return redirect(f'/checkout?vertical={vertical}&project_id={project_id}')
 
 # CHECKOUT
 @app.route('/checkout', methods=['GET'])
 def checkout():
-    return render_template('checkout.html')
+    return pages.serve('checkout.html')
 
 @app.route('/checkout', methods=['POST'])
 def api_checkout_submit():
-    project_id = request.args.get('project_id', str(uuid.uuid4())[:8])
-    return redirect(f'/analysis?project_id={project_id}')
+    project_id = current_project()
+    vertical = request.args.get('vertical')
+    if vertical not in analysis_jobs.supported_verticals():
+        return jsonify({'error': f'Analysis is not available for vertical {vertical!r}'}), 400
+    record_step(project_id, 'checkout', form_data(), vertical=vertical)
+    job_id = analysis_jobs.enqueue_analysis(project_id, vertical)
+    return redirect(f'/analysis?project_id={project_id}&job_id={job_id}')
 
 # ANALYSIS PROCESSING
 @app.route('/analysis', methods=['GET'])
 def analysis_processing():
-    return render_template('analysis.html')
+    project = owned_project(request.args.get('project_id'))
+    if project is None:
+        return pages.serve('analysis.html')
+    project['job'] = job_json(analysis_jobs.latest_job(project['project_id']))
+    return render_template('analysis.html', project=project)
+
+@app.route('/analysis/jobs/<job_id>', methods=['GET'])
+def analysis_job_status(job_id):
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_json(job))
+
+@app.route('/analysis/jobs/<job_id>/report', methods=['GET'])
+def analysis_job_report(job_id):
+    report_path = analysis_jobs.get_report_path(job_id) if owned_job(job_id) else None
+    if report_path is None:
+        return jsonify({'error': 'Report not found'}), 404
+    return send_file(os.path.abspath(report_path), mimetype='application/json', as_attachment=True,
+                     download_name=f'rouze_report_{job_id}.json')
+
+@app.route('/analysis/jobs/<job_id>/cancel', methods=['POST'])
+def analysis_job_cancel(job_id):
+    status = analysis_jobs.cancel_job(job_id) if owned_job(job_id) else None
+    if status is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'job_id': job_id, 'status': status})
+
+@app.route('/analysis/jobs/<job_id>/events', methods=['GET'])
+def analysis_job_events(job_id):
+    if owned_job(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    response = Response(stream_with_context(analysis_jobs.iter_job_events(job_id)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let a proxy buffer the stream
+    return response
 
 # DASHBOARD
 @app.route('/dashboard', methods=['GET'])
 def dashboard():
-    return render_template('dashboard.html')
+    return pages.serve('dashboard.html')
+
+@app.route('/dashboard/<project_id>', methods=['GET'])
+def project_dashboard(project_id):
+    project = owned_project(project_id)
+    if project is None:
+        abort(404)
+    return render_template('dashboard.html', project=project)
 
 # ERROR HANDLERS
 @app.errorhandler(404)
 def not_found(error):
     return render_template('404.html'), 404
 
+# PAGE CACHE
+STATIC_PAGES = [
+    'index.html', 'vertical_selector.html', 'methodology.html', 'security.html',
+    'case_studies.html', 'pricing.html', 'about.html', 'faq.html', 'terms.html',
+    'privacy.html', 'account.html', 'questionnaire_healthcare.html',
+    'questionnaire_saas.html', 'questionnaire_ecommerce.html', 'questionnaire_fintech.html',
+    'questionnaire_realestate.html', 'data_upload.html', 'format_selection.html',
+    'checkout.html', 'analysis.html', 'dashboard.html',
+]
+pages.prerender(STATIC_PAGES)
+
+# Resume queued and retrying analysis jobs without waiting for the next checkout
+# (not in spawned analysis processes, which may import this module as __mp_main__)
+if multiprocessing.parent_process() is None:
+    analysis_jobs.start_runners()
+
 if __name__ == '__main__':
     app.run(debug=True, host='127.0.0.1', port=5000)
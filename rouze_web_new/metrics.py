@@ -0,0 +1,304 @@
+"""
+ROUZE METRICS
+Per-endpoint request metrics, aggregated across gunicorn workers, in
+Prometheus text format at /metrics
+
+    rouze_http_requests_total               count by endpoint, method and status
+    rouze_http_request_duration_seconds     latency histogram (whole request)
+    rouze_http_handler_duration_seconds     the same, minus template rendering
+    rouze_http_response_size_bytes          response size histogram
+    rouze_template_render_seconds           render time per template
+    rouze_http_request_duration_quantile_seconds
+                                            p50/p95/p99 estimated from the histogram
+
+Recording takes no locks. Every thread updates its own bucket, and
+buckets are only summed when a snapshot is taken. Each worker writes its
+snapshot to METRICS_DIR every few seconds. /metrics merges the snapshots
+of all workers. Histograms use geometric (log-scale) buckets, so the
+memory per series stays fixed. Streamed responses are timed until the
+handler returns, not until the last byte is sent.
+
+/metrics is off unless a token is configured (METRICS_TOKEN in the app
+config, or the ROUZE_METRICS_TOKEN environment variable); scrapers then
+send "Authorization: Bearer <token>". Without a token it returns 404.
+
+Usage:
+    init_metrics(app)
+"""
+
+import bisect
+import json
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, abort, before_render_template, g, request, template_rendered
+
+METRICS_DIR = 'instance/metrics'
+FLUSH_INTERVAL = 5.0
+STALE_SECONDS = 3600  # Snapshots of workers silent this long are dropped
+QUANTILES = (0.5, 0.95, 0.99)
+
+LATENCY_BUCKETS = tuple(0.0005 * 2 ** (i / 2) for i in range(34))  # 0.5ms .. ~46s
+SIZE_BUCKETS = tuple(2 ** i for i in range(7, 27))                  # 128B .. 64MB
+
+_HISTOGRAMS = {
+    'rouze_http_request_duration_seconds': ('Request latency', LATENCY_BUCKETS),
+    'rouze_http_handler_duration_seconds': ('Request latency excluding template rendering', LATENCY_BUCKETS),
+    'rouze_http_response_size_bytes': ('Response body size', SIZE_BUCKETS),
+    'rouze_template_render_seconds': ('Template render time', LATENCY_BUCKETS),
+}
+_COUNTERS = {
+    'rouze_http_requests_total': 'Requests by endpoint, method and status',
+}
+
+
+class _Bucket:
+    """One thread's counters and histograms; only that thread writes to it"""
+
+    def __init__(self):
+        self.counters = defaultdict(int)
+        self.histograms = {}
+
+    def observe(self, name, labels, value):
+        series = self.histograms.get((name, labels))
+        if series is None:
+            series = self.histograms[(name, labels)] = [[0] * (len(_HISTOGRAMS[name][1]) + 1), 0.0]
+        series[0][bisect.bisect_left(_HISTOGRAMS[name][1], value)] += 1
+        series[1] += value
+
+
+class _Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pid = None
+        self._buckets = []
+        self._worker_id = None
+
+    def bucket(self):
+        bucket = getattr(self._local, 'bucket', None)
+        if bucket is None or self._pid != os.getpid():
+            bucket = self._new_bucket()
+        return bucket
+
+    def _new_bucket(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # New process (forked worker): start clean, with its own snapshot file
+                self._pid = os.getpid()
+                self._buckets = []
+                self._worker_id = f'{self._pid}-{secrets.token_hex(4)}'
+                threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+            bucket = _Bucket()
+            self._buckets.append(bucket)
+            self._local.bucket = bucket
+            return bucket
+
+    def snapshot(self):
+        """This process's totals, JSON-ready"""
+        counters = defaultdict(int)
+        histograms = {}
+        for bucket in list(self._buckets):
+            for key, value in list(bucket.counters.items()):
+                counters[key] += value
+            for key, (counts, total) in list(bucket.histograms.items()):
+                merged = histograms.setdefault(key, [[0] * len(counts), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+        return {
+            'updated_at': time.time(),
+            'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+            'histograms': [[name, list(labels), counts, total]
+                           for (name, labels), (counts, total) in histograms.items()],
+        }
+
+    def write_snapshot(self):
+        if self._pid != os.getpid():
+            return
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = os.path.join(METRICS_DIR, f'{self._worker_id}.json')
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            try:
+                self.write_snapshot()
+            except OSError as e:
+                print(f"Failed to write metrics snapshot: {e}")
+
+
+_registry = _Registry()
+
+
+def observe(name, labels, value):
+    _registry.bucket().observe(name, labels, value)
+
+
+def increment(name, labels, amount=1):
+    _registry.bucket().counters[(name, labels)] += amount
+
+
+# ----------------------------------------------------------------------
+# Aggregation and exposition
+# ----------------------------------------------------------------------
+
+def collect(metrics_dir=METRICS_DIR):
+    """Sum the snapshots of every live worker"""
+    counters = defaultdict(int)
+    histograms = {}
+    now = time.time()
+    names = os.listdir(metrics_dir) if os.path.isdir(metrics_dir) else []
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        path = os.path.join(metrics_dir, name)
+        try:
+            with open(path, 'r') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if now - snapshot.get('updated_at', 0) > STALE_SECONDS:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        for metric, labels, value in snapshot['counters']:
+            counters[(metric, tuple(map(tuple, labels)))] += value
+        for metric, labels, counts, total in snapshot['histograms']:
+            merged = histograms.setdefault((metric, tuple(map(tuple, labels))), [[0] * len(counts), 0.0])
+            merged[0] = [a + b for a, b in zip(merged[0], counts)]
+            merged[1] += total
+    return counters, histograms
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+def quantile(bounds, counts, q):
+    """Estimate a quantile from histogram buckets (linear within a bucket)"""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if seen + count >= rank and count:
+            lower = bounds[i - 1] if i > 0 else 0.0
+            upper = bounds[i] if i < len(bounds) else bounds[-1]
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return bounds[-1]
+
+
+def render_prometheus(counters, histograms):
+    lines = []
+    for name, help_text in _COUNTERS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f'{name}{_label_text(labels)} {value}')
+
+    for name, (help_text, bounds) in _HISTOGRAMS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for (metric, labels), (counts, total) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_label_text(labels, [("le", f"{bound:.6g}")])} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{name}_bucket{_label_text(labels, [("le", "+Inf")])} {cumulative}')
+            lines.append(f'{name}_sum{_label_text(labels)} {total:.6f}')
+            lines.append(f'{name}_count{_label_text(labels)} {cumulative}')
+
+    name = 'rouze_http_request_duration_quantile_seconds'
+    lines += [f'# HELP {name} Request latency quantiles estimated from the histogram', f'# TYPE {name} gauge']
+    for (metric, labels), (counts, _) in sorted(histograms.items()):
+        if metric != 'rouze_http_request_duration_seconds':
+            continue
+        for q in QUANTILES:
+            value = quantile(LATENCY_BUCKETS, counts, q)
+            if value is not None:
+                lines.append(f'{name}{_label_text(labels, [("quantile", str(q))])} {value:.6f}')
+    return '\n'.join(lines) + '\n'
+
+
+# ----------------------------------------------------------------------
+# Flask integration
+# ----------------------------------------------------------------------
+
+_render_state = threading.local()
+
+
+def _before_render(sender, template, context, **extra):
+    _render_state.stack = getattr(_render_state, 'stack', [])
+    _render_state.stack.append(time.perf_counter())
+
+
+def _rendered(sender, template, context, **extra):
+    stack = getattr(_render_state, 'stack', None)
+    if not stack:
+        return
+    elapsed = time.perf_counter() - stack.pop()
+    if not stack:  # Nested renders are already inside the outer one's time
+        _render_state.request_time = getattr(_render_state, 'request_time', 0.0) + elapsed
+    observe('rouze_template_render_seconds', (('app', sender.name), ('template', template.name or '')), elapsed)
+
+
+def init_metrics(app):
+    """Instrument every request of `app` and serve /metrics (safe to call more than once)"""
+    if 'rouze_metrics' in app.extensions:
+        return
+    app.extensions['rouze_metrics'] = True
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_rendered, app)
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+        _render_state.request_time = 0.0
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('_metrics_start', None)
+        if start is None or request.path == '/metrics':
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.url_rule.rule if request.url_rule else '<unmatched>'
+        labels = (('app', app.name), ('endpoint', endpoint))
+        increment('rouze_http_requests_total',
+                  labels + (('method', request.method), ('status', str(response.status_code))))
+        observe('rouze_http_request_duration_seconds', labels, elapsed)
+        observe('rouze_http_handler_duration_seconds', labels,
+                max(0.0, elapsed - getattr(_render_state, 'request_time', 0.0)))
+        if response.content_length is not None:
+            observe('rouze_http_response_size_bytes', labels, response.content_length)
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        token = app.config.get('METRICS_TOKEN') or os.getenv('ROUZE_METRICS_TOKEN')
+        if not token:
+            abort(404)
+        if not secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            return Response('Unauthorized\n', 401, {'WWW-Authenticate': 'Bearer'}, mimetype='text/plain')
+        try:
+            _registry.write_snapshot()  # Include this worker's latest numbers
+        except OSError as e:
+            print(f"Failed to write metrics snapshot: {e}")
+        return Response(render_prometheus(*collect()), mimetype='text/plain; version=0.0.4')
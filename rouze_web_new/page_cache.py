@@ -0,0 +1,111 @@
+"""
+ROUZE PAGE CACHE
+Pre-rendered, pre-compressed responses for pages that take no context
+
+Marketing and funnel pages render the same HTML for every visitor. They
+are rendered once at startup, compressed with gzip (and brotli when the
+`brotli` package is installed) and served from memory:
+
+    - the variant is chosen from Accept-Encoding (br, then gzip, then plain)
+    - every variant has a strong ETag; If-None-Match gets a bodyless 304
+    - Vary: Accept-Encoding keeps shared caches from mixing variants
+
+With TEMPLATES_AUTO_RELOAD (or debug) on, each hit checks whether the
+template file changed and re-renders it if so. invalidate() drops pages
+explicitly, e.g. after a deploy hook rewrites templates.
+"""
+
+import gzip
+import hashlib
+import threading
+
+from flask import render_template, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MAX_AGE = 300  # Seconds browsers may reuse a page before revalidating (0 while auto-reloading)
+
+
+class CachedPage:
+    """One rendered template and its encoded variants"""
+
+    def __init__(self, html, uptodate=None):
+        body = html.encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {None: body, 'gzip': gzip.compress(body, 9)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body, quality=11)
+        self.etags = {encoding: f'{digest}-{encoding}' if encoding else digest
+                      for encoding in self.variants}
+        self.uptodate = uptodate
+
+
+class PageCache:
+    def __init__(self, app):
+        self.app = app
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def _auto_reload(self):
+        return bool(self.app.config.get('TEMPLATES_AUTO_RELOAD') or self.app.debug)
+
+    def _render(self, template):
+        env = self.app.jinja_env
+        uptodate = None
+        try:
+            _, _, uptodate = env.loader.get_source(env, template)
+        except Exception:  # Loaders without file tracking: never stale, invalidate() still works
+            pass
+        return CachedPage(render_template(template), uptodate)
+
+    def prerender(self, templates):
+        """Render and compress `templates` now (call at startup)"""
+        with self.app.test_request_context('/'):
+            pages = {template: self._render(template) for template in templates}
+        with self._lock:
+            self._pages.update(pages)
+
+    def invalidate(self, template=None):
+        """Drop one cached page, or all of them; they re-render on the next hit"""
+        with self._lock:
+            if template is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(template, None)
+
+    def _get(self, template):
+        page = self._pages.get(template)
+        if page is not None and self._auto_reload() and page.uptodate and not page.uptodate():
+            page = None
+        if page is None:
+            page = self._render(template)
+            with self._lock:
+                self._pages[template] = page
+        return page
+
+    def serve(self, template):
+        """Response for `template`, from the cache, negotiated and conditional"""
+        page = self._get(template)
+        encoding = None
+        for candidate in ('br', 'gzip'):
+            if candidate in page.variants and request.accept_encodings.quality(candidate) > 0:
+                encoding = candidate
+                break
+
+        etag = page.etags[encoding]
+        headers = {
+            'ETag': f'"{etag}"',
+            'Vary': 'Accept-Encoding',
+            'Cache-Control': f'public, max-age={0 if self._auto_reload() else MAX_AGE}',
+        }
+        if request.if_none_match.contains(etag):
+            return self.app.response_class(status=304, headers=headers)
+
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        response = self.app.response_class(page.variants[encoding], mimetype='text/html', headers=headers)
+        response.content_length = len(page.variants[encoding])
+        return response
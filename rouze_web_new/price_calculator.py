@@ -1,16 +1,57 @@
+import hashlib
+import json
+from itertools import product
+
 BASE_PRICE = 5000
 DATA_SOURCES_COST = {'standard': 0, 'comprehensive': 1500, 'custom': 3000}
 FREQUENCY_COST = {'one_time': 0, 'weekly': 1000, 'daily': 2500, 'realtime': 4000}
 TEAM_SIZE_COST = {'small': 0, 'medium': 500, 'large': 1000}
 FEATURES_COST = {'custom_kpi': 800, 'api_access': 500, 'white_label': 1200, 'dedicated_analyst': 2000, 'custom_training': 500}
 SUPPORT_COST = {'email': 0, 'monthly_calls': 200, 'weekly_calls': 500, 'embedded_analyst': 3000}
-def calculate_monthly_price(data_sources, frequency, team_size, features, support):
-    total = BASE_PRICE + DATA_SOURCES_COST.get(data_sources, 0) + FREQUENCY_COST.get(frequency, 0) + TEAM_SIZE_COST.get(team_size, 0) + SUPPORT_COST.get(support, 0)
-    if features:
-        for feature in features:
-            total += FEATURES_COST.get(feature, 0)
-    return total
-def get_price_breakdown(data_sources, frequency, team_size, features, support):
+
+# Quote table: every (data_sources, frequency, team_size, support, feature bitmask) priced once at import.
+# FEATURE_BITS gives each feature's bit; QUOTE_TABLE_VERSION changes whenever any price does.
+FEATURE_BITS = {feature: 1 << i for i, feature in enumerate(FEATURES_COST)}
+QUOTE_TABLE_VERSION = hashlib.sha256(json.dumps(
+    [BASE_PRICE, DATA_SOURCES_COST, FREQUENCY_COST, TEAM_SIZE_COST, FEATURES_COST, SUPPORT_COST],
+    sort_keys=True).encode()).hexdigest()[:16]
+
+def _compute_breakdown(data_sources, frequency, team_size, features, support):
     breakdown = {'base': BASE_PRICE, 'data_sources': DATA_SOURCES_COST.get(data_sources, 0), 'frequency': FREQUENCY_COST.get(frequency, 0), 'team_size': TEAM_SIZE_COST.get(team_size, 0), 'features': sum(FEATURES_COST.get(f, 0) for f in features) if features else 0, 'support': SUPPORT_COST.get(support, 0)}
     breakdown['total'] = sum(breakdown.values())
     return breakdown
+
+def _features_for(mask):
+    return [feature for feature, bit in FEATURE_BITS.items() if mask & bit]
+
+QUOTE_TABLE = {
+    (data_sources, frequency, team_size, support, mask): _compute_breakdown(data_sources, frequency, team_size, _features_for(mask), support)
+    for data_sources, frequency, team_size, support, mask in product(DATA_SOURCES_COST, FREQUENCY_COST, TEAM_SIZE_COST, SUPPORT_COST, range(1 << len(FEATURES_COST)))
+}
+
+def feature_mask(features):
+    """Bitmask for a feature list, or None if it can't be tabled (unknown or repeated features)"""
+    mask = 0
+    for feature in features or ():
+        bit = FEATURE_BITS.get(feature)
+        if bit is None or mask & bit:
+            return None
+        mask |= bit
+    return mask
+
+def get_price_breakdown(data_sources, frequency, team_size, features, support):
+    mask = feature_mask(features)
+    breakdown = QUOTE_TABLE.get((data_sources, frequency, team_size, support, mask)) if mask is not None else None
+    if breakdown is None:  # Option outside the table: price it directly
+        return _compute_breakdown(data_sources, frequency, team_size, features, support)
+    return dict(breakdown)
+
+def calculate_monthly_price(data_sources, frequency, team_size, features, support):
+    return get_price_breakdown(data_sources, frequency, team_size, features, support)['total']
+
+def quote_grid():
+    """Every tabled total as nested lists: totals[data_sources][frequency][team_size][support][feature mask], indexed by the option lists"""
+    options = {'data_sources': list(DATA_SOURCES_COST), 'frequency': list(FREQUENCY_COST), 'team_size': list(TEAM_SIZE_COST), 'support': list(SUPPORT_COST)}
+    totals = [[[[[QUOTE_TABLE[(d, f, t, s, mask)]['total'] for mask in range(1 << len(FEATURES_COST))]
+                 for s in options['support']] for t in options['team_size']] for f in options['frequency']] for d in options['data_sources']]
+    return {'version': QUOTE_TABLE_VERSION, 'options': options, 'features': list(FEATURE_BITS), 'totals': totals}
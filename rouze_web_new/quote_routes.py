@@ -0,0 +1,48 @@
+"""
+ROUZE QUOTE API
+Price quotes from the precomputed quote table, shared by every app
+
+    GET  /api/quotes    whole price grid; clients cache it by ETag (the quote table version)
+    POST /api/quotes    batch of configurations -> price breakdowns
+"""
+
+from flask import request, jsonify
+import json
+from price_calculator import QUOTE_TABLE_VERSION, get_price_breakdown, quote_grid
+
+# Whole price grid, serialized once
+QUOTE_GRID_JSON = json.dumps(quote_grid(), separators=(',', ':'))
+MAX_QUOTE_BATCH = 500
+
+def valid_quote_configuration(c):
+    return (isinstance(c, dict)
+            and all(isinstance(c.get(key, ''), str) for key in ('data_sources', 'frequency', 'team_size', 'support'))
+            and isinstance(c.get('features') or [], list)
+            and all(isinstance(f, str) for f in c.get('features') or []))
+
+def register_quote_routes(app):
+    """Register /api/quotes"""
+
+    @app.route('/api/quotes', methods=['GET'])
+    def quote_grid_api():
+        response = app.response_class(QUOTE_GRID_JSON, mimetype='application/json')
+        response.set_etag(QUOTE_TABLE_VERSION)
+        response.headers['Cache-Control'] = 'public, no-cache'
+        return response.make_conditional(request)
+
+    @app.route('/api/quotes', methods=['POST'])
+    def quote_batch_api():
+        payload = request.get_json(silent=True)
+        configurations = payload.get('configurations') if isinstance(payload, dict) else payload
+        if not isinstance(configurations, list) or not all(valid_quote_configuration(c) for c in configurations):
+            return jsonify({'error': 'Expected {"configurations": [{"data_sources": ..., "features": [...]}, ...]}'}), 400
+        if len(configurations) > MAX_QUOTE_BATCH:
+            return jsonify({'error': f'At most {MAX_QUOTE_BATCH} configurations per request'}), 400
+        quotes = [get_price_breakdown(
+            data_sources=c.get('data_sources', 'standard'),
+            frequency=c.get('frequency', 'one_time'),
+            team_size=c.get('team_size', 'small'),
+            features=c.get('features') or [],
+            support=c.get('support', 'email')
+        ) for c in configurations]
+        return jsonify({'version': QUOTE_TABLE_VERSION, 'quotes': quotes})
@@ -0,0 +1,146 @@
+"""
+ROUZE RETENTION SWEEPER
+Expiry-indexed deletion of client uploads
+
+Every stored upload gets a row keyed by its expiry time when it is
+written (schedule()), derived from the client's deletion_policy. A
+sweep reads only the rows that are due, using the expires_at index, and
+hands them to the secure deletion queue. Its cost depends on how many
+files expire, not on how many are stored, and nothing lists or stats
+the upload folder.
+
+Usage:
+    python3 retention.py --once              # one sweep, shred inline (cron)
+    python3 retention.py --daemon            # sweep every SWEEP_INTERVAL seconds
+    python3 retention.py --backfill          # index files uploaded before this existed
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from config_upload_security import (
+    DEFAULT_DELETION_POLICY,
+    RETENTION_DB,
+    RETENTION_POLICY_DAYS,
+    UPLOAD_FOLDER,
+)
+from secure_delete import enqueue_deletion, run_pending
+from sqlite_store import connect, transaction
+
+SWEEP_BATCH = 500
+SWEEP_INTERVAL = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS retention (
+    filepath TEXT PRIMARY KEY,
+    client_id TEXT,
+    policy TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS retention_expiry ON retention(expires_at);
+"""
+
+
+def _db():
+    return connect(RETENTION_DB, _SCHEMA)
+
+
+def policy_days(policy):
+    return RETENTION_POLICY_DAYS.get(policy, RETENTION_POLICY_DAYS[DEFAULT_DELETION_POLICY])
+
+
+def schedule(filepath, policy=DEFAULT_DELETION_POLICY, client_id=None, created_at=None):
+    """
+    Record (or update) when `filepath` must be deleted; returns the expiry timestamp
+
+    Re-scheduling keeps the original upload time, so a policy chosen after
+    the upload counts from when the file arrived.
+    """
+    if policy not in RETENTION_POLICY_DAYS:
+        policy = DEFAULT_DELETION_POLICY
+    with transaction(_db()) as conn:
+        row = conn.execute('SELECT created_at, client_id FROM retention WHERE filepath = ?',
+                           (filepath,)).fetchone()
+        if row:
+            created_at = row['created_at']
+            client_id = client_id or row['client_id']
+        elif created_at is None:
+            created_at = time.time()
+        expires_at = created_at + policy_days(policy) * 86400
+        conn.execute('INSERT OR REPLACE INTO retention VALUES (?, ?, ?, ?, ?)',
+                     (filepath, client_id, policy, created_at, expires_at))
+    return expires_at
+
+
+def cancel(filepath):
+    """Forget `filepath` (it was deleted some other way)"""
+    _db().execute('DELETE FROM retention WHERE filepath = ?', (filepath,))
+
+
+def sweep(now=None, batch=SWEEP_BATCH, wake=True):
+    """
+    Queue every expired file for secure deletion; returns how many were queued
+
+    wake=False leaves the jobs for the caller's run_pending() (see enqueue_deletion)
+    """
+    now = time.time() if now is None else now
+    queued = 0
+    while True:
+        rows = _db().execute(
+            'SELECT filepath, client_id, policy, created_at FROM retention '
+            'WHERE expires_at <= ? ORDER BY expires_at LIMIT ?', (now, batch)).fetchall()
+        if not rows:
+            return queued
+        for row in rows:
+            # Enqueue before removing the row: a crash in between re-queues
+            # the file next sweep, which the deletion worker treats as a no-op
+            enqueue_deletion(row['filepath'], action='auto_delete_old_file', wake=wake,
+                             client_id=row['client_id'], policy=row['policy'],
+                             file_created=datetime.fromtimestamp(row['created_at']).isoformat())
+        with transaction(_db()) as conn:
+            conn.executemany('DELETE FROM retention WHERE filepath = ?',
+                             [(row['filepath'],) for row in rows])
+        queued += len(rows)
+
+
+def backfill(upload_folder=UPLOAD_FOLDER, policy=DEFAULT_DELETION_POLICY):
+    """One-time scan to index files stored before retention was tracked; returns files added"""
+    if not os.path.isdir(upload_folder):
+        return 0
+    known = {filepath for (filepath,) in _db().execute('SELECT filepath FROM retention')}
+    added = 0
+    for entry in os.scandir(upload_folder):
+        if entry.is_file() and entry.path not in known:
+            schedule(entry.path, policy, created_at=entry.stat().st_ctime)
+            added += 1
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ROUZE upload retention sweeper')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--once', action='store_true', help='Run one sweep and exit (default)')
+    mode.add_argument('--daemon', action='store_true', help='Keep sweeping every --interval seconds')
+    parser.add_argument('--interval', type=int, default=SWEEP_INTERVAL)
+    parser.add_argument('--backfill', action='store_true',
+                        help='Index files already in the upload folder before sweeping')
+    args = parser.parse_args(argv)
+
+    if args.backfill:
+        print(f"✅ Indexed {backfill()} existing files")
+
+    while True:
+        queued = sweep(wake=False)  # Shredded below in this thread, so exit never interrupts one
+        shredded = run_pending()
+        print(f"[{datetime.now().isoformat()}] Queued {queued} expired files, deleted {shredded}")
+        if not args.daemon:
+            return 0
+        time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
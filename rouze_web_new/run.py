@@ -2,10 +2,22 @@ from flask import Flask, render_template, jsonify
 from flask import Flask, render_template, request, redirect, session, jsonify
 import os
 import uuid
-from price_calculator import calculate_monthly_price, get_price_breakdown
+from price_calculator import get_price_breakdown
+from config_upload_security import UPLOAD_FOLDER
+from retention import schedule as schedule_retention
+import upload_index
+from upload_routes import session_owns_upload
+from static_assets import init_assets
+from server_session import ServerSessionInterface
+from metrics import init_metrics
+from quote_routes import register_quote_routes
 
 app = Flask(__name__)
 app.secret_key = os.getenv('SECRET_KEY', 'dev-key-change-in-production')
+app.session_interface = ServerSessionInterface()  # Cookie holds only an opaque session id
+init_assets(app)
+init_metrics(app)
+register_quote_routes(app)
 
 @app.route('/')
 def home():
@@ -42,16 +54,7 @@ def submit_questionnaire(vertical):
         team_size = form_data.get('team_size', 'small')
         support = form_data.get('support', 'email')
         
-        # Calculate price
-        monthly_price = calculate_monthly_price(
-            data_sources=data_sources,
-            frequency=frequency,
-            team_size=team_size,
-            features=features,
-            support=support
-        )
-        
-        # Get breakdown
+        # Price and breakdown in one quote table lookup
         price_breakdown = get_price_breakdown(
             data_sources=data_sources,
             frequency=frequency,
@@ -59,6 +62,7 @@ def submit_questionnaire(vertical):
             features=features,
             support=support
         )
+        monthly_price = price_breakdown['total']
         
         # Store in session
         session['custom_monthly_price'] = monthly_price
@@ -85,6 +89,13 @@ def handle_upload():
     vertical = request.form.get('vertical')
     deletion_policy = request.form.get('deletion_policy', 'immediate')
     session['deletion_policy'] = deletion_policy
+    
+    # Files this session uploaded via /upload/data: expire them per the chosen policy.
+    # Any other id (someone else's file, deleted, rejected) is ignored.
+    file_id = request.form.get('file_id')
+    if file_id and session_owns_upload(file_id):
+        expires_at = schedule_retention(os.path.join(UPLOAD_FOLDER, file_id), deletion_policy)
+        upload_index.set_expiry(file_id, expires_at)
     return redirect(f'/format-selection/{vertical}')
 
 @app.route('/format-selection/<vertical>')
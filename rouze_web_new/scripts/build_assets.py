@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Deploy step for static assets: minifies, fingerprints and precompresses
+static/ into static/build/ (see static_assets.py). Pass --rewrite to
+first move inline <style>/<script> blocks out of the templates.
+"""
+import os, sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from static_assets import main
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,213 @@
+"""
+ROUZE SECURE DELETION
+Background, chunked overwrite-and-delete for client files
+
+Jobs name the file's logical path (UPLOAD_FOLDER/<file id>). Uploads
+kept in the blob store are deleted by dropping their reference; the
+blob itself is shredded only once no other file id points at it.
+
+Deletion requests are written to a SQLite job table (so they survive
+restarts) and picked up by a small pool of worker threads. Each file is
+overwritten in SHRED_CHUNK_SIZE pieces from one random buffer per
+worker, fsynced and unlinked. Memory stays fixed however large the file
+is. The audit entry is written when the file is actually gone, not when
+the request was accepted.
+
+Jobs left 'running' by a crashed worker are re-queued once their lease
+(JOB_LEASE_SECONDS) expires.
+"""
+
+import json
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+
+import blob_store
+from audit_log import record as record_audit_entry
+from config_upload_security import (
+    PROFILE_FOLDER,
+    SECURE_DELETE_DB,
+    SECURE_DELETE_MAX_ATTEMPTS,
+    SECURE_DELETE_WORKERS,
+    SHRED_CHUNK_SIZE,
+)
+from sqlite_store import connect, transaction
+from upload_index import mark_deleted
+
+JOB_LEASE_SECONDS = 600
+RETRY_DELAY_SECONDS = 30
+IDLE_POLL_SECONDS = 2.0  # Jobs enqueued by other gunicorn workers are noticed within this
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deletion_jobs (
+    job_id TEXT PRIMARY KEY,
+    filepath TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    audit TEXT NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deletion_jobs_status ON deletion_jobs(status, created_at);
+"""
+
+
+def _db():
+    return connect(SECURE_DELETE_DB, _SCHEMA)
+
+
+def shred_file(filepath, buffer=None):
+    """Overwrite `filepath` with random data chunk by chunk, then delete it"""
+    buffer = buffer or os.urandom(SHRED_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(filepath, 'r+b', buffering=0) as f:
+        remaining = os.fstat(f.fileno()).st_size
+        while remaining:
+            n = f.write(view[:min(remaining, len(view))])
+            remaining -= n
+        os.fsync(f.fileno())
+    os.remove(filepath)
+
+
+def enqueue_deletion(filepath, action='file_deleted', wake=True, **audit_fields):
+    """
+    Queue `filepath` for secure deletion; returns the job id
+
+    wake=False only records the job, without starting this process's
+    worker threads. Use it from one-shot scripts that drain the queue
+    themselves with run_pending(), so no daemon shred is cut off at exit.
+    """
+    job_id = secrets.token_hex(12)
+    now = time.time()
+    audit = {'action': action, 'filename': os.path.basename(filepath), **audit_fields}
+    _db().execute(
+        'INSERT INTO deletion_jobs (job_id, filepath, status, audit, created_at, updated_at) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        (job_id, filepath, 'queued', json.dumps(audit), now, now))
+    if wake:
+        _pool.wake()
+    return job_id
+
+
+def get_job(job_id):
+    row = _db().execute(
+        'SELECT job_id, status, attempts, error, created_at, updated_at FROM deletion_jobs WHERE job_id = ?',
+        (job_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def _claim_job():
+    """Atomically take the oldest queued (or lease-expired) job"""
+    now = time.time()
+    with transaction(_db()) as conn:
+        conn.execute(
+            "UPDATE deletion_jobs SET status = 'queued' WHERE status = 'running' AND updated_at < ?",
+            (now - JOB_LEASE_SECONDS,))
+        row = conn.execute(
+            "SELECT job_id, filepath, attempts, audit FROM deletion_jobs "
+            "WHERE status = 'queued' AND (attempts = 0 OR updated_at < ?) "
+            "ORDER BY created_at LIMIT 1", (now - RETRY_DELAY_SECONDS,)).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE deletion_jobs SET status = 'running', attempts = attempts + 1, updated_at = ? "
+            "WHERE job_id = ?", (now, row['job_id']))
+    return row
+
+
+def _finish_job(job, status, error=None):
+    _db().execute('UPDATE deletion_jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?',
+                  (status, error, time.time(), job['job_id']))
+
+
+def process_job(job, buffer=None):
+    audit = json.loads(job['audit'])
+    filepath = job['filepath']
+    try:
+        tombstone = blob_store.release(audit['filename'])
+        if tombstone:
+            # Last reference: shred the blob. Point the job at the tombstone
+            # first so a retry after a crash still finds it.
+            _db().execute('UPDATE deletion_jobs SET filepath = ? WHERE job_id = ?',
+                          (tombstone, job['job_id']))
+            filepath = tombstone
+
+        if os.path.exists(filepath):
+            file_size = os.path.getsize(filepath)
+            shred_file(filepath, buffer)
+        else:
+            file_size = None  # Shared blob still referenced, or already gone (retried job)
+        # Derived data (the column profile) goes with the file
+        profile = os.path.join(PROFILE_FOLDER, audit['filename'] + '.json')
+        if os.path.exists(profile):
+            shred_file(profile, buffer)
+    except OSError as e:
+        retry = job['attempts'] + 1 < SECURE_DELETE_MAX_ATTEMPTS
+        _finish_job(job, 'queued' if retry else 'failed', str(e))
+        print(f"Secure delete failed for job {job['job_id']}: {e}")
+        return False
+
+    audit.setdefault('file_size', file_size)
+    record_audit_entry({'timestamp': datetime.now().isoformat(), 'job_id': job['job_id'], **audit})
+    mark_deleted(audit['filename'])
+    _finish_job(job, 'done')
+    return True
+
+
+def run_pending(buffer=None):
+    """Drain the queue in the calling thread (cron / one-shot use); returns jobs processed"""
+    buffer = buffer or os.urandom(SHRED_CHUNK_SIZE)
+    processed = 0
+    while True:
+        job = _claim_job()
+        if job is None:
+            return processed
+        process_job(job, buffer)
+        processed += 1
+
+
+class _WorkerPool:
+    """Daemon threads draining the job table; started lazily in each process"""
+
+    def __init__(self, size=SECURE_DELETE_WORKERS):
+        self.size = size
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def wake(self):
+        self._ensure_started()
+        self._wakeup.set()
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._wakeup = threading.Event()
+            for i in range(self.size):
+                threading.Thread(target=self._run, name=f'secure-delete-{i}', daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        buffer = os.urandom(SHRED_CHUNK_SIZE)  # Reused for every file this worker shreds
+        while True:
+            try:
+                if run_pending(buffer):
+                    continue
+            except Exception as e:  # Keep the worker alive through DB hiccups
+                print(f"Secure delete worker error: {e}")
+            self._wakeup.wait(IDLE_POLL_SECONDS)
+            self._wakeup.clear()
+
+
+_pool = _WorkerPool()
+
+
+def start_workers():
+    """Start this process's workers now (e.g. to pick up jobs left from a restart)"""
+    _pool._ensure_started()
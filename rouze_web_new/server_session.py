@@ -0,0 +1,173 @@
+"""
+ROUZE SERVER-SIDE SESSIONS
+Session data stays on the server; the cookie carries only an opaque id
+
+Flask's default session signs and ships the whole session in a cookie.
+The funnel stores entire questionnaires there, so every request carried,
+verified and decoded tens of KB. With ServerSessionInterface the cookie
+is a 43-character random id. The data lives in a store, by default SQLite
+(WAL) with an in-process LRU in front (see sqlite_store.VersionedCache).
+
+Any object with the same load/save/touch/delete methods as
+SQLiteSessionStore can be passed as the store.
+
+Usage:
+    app.session_interface = ServerSessionInterface()   # instance/sessions.db
+"""
+
+import os
+import re
+import secrets
+import time
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from sqlite_store import VersionedCache, connect
+
+CACHE_SIZE = 2048
+CACHE_BYTES = 16 * 1024 * 1024  # Serialized session data per worker; funnel sessions run to 60KB+
+PURGE_EVERY = 500  # Saves between sweeps of expired rows
+
+_SID = re.compile(r'^[A-Za-z0-9_-]{43}$')  # secrets.token_urlsafe(32)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    sid TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions(expires_at);
+"""
+
+
+def _row_size(row):
+    return len(row[0]) if row is not None else 0
+
+
+class SQLiteSessionStore:
+    """Serialized sessions by id, with an LRU of recently used rows"""
+
+    def __init__(self, path, cache_size=CACHE_SIZE, cache_bytes=CACHE_BYTES):
+        self.path = path
+        self._cache = VersionedCache(cache_size, cache_bytes, _row_size)
+        self._saves = 0
+
+    def _db(self):
+        return connect(self.path, _SCHEMA)
+
+    def load(self, sid):
+        """(data, expires_at) for a live session, else None"""
+        conn = self._db()
+        row = self._cache.get(conn, sid, lambda: conn.execute(
+            'SELECT data, expires_at FROM sessions WHERE sid = ?', (sid,)).fetchone())
+        if row is None or row[1] <= time.time():
+            return None
+        return row[0], row[1]
+
+    def save(self, sid, data, expires_at):
+        self._db().execute('INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)', (sid, data, expires_at))
+        self._cache.put(sid, (data, expires_at))
+        self._saves += 1
+        if self._saves % PURGE_EVERY == 0:
+            self.purge_expired()
+
+    def touch(self, sid, expires_at):
+        self._db().execute('UPDATE sessions SET expires_at = ? WHERE sid = ?', (expires_at, sid))
+        self._cache.discard(sid)
+
+    def delete(self, sid):
+        self._db().execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+        self._cache.discard(sid)
+
+    def purge_expired(self, now=None):
+        """Drop expired sessions; returns how many"""
+        cursor = self._db().execute('DELETE FROM sessions WHERE expires_at <= ?',
+                                    (time.time() if now is None else now,))
+        return cursor.rowcount
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.modified = False
+        self.accessed = False
+
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+
+class ServerSessionInterface(SessionInterface):
+    serializer = TaggedJSONSerializer()
+    session_class = ServerSession
+
+    def __init__(self, store=None):
+        self.store = store
+
+    def _store(self, app):
+        if self.store is None:
+            self.store = SQLiteSessionStore(
+                app.config.get('SESSION_DB') or os.path.join(app.instance_path, 'sessions.db'))
+        return self.store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and _SID.match(sid):
+            row = self._store(app).load(sid)
+            if row is not None:
+                try:
+                    return self.session_class(self.serializer.loads(row[0]), sid, row[1])
+                except ValueError:
+                    pass
+        # Unknown or expired ids are never adopted: a new session gets a fresh id
+        return self.session_class()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if session.sid and session.modified:
+                self._store(app).delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app),
+                                       httponly=self.get_cookie_httponly(app))
+            return
+
+        now = time.time()
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        new = session.sid is None
+        if new:
+            session.sid = secrets.token_urlsafe(32)
+        if new or session.modified:
+            self._store(app).save(session.sid, self.serializer.dumps(dict(session)), now + lifetime)
+        elif session.expires_at - now < lifetime / 2:
+            self._store(app).touch(session.sid, now + lifetime)  # Sliding expiry, at most one write per half-lifetime
+
+        if new or self.should_set_cookie(app, session):
+            response.set_cookie(name, session.sid,
+                                expires=self.get_expiration_time(app, session),
+                                httponly=self.get_cookie_httponly(app),
+                                domain=domain, path=path,
+                                secure=self.get_cookie_secure(app),
+                                samesite=self.get_cookie_samesite(app))
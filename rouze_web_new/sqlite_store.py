@@ -0,0 +1,132 @@
+"""
+ROUZE SQLITE STORE
+Per-thread SQLite connections shared by the upload/funnel services
+
+WAL lets gunicorn workers read while one of them writes; busy_timeout
+makes writers wait for each other instead of failing with "database is
+locked". Connections are cached per (thread, path) and reopened after a
+fork, since SQLite handles must not cross process boundaries.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+BUSY_TIMEOUT_MS = 5000
+
+_local = threading.local()
+
+
+def connect(path, schema=None):
+    """Connection to `path` for the calling thread; `schema` runs once per connection"""
+    connections = getattr(_local, 'connections', None)
+    if connections is None or _local.pid != os.getpid():
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+
+    conn = connections.get(path)
+    if conn is None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+        if schema:
+            conn.executescript(schema)
+        connections[path] = conn
+    return conn
+
+
+class transaction:
+    """BEGIN IMMEDIATE ... COMMIT (or ROLLBACK on error) on an autocommit connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+class VersionedCache:
+    """
+    In-process LRU in front of one SQLite database
+
+    Cleared whenever PRAGMA data_version shows a commit from another
+    connection (another thread or gunicorn worker). Writers must update or
+    clear it for their own commits, which do not bump their own data_version.
+
+    A value loaded while a clear() or discard() ran is returned but not
+    cached, since it may predate the write that caused the invalidation.
+
+    With max_bytes, `sizeof(value)` is also kept under that total; a value
+    larger than the whole budget is not cached at all.
+    """
+
+    def __init__(self, size, max_bytes=None, sizeof=None):
+        self.size = size
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size in bytes)
+        self._lock = threading.Lock()
+        self._seen = threading.local()
+        self._generation = 0  # Bumped by every invalidation
+
+    def _check_version(self, conn):
+        version = conn.execute('PRAGMA data_version').fetchone()[0]
+        if getattr(self._seen, 'version', None) != version:
+            self._seen.version = version
+            self.clear()
+
+    def get(self, conn, key, load):
+        self._check_version(conn)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            generation = self._generation
+        value = load()
+        with self._lock:
+            if self._generation == generation:
+                self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        self._remove(key)
+        nbytes = self._sizeof(value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        self._entries[key] = (value, nbytes)
+        self._bytes += nbytes
+        while len(self._entries) > self.size or (
+                self.max_bytes is not None and self._bytes > self.max_bytes):
+            self._bytes -= self._entries.popitem(last=False)[1][1]
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._generation += 1  # A load racing this write must not overwrite it
+            self._store(key, value)
+
+    def discard(self, key):
+        with self._lock:
+            self._generation += 1
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
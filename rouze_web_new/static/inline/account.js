@@ -0,0 +1,64 @@
+// Tab navigation
+document.querySelectorAll('.sidebar-nav a').forEach(link => {
+    link.addEventListener('click', function(e) {
+        e.preventDefault();
+        const tabId = this.dataset.tab;
+
+        // Update sidebar active state
+        document.querySelectorAll('.sidebar-nav a').forEach(l => l.classList.remove('active'));
+        this.classList.add('active');
+
+        // Show corresponding content
+        document.querySelectorAll('.tab-content').forEach(content => content.classList.remove('active'));
+        document.getElementById(tabId).classList.add('active');
+    });
+});
+
+// Project filter tabs
+document.querySelectorAll('.content-tabs .tab-button').forEach(btn => {
+    btn.addEventListener('click', function() {
+        document.querySelectorAll('.content-tabs .tab-button').forEach(b => b.classList.remove('active'));
+        this.classList.add('active');
+
+        const filter = this.dataset.filter;
+        document.querySelectorAll('.project-card').forEach(card => {
+            if (filter === 'all' || card.dataset.status === filter) {
+                card.style.display = 'block';
+            } else {
+                card.style.display = 'none';
+            }
+        });
+    });
+});
+
+// Download function
+function downloadReport(projectId, format) {
+    alert(`Downloading ${format.toUpperCase()} report for ${projectId}...\n\nIn production, this would download the actual file.`);
+}
+
+// Save profile
+function saveProfile() {
+    alert('Profile saved successfully!');
+}
+
+// Load user data from session storage
+const orderData = JSON.parse(sessionStorage.getItem('orderData') || '{}');
+if (orderData.customer) {
+    const firstName = orderData.customer.firstName || 'John';
+    const lastName = orderData.customer.lastName || 'Smith';
+    const email = orderData.customer.email || 'john.smith@company.com';
+    const initials = firstName[0] + lastName[0];
+
+    document.getElementById('navAvatar').textContent = initials;
+    document.getElementById('navName').textContent = `${firstName} ${lastName}`;
+    document.getElementById('profileAvatar').textContent = initials;
+    document.getElementById('profileName').textContent = `${firstName} ${lastName}`;
+    document.getElementById('profileEmail').textContent = email;
+    document.getElementById('firstName').value = firstName;
+    document.getElementById('lastName').value = lastName;
+    document.getElementById('email').value = email;
+
+    if (orderData.customer.company) {
+        document.getElementById('company').value = orderData.customer.company;
+    }
+}
@@ -0,0 +1,225 @@
+// Get URL parameters
+const urlParams = new URLSearchParams(window.location.search);
+const projectId = urlParams.get('project_id') || 'SAAS-1733680000000';
+
+// Display project ID
+document.getElementById('projectId').textContent = projectId;
+document.getElementById('logProjectId').textContent = projectId;
+
+// Get order data from session storage
+const orderData = JSON.parse(sessionStorage.getItem('orderData') || '{}');
+
+// Populate project details from order data
+if (orderData.tierName) {
+    document.getElementById('detailTier').textContent = orderData.tierName;
+}
+if (orderData.total) {
+    document.getElementById('detailPrice').textContent = '$' + orderData.total.toLocaleString();
+}
+
+// Get vertical from project ID prefix
+const verticalMap = {
+    'HEALTH': 'Healthcare / Medical Devices',
+    'SAAS': 'SaaS / B2B Software',
+    'ECOM': 'E-commerce / DTC',
+    'FINTECH': 'FinTech / Financial Services',
+    'REALE': 'Real Estate / PropTech'
+};
+const prefix = projectId.split('-')[0];
+if (verticalMap[prefix]) {
+    document.getElementById('detailVertical').textContent = verticalMap[prefix];
+}
+
+// Update dashboard link with project ID
+document.getElementById('viewDashboardBtn').href = `dashboard.html?project_id=${projectId}`;
+
+// Toggle notification
+function toggleNotification() {
+    const toggle = document.getElementById('notificationToggle');
+    toggle.classList.toggle('active');
+}
+
+// Simulate progress updates (for demo)
+let progress = 45;
+let signalsProcessed = 18234;
+const totalSignals = 27842;
+
+function updateProgress() {
+    if (progress < 100) {
+        progress += Math.random() * 2;
+        signalsProcessed = Math.min(totalSignals, signalsProcessed + Math.floor(Math.random() * 500));
+
+        if (progress > 100) progress = 100;
+
+        document.getElementById('progressFill').style.width = progress + '%';
+        document.getElementById('progressPercent').textContent = Math.floor(progress) + '% complete';
+
+        // Update stage 2 details
+        const stage2Details = document.querySelector('#stage2 .stage-details');
+        if (stage2Details) {
+            const rows = stage2Details.querySelectorAll('.stage-detail-value');
+            if (rows[0]) rows[0].textContent = signalsProcessed.toLocaleString() + ' / ' + totalSignals.toLocaleString();
+            if (rows[1]) rows[1].textContent = Math.floor((signalsProcessed / totalSignals) * 100) + '%';
+        }
+
+        // Check for stage transitions
+        if (progress >= 60 && progress < 85) {
+            document.getElementById('progressStage').textContent = 'Stage 3 of 4';
+            document.getElementById('statusTitle').textContent = 'Insight Generation';
+            document.getElementById('statusDescription').textContent = 'Identifying key findings and recommendations';
+
+            // Update stages
+            document.getElementById('stage2').className = 'stage-item complete';
+            document.getElementById('stage2').querySelector('.stage-status').textContent = 'Complete';
+            document.getElementById('stage2').querySelector('.stage-status').className = 'stage-status complete';
+            document.getElementById('stage2').querySelector('.stage-icon').innerHTML = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"/></svg>';
+
+            document.getElementById('stage3').className = 'stage-item active';
+            document.getElementById('stage3').querySelector('.stage-status').textContent = 'In Progress';
+            document.getElementById('stage3').querySelector('.stage-status').className = 'stage-status active';
+        }
+
+        if (progress >= 85) {
+            document.getElementById('progressStage').textContent = 'Stage 4 of 4';
+            document.getElementById('statusTitle').textContent = 'Report Compilation';
+            document.getElementById('statusDescription').textContent = 'Generating final deliverables';
+
+            // Update stages
+            document.getElementById('stage3').className = 'stage-item complete';
+            document.getElementById('stage3').querySelector('.stage-status').textContent = 'Complete';
+            document.getElementById('stage3').querySelector('.stage-status').className = 'stage-status complete';
+            document.getElementById('stage3').querySelector('.stage-icon').innerHTML = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"/></svg>';
+
+            document.getElementById('stage4').className = 'stage-item active';
+            document.getElementById('stage4').querySelector('.stage-status').textContent = 'In Progress';
+            document.getElementById('stage4').querySelector('.stage-status').className = 'stage-status active';
+        }
+
+        if (progress >= 100) {
+            showComplete();
+            return;
+        }
+
+        setTimeout(updateProgress, 3000 + Math.random() * 2000);
+    }
+}
+
+function showComplete() {
+    // Update status
+    document.getElementById('pageTitle').textContent = 'Analysis Complete';
+    document.getElementById('pageSubtitle').textContent = 'Your Strategic Intelligence report is ready to view. Explore insights, signals, and strategic recommendations.';
+
+    document.getElementById('statusIcon').className = 'status-icon complete';
+    document.getElementById('statusIcon').innerHTML = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"/></svg>';
+    document.getElementById('statusTitle').textContent = 'Analysis Complete';
+    document.getElementById('statusDescription').textContent = 'All stages completed successfully';
+    document.getElementById('etaValue').textContent = 'Ready Now';
+    document.getElementById('etaValue').className = 'eta-value complete';
+
+    document.getElementById('progressFill').className = 'progress-fill complete';
+    document.getElementById('progressFill').style.width = '100%';
+    document.getElementById('progressPercent').textContent = '100% complete';
+    document.getElementById('progressStage').textContent = 'All stages complete';
+
+    // Update all stages to complete
+    document.getElementById('stage4').className = 'stage-item complete';
+    document.getElementById('stage4').querySelector('.stage-status').textContent = 'Complete';
+    document.getElementById('stage4').querySelector('.stage-status').className = 'stage-status complete';
+    document.getElementById('stage4').querySelector('.stage-icon').innerHTML = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><polyline points="20 6 9 17 4 12"/></svg>';
+
+    // Show celebration, hide CTA section
+    document.getElementById('ctaSection').style.display = 'none';
+    document.getElementById('completeCelebration').style.display = 'block';
+
+    // Add completion activity
+    const activityLog = document.getElementById('activityLog');
+    const newActivity = document.createElement('div');
+    newActivity.className = 'activity-item success';
+    newActivity.innerHTML = `
+        <span class="activity-time">Just now</span>
+        <span class="activity-dot"></span>
+        <span class="activity-message"><strong>Analysis complete!</strong> All deliverables ready for download</span>
+    `;
+    activityLog.insertBefore(newActivity, activityLog.firstChild);
+}
+
+// Live progress of the analysis job, pushed over Server-Sent Events
+const stateElement = document.getElementById('project-state');
+const projectState = stateElement ? JSON.parse(stateElement.textContent) : {};
+const jobId = urlParams.get('job_id') || (projectState.job && projectState.job.job_id);
+
+function showJobProgress(job) {
+    progress = job.progress;
+    document.getElementById('progressFill').style.width = job.progress + '%';
+    document.getElementById('progressPercent').textContent = Math.floor(job.progress) + '% complete';
+    if (job.stage) document.getElementById('statusTitle').textContent = job.stage;
+    if (job.message) document.getElementById('statusDescription').textContent = job.message;
+}
+
+function followJob(jobId) {
+    const events = new EventSource(`/analysis/jobs/${encodeURIComponent(jobId)}/events`);
+    events.addEventListener('progress', (event) => showJobProgress(JSON.parse(event.data)));
+    events.addEventListener('end', (event) => {
+        events.close();
+        const job = JSON.parse(event.data);
+        if (job.status === 'done') {
+            progress = 100;
+            showComplete();
+        } else {
+            document.getElementById('statusTitle').textContent = job.status === 'cancelled' ? 'Analysis Cancelled' : 'Analysis Failed';
+            document.getElementById('statusDescription').textContent = job.error || 'Contact support to restart this analysis';
+        }
+    });
+}
+
+// Check URL for complete state
+if (urlParams.get('status') === 'complete') {
+    progress = 100;
+    showComplete();
+} else if (jobId) {
+    followJob(jobId);
+} else {
+    // Start progress simulation for demo
+    setTimeout(updateProgress, 5000);
+}
+
+// Simulate activity log updates
+const activities = [
+    'Analyzing feature request patterns...',
+    'Cross-referencing competitor mentions...',
+    'Processing TrustPilot reviews...',
+    'Calculating sentiment trends...',
+    'Identifying emerging topics...',
+    'Building competitive positioning matrix...',
+    'Generating insight recommendations...'
+];
+
+let activityIndex = 0;
+function addActivity() {
+    if (progress < 100) {
+        const activityLog = document.getElementById('activityLog');
+        const newActivity = document.createElement('div');
+        newActivity.className = 'activity-item processing';
+        newActivity.innerHTML = `
+            <span class="activity-time">Just now</span>
+            <span class="activity-dot"></span>
+            <span class="activity-message">${activities[activityIndex % activities.length]}</span>
+        `;
+        activityLog.insertBefore(newActivity, activityLog.firstChild);
+
+        // Update previous "Just now" to time
+        const items = activityLog.querySelectorAll('.activity-item');
+        if (items.length > 1) {
+            items[1].querySelector('.activity-time').textContent = '1 min ago';
+            items[1].classList.remove('processing');
+            items[1].classList.add('success');
+        }
+
+        activityIndex++;
+        setTimeout(addActivity, 8000 + Math.random() * 7000);
+    }
+}
+
+if (!jobId) {
+    setTimeout(addActivity, 10000);
+}
@@ -0,0 +1,165 @@
+// Get URL parameters
+const urlParams = new URLSearchParams(window.location.search);
+const projectId = urlParams.get('project_id') || 'UNKNOWN';
+
+// Display project ID
+document.getElementById('projectIdDisplay').textContent = projectId;
+document.getElementById('modalProjectId').textContent = projectId;
+
+// Get checkout data from session storage
+const checkoutData = JSON.parse(sessionStorage.getItem('checkoutData') || '{}');
+
+// Tier timelines
+const tierTimelines = {
+    1: '24-48 hours',
+    2: '5-7 days',
+    3: '10-14 days'
+};
+
+// Populate order summary
+function populateSummary() {
+    if (checkoutData.tierName) {
+        document.getElementById('summaryTierName').textContent = checkoutData.tierName;
+        document.getElementById('summaryTierTimeline').textContent = 'Delivery in ' + (tierTimelines[checkoutData.tier] || '5-7 days');
+        document.getElementById('summaryTierPrice').textContent = '$' + (checkoutData.tierPrice || 1500).toLocaleString();
+    }
+
+    // Addons
+    const addonsContainer = document.getElementById('summaryAddons');
+    if (checkoutData.addons && checkoutData.addons.length > 0) {
+        let addonsHtml = '';
+        checkoutData.addons.forEach(addon => {
+            addonsHtml += `
+                <div class="summary-addon-item">
+                    <span>${addon.name}</span>
+                    <span>+$${addon.price}</span>
+                </div>
+            `;
+        });
+        addonsContainer.innerHTML = addonsHtml;
+    } else {
+        addonsContainer.style.display = 'none';
+    }
+
+    // Total
+    const total = checkoutData.total || 1500;
+    document.getElementById('summaryTotal').textContent = '$' + total.toLocaleString();
+    document.getElementById('buttonPrice').textContent = '$' + total.toLocaleString();
+}
+
+populateSummary();
+
+// Card number formatting
+document.getElementById('cardNumber').addEventListener('input', function(e) {
+    let value = e.target.value.replace(/\s/g, '').replace(/\D/g, '');
+    let formatted = value.match(/.{1,4}/g)?.join(' ') || value;
+    e.target.value = formatted;
+});
+
+// Expiry date formatting
+document.getElementById('cardExpiry').addEventListener('input', function(e) {
+    let value = e.target.value.replace(/\D/g, '');
+    if (value.length >= 2) {
+        value = value.substring(0, 2) + '/' + value.substring(2, 4);
+    }
+    e.target.value = value;
+});
+
+// CVC - numbers only
+document.getElementById('cardCvc').addEventListener('input', function(e) {
+    e.target.value = e.target.value.replace(/\D/g, '');
+});
+
+// Form validation
+function validateForm() {
+    let isValid = true;
+
+    // Reset errors
+    document.querySelectorAll('.form-error').forEach(el => el.classList.remove('visible'));
+    document.querySelectorAll('.form-input').forEach(el => el.classList.remove('error'));
+
+    // Required fields
+    const requiredFields = ['firstName', 'lastName', 'email', 'cardName', 'cardNumber', 'cardExpiry', 'cardCvc', 'cardZip'];
+
+    requiredFields.forEach(field => {
+        const input = document.getElementById(field);
+        if (!input.value.trim()) {
+            input.classList.add('error');
+            document.getElementById(field + 'Error').classList.add('visible');
+            isValid = false;
+        }
+    });
+
+    // Email validation
+    const email = document.getElementById('email');
+    if (email.value && !email.value.match(/^[^\s@]+@[^\s@]+\.[^\s@]+$/)) {
+        email.classList.add('error');
+        document.getElementById('emailError').classList.add('visible');
+        isValid = false;
+    }
+
+    // Card number validation (basic)
+    const cardNumber = document.getElementById('cardNumber');
+    if (cardNumber.value.replace(/\s/g, '').length < 15) {
+        cardNumber.classList.add('error');
+        document.getElementById('cardNumberError').classList.add('visible');
+        isValid = false;
+    }
+
+    // Terms acceptance
+    const terms = document.getElementById('termsAccept');
+    if (!terms.checked) {
+        document.getElementById('termsError').classList.add('visible');
+        isValid = false;
+    }
+
+    return isValid;
+}
+
+// Form submission
+document.getElementById('checkoutForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    if (!validateForm()) {
+        return;
+    }
+
+    const submitButton = document.getElementById('submitButton');
+    submitButton.disabled = true;
+    submitButton.classList.add('loading');
+
+    // Simulate payment processing
+    await new Promise(resolve => setTimeout(resolve, 2000));
+
+    // Store order data
+    const orderData = {
+        projectId: projectId,
+        customer: {
+            firstName: document.getElementById('firstName').value,
+            lastName: document.getElementById('lastName').value,
+            email: document.getElementById('email').value,
+            company: document.getElementById('company').value,
+            phone: document.getElementById('phone').value
+        },
+        tier: checkoutData.tier,
+        tierName: checkoutData.tierName,
+        addons: checkoutData.addons,
+        total: checkoutData.total,
+        paidAt: new Date().toISOString()
+    };
+
+    sessionStorage.setItem('orderData', JSON.stringify(orderData));
+
+    // Show success modal
+    document.getElementById('successModal').classList.add('active');
+
+    // Update dashboard link
+    document.getElementById('viewDashboardBtn').href = '/dashboard?project_id=' + projectId;
+});
+
+// Close modal on background click
+document.getElementById('successModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        // Don't close - force user to click button
+    }
+});
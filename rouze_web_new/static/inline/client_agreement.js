@@ -0,0 +1,51 @@
+let isAgreed = false;
+
+function toggleAgreement(element) {
+    element.classList.toggle('checked');
+    isAgreed = element.classList.contains('checked');
+
+    const btn = document.getElementById('continueBtn');
+    if (isAgreed) {
+        btn.classList.add('enabled');
+    } else {
+        btn.classList.remove('enabled');
+    }
+}
+
+function toggleFullTerms(element) {
+    element.classList.toggle('expanded');
+    document.getElementById('fullTerms').classList.toggle('visible');
+}
+
+function continueToCheckout() {
+    if (!isAgreed) return;
+
+    // Store agreement acceptance with legal acknowledgments
+    const agreementData = {
+        accepted: true,
+        date: new Date().toISOString(),
+        ip: 'captured-server-side',
+        acknowledgments: [
+            'Services are informational market intelligence only',
+            'Not legal, financial, investment, or professional advice',
+            'No guarantees of accuracy or business outcomes',
+            'Client accepts responsibility for all business decisions',
+            'Liability limited to fees paid for services',
+            'Disputes resolved by binding arbitration',
+            'Class action rights waived',
+            'Agreed to Terms of Service',
+            'Agreed to Privacy Policy'
+        ]
+    };
+
+    sessionStorage.setItem('agreementAccepted', 'true');
+    sessionStorage.setItem('agreementData', JSON.stringify(agreementData));
+
+    // Get URL params and redirect
+    const urlParams = new URLSearchParams(window.location.search);
+    const projectId = urlParams.get('project_id') || '';
+    const tier = urlParams.get('tier') || '';
+    const total = urlParams.get('total') || '';
+
+    window.location.href = `checkout.html?project_id=${projectId}&tier=${tier}&total=${total}`;
+}
@@ -0,0 +1,203 @@
+// Get URL parameters
+const urlParams = new URLSearchParams(window.location.search);
+const projectId = urlParams.get('project_id') || 'SAAS-1733680000000';
+document.getElementById('navProjectId').textContent = projectId;
+
+// Sample signals data
+const signalsData = [
+    { platform: 'G2', platformCode: 'G2', text: 'The pricing model is completely unpredictable. We started at $500/mo and somehow ended up at $2,400 with the same team size. No transparency on what triggers overages.', sentiment: 'negative', topic: 'Pricing', date: '2 days ago', engagement: '47 helpful' },
+    { platform: 'Reddit', platformCode: 'RDT', text: 'Finally switched to [Competitor X] and the Slack integration alone is worth it. Everything just works together instead of copy-pasting between 5 different tools.', sentiment: 'positive', topic: 'Integrations', date: '3 days ago', engagement: '234 upvotes' },
+    { platform: 'Twitter', platformCode: 'TW', text: 'Evaluating options for our 50-person team. The enterprise plans all seem designed for 500+ companies. Why is there nothing in between?', sentiment: 'neutral', topic: 'Pricing', date: '4 days ago', engagement: '89 likes' },
+    { platform: 'TrustPilot', platformCode: 'TP', text: 'Support response time has degraded significantly over the past quarter. Used to get same-day responses, now waiting 3-4 business days for basic questions.', sentiment: 'negative', topic: 'Support', date: '5 days ago', engagement: '12 helpful' },
+    { platform: 'LinkedIn', platformCode: 'LI', text: 'The new AI features in the latest release are genuinely useful. Auto-categorization saved our ops team ~10 hours/week. Finally feels like the future.', sentiment: 'positive', topic: 'Features', date: '1 week ago', engagement: '156 reactions' },
+    { platform: 'G2', platformCode: 'G2', text: 'Onboarding was incredibly smooth. Had our whole team up and running in less than a day. The in-app guides are really well designed.', sentiment: 'positive', topic: 'UX', date: '1 week ago', engagement: '31 helpful' },
+    { platform: 'Reddit', platformCode: 'RDT', text: 'Anyone else find the mobile app basically unusable? It crashes constantly and the UI is completely different from desktop. Feels like an afterthought.', sentiment: 'negative', topic: 'Features', date: '1 week ago', engagement: '189 upvotes' },
+    { platform: 'Twitter', platformCode: 'TW', text: 'Hot take: the best feature is the API. Our dev team built custom integrations in days, not weeks. Documentation is top-notch.', sentiment: 'positive', topic: 'Integrations', date: '1 week ago', engagement: '67 likes' },
+    { platform: 'G2', platformCode: 'G2', text: 'Been using this for 2 years. The product itself is solid but the constant upselling and feature-gating is exhausting. Every update seems to lock something new behind higher tiers.', sentiment: 'negative', topic: 'Pricing', date: '2 weeks ago', engagement: '58 helpful' },
+    { platform: 'LinkedIn', platformCode: 'LI', text: 'Just completed SOC2 compliance audit with zero issues thanks to their built-in compliance features. Security team is very impressed.', sentiment: 'positive', topic: 'Features', date: '2 weeks ago', engagement: '98 reactions' },
+    { platform: 'Reddit', platformCode: 'RDT', text: 'The Notion integration they announced is vaporware. "Coming soon" for 8 months now. Meanwhile competitors shipped it in Q1.', sentiment: 'negative', topic: 'Integrations', date: '2 weeks ago', engagement: '312 upvotes' },
+    { platform: 'TrustPilot', platformCode: 'TP', text: 'Solid product, nothing exceptional. Does what it says on the tin. Wish there were more customization options for reports.', sentiment: 'neutral', topic: 'Features', date: '2 weeks ago', engagement: '8 helpful' },
+    { platform: 'Twitter', platformCode: 'TW', text: 'Switched from [Competitor A] to this last month. The learning curve is real but the power user features are worth it for our use case.', sentiment: 'positive', topic: 'UX', date: '3 weeks ago', engagement: '45 likes' },
+    { platform: 'G2', platformCode: 'G2', text: 'Their async support is the best in the industry. Got a detailed, helpful response within 2 hours. No chatbot runaround.', sentiment: 'positive', topic: 'Support', date: '3 weeks ago', engagement: '42 helpful' },
+    { platform: 'LinkedIn', platformCode: 'LI', text: 'Comparing options for our healthcare startup. Need HIPAA compliance but most options are either too expensive or too basic. Any recommendations?', sentiment: 'neutral', topic: 'Features', date: '3 weeks ago', engagement: '34 reactions' },
+    { platform: 'Reddit', platformCode: 'RDT', text: 'The custom reporting feature is incredibly powerful once you learn it. Took me a weekend but now I can build any dashboard I need.', sentiment: 'positive', topic: 'Features', date: '3 weeks ago', engagement: '156 upvotes' },
+    { platform: 'Twitter', platformCode: 'TW', text: 'Why do all these tools assume everyone works 9-5 in the same timezone? Need better async-first features for distributed teams.', sentiment: 'neutral', topic: 'Features', date: '4 weeks ago', engagement: '234 likes' },
+    { platform: 'G2', platformCode: 'G2', text: 'Performance has gotten noticeably worse over the past 6 months. Pages that used to load instantly now take 3-4 seconds. What changed?', sentiment: 'negative', topic: 'UX', date: '4 weeks ago', engagement: '67 helpful' },
+    { platform: 'TrustPilot', platformCode: 'TP', text: 'Good product but the community is what makes it special. The user forum and template library saved me countless hours.', sentiment: 'positive', topic: 'Support', date: '4 weeks ago', engagement: '19 helpful' },
+    { platform: 'LinkedIn', platformCode: 'LI', text: 'Our finance team loves the new export options. Finally can get data into the formats our accountants actually use without manual conversion.', sentiment: 'positive', topic: 'Features', date: '1 month ago', engagement: '87 reactions' },
+];
+
+// Populate signals table
+function populateSignals(data) {
+    const tbody = document.getElementById('signalsTableBody');
+    tbody.innerHTML = data.map(signal => `
+        <tr data-sentiment="${signal.sentiment}">
+            <td><span class="signal-platform-badge">${signal.platformCode}</span></td>
+            <td class="signal-text-cell">${signal.text}</td>
+            <td><span class="signal-sentiment-badge ${signal.sentiment}">${signal.sentiment.charAt(0).toUpperCase() + signal.sentiment.slice(1)}</span></td>
+            <td>${signal.topic}</td>
+            <td>${signal.date}</td>
+            <td class="signal-engagement">${signal.engagement}</td>
+        </tr>
+    `).join('');
+}
+
+populateSignals(signalsData);
+
+// Filter signals
+document.querySelectorAll('.signals-filters .filter-button').forEach(btn => {
+    btn.addEventListener('click', function() {
+        document.querySelectorAll('.signals-filters .filter-button').forEach(b => b.classList.remove('active'));
+        this.classList.add('active');
+        const filter = this.dataset.filter;
+        const filtered = filter === 'all' ? signalsData : signalsData.filter(s => s.sentiment === filter);
+        populateSignals(filtered);
+    });
+});
+
+// Sidebar navigation
+document.querySelectorAll('.sidebar-nav a[href^="#"]').forEach(link => {
+    link.addEventListener('click', function() {
+        document.querySelectorAll('.sidebar-nav a').forEach(l => l.classList.remove('active'));
+        this.classList.add('active');
+    });
+});
+
+// Methodology accordion
+function toggleMethodology(header) {
+    const item = header.parentElement;
+    item.classList.toggle('open');
+}
+
+// Export function
+function exportReport(format) {
+    alert(`Downloading ${format.toUpperCase()} report...\n\nIn production, this would download the actual ${format} file.`);
+}
+
+// Charts
+Chart.defaults.color = 'rgba(176, 166, 223, 0.7)';
+Chart.defaults.borderColor = 'rgba(176, 166, 223, 0.1)';
+
+// Sentiment Chart
+new Chart(document.getElementById('sentimentChart'), {
+    type: 'doughnut',
+    data: {
+        labels: ['Positive (34%)', 'Neutral (41%)', 'Negative (25%)'],
+        datasets: [{
+            data: [34, 41, 25],
+            backgroundColor: ['rgba(76, 175, 80, 0.8)', 'rgba(176, 166, 223, 0.4)', 'rgba(244, 67, 54, 0.8)'],
+            borderWidth: 0
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: { legend: { position: 'bottom', labels: { padding: 20, usePointStyle: true } } }
+    }
+});
+
+// Volume Chart
+new Chart(document.getElementById('volumeChart'), {
+    type: 'line',
+    data: {
+        labels: ['Week 1', 'Week 2', 'Week 3', 'Week 4', 'Week 5', 'Week 6', 'Week 7', 'Week 8', 'Week 9', 'Week 10', 'Week 11', 'Week 12'],
+        datasets: [{
+            label: 'Signals',
+            data: [1842, 2103, 2456, 2234, 2567, 2890, 2345, 2678, 2234, 2456, 2123, 2914],
+            borderColor: '#3A8FC3',
+            backgroundColor: 'rgba(58, 143, 195, 0.1)',
+            fill: true,
+            tension: 0.4
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: { legend: { display: false } },
+        scales: {
+            y: { beginAtZero: true, grid: { color: 'rgba(176, 166, 223, 0.08)' } },
+            x: { grid: { display: false } }
+        }
+    }
+});
+
+// Platform Chart
+new Chart(document.getElementById('platformChart'), {
+    type: 'bar',
+    data: {
+        labels: ['G2', 'Reddit', 'Twitter', 'LinkedIn', 'TrustPilot', 'YouTube', 'Discord', 'HN', 'ProductHunt', 'Forums', 'Other'],
+        datasets: [{
+            data: [6842, 5923, 4821, 4102, 3254, 1456, 987, 654, 432, 234, 137],
+            backgroundColor: 'rgba(58, 143, 195, 0.7)',
+            borderRadius: 4
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        indexAxis: 'y',
+        plugins: { legend: { display: false } },
+        scales: {
+            x: { beginAtZero: true, grid: { color: 'rgba(176, 166, 223, 0.08)' } },
+            y: { grid: { display: false } }
+        }
+    }
+});
+
+// Topic Chart
+new Chart(document.getElementById('topicChart'), {
+    type: 'polarArea',
+    data: {
+        labels: ['Pricing', 'Features', 'Integrations', 'Support', 'UX/UI', 'Performance'],
+        datasets: [{
+            data: [42, 28, 24, 18, 15, 12],
+            backgroundColor: ['rgba(244, 67, 54, 0.7)', 'rgba(58, 143, 195, 0.7)', 'rgba(76, 175, 80, 0.7)', 'rgba(255, 152, 0, 0.7)', 'rgba(156, 39, 176, 0.7)', 'rgba(176, 166, 223, 0.5)'],
+            borderWidth: 0
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: { legend: { position: 'bottom', labels: { padding: 16, usePointStyle: true } } }
+    }
+});
+
+// Competitor Share of Voice Chart
+new Chart(document.getElementById('competitorChart'), {
+    type: 'line',
+    data: {
+        labels: ['Sep', 'Oct', 'Nov', 'Dec'],
+        datasets: [
+            { label: 'Your Product', data: [22, 23, 24, 24], borderColor: '#3A8FC3', backgroundColor: 'transparent', tension: 0.4 },
+            { label: 'Competitor A', data: [34, 33, 32, 31], borderColor: '#f44336', backgroundColor: 'transparent', tension: 0.4 },
+            { label: 'Competitor X', data: [8, 10, 13, 15], borderColor: '#4CAF50', backgroundColor: 'transparent', tension: 0.4 }
+        ]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: { legend: { position: 'bottom', labels: { padding: 12, usePointStyle: true } } },
+        scales: {
+            y: { beginAtZero: true, max: 40, grid: { color: 'rgba(176, 166, 223, 0.08)' } },
+            x: { grid: { display: false } }
+        }
+    }
+});
+
+// Feature Request Chart
+new Chart(document.getElementById('featureChart'), {
+    type: 'doughnut',
+    data: {
+        labels: ['Integrations (38%)', 'AI/Automation (22%)', 'Reporting (18%)', 'Mobile (12%)', 'API (10%)'],
+        datasets: [{
+            data: [38, 22, 18, 12, 10],
+            backgroundColor: ['#3A8FC3', '#4CAF50', '#ff9800', '#9c27b0', 'rgba(176, 166, 223, 0.5)'],
+            borderWidth: 0
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: { legend: { position: 'bottom', labels: { padding: 16, usePointStyle: true } } }
+    }
+});
@@ -0,0 +1,135 @@
+// Get project ID from URL
+const urlParams = new URLSearchParams(window.location.search);
+const projectId = urlParams.get('project_id') || 'UNKNOWN';
+document.getElementById('projectIdDisplay').textContent = projectId;
+
+// File storage
+let uploadedFiles = [];
+
+// Upload zone functionality
+const uploadZone = document.getElementById('uploadZone');
+const fileInput = document.getElementById('fileInput');
+const uploadedFilesSection = document.getElementById('uploadedFiles');
+const fileList = document.getElementById('fileList');
+
+// Click to browse
+uploadZone.addEventListener('click', () => {
+    fileInput.click();
+});
+
+// File input change
+fileInput.addEventListener('change', (e) => {
+    handleFiles(e.target.files);
+});
+
+// Drag and drop
+uploadZone.addEventListener('dragover', (e) => {
+    e.preventDefault();
+    uploadZone.classList.add('drag-over');
+});
+
+uploadZone.addEventListener('dragleave', () => {
+    uploadZone.classList.remove('drag-over');
+});
+
+uploadZone.addEventListener('drop', (e) => {
+    e.preventDefault();
+    uploadZone.classList.remove('drag-over');
+    handleFiles(e.dataTransfer.files);
+});
+
+// Handle files
+function handleFiles(files) {
+    const maxSize = 50 * 1024 * 1024; // 50MB
+    const allowedTypes = ['.csv', '.xlsx', '.xls', '.pdf', '.doc', '.docx', '.txt', '.json'];
+
+    for (let file of files) {
+        // Check size
+        if (file.size > maxSize) {
+            alert(`File "${file.name}" exceeds 50MB limit.`);
+            continue;
+        }
+
+        // Check type
+        const ext = '.' + file.name.split('.').pop().toLowerCase();
+        if (!allowedTypes.includes(ext)) {
+            alert(`File type "${ext}" is not supported.`);
+            continue;
+        }
+
+        // Add to list
+        uploadedFiles.push({
+            name: file.name,
+            size: file.size,
+            file: file
+        });
+    }
+
+    updateFileList();
+}
+
+// Update file list display
+function updateFileList() {
+    if (uploadedFiles.length > 0) {
+        uploadedFilesSection.style.display = 'block';
+        uploadZone.classList.add('has-files');
+
+        fileList.innerHTML = uploadedFiles.map((file, index) => `
+            <div class="file-item">
+                <div class="file-info">
+                    <div class="file-icon">
+                        <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                            <path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"/>
+                            <polyline points="14 2 14 8 20 8"/>
+                        </svg>
+                    </div>
+                    <div class="file-details">
+                        <span class="file-name">${file.name}</span>
+                        <span class="file-size">${formatFileSize(file.size)}</span>
+                    </div>
+                </div>
+                <button class="remove-file" onclick="removeFile(${index})">
+                    <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                        <line x1="18" y1="6" x2="6" y2="18"/>
+                        <line x1="6" y1="6" x2="18" y2="18"/>
+                    </svg>
+                </button>
+            </div>
+        `).join('');
+    } else {
+        uploadedFilesSection.style.display = 'none';
+        uploadZone.classList.remove('has-files');
+    }
+}
+
+// Format file size
+function formatFileSize(bytes) {
+    if (bytes === 0) return '0 Bytes';
+    const k = 1024;
+    const sizes = ['Bytes', 'KB', 'MB', 'GB'];
+    const i = Math.floor(Math.log(bytes) / Math.log(k));
+    return parseFloat((bytes / Math.pow(k, i)).toFixed(2)) + ' ' + sizes[i];
+}
+
+// Remove file
+function removeFile(index) {
+    uploadedFiles.splice(index, 1);
+    updateFileList();
+}
+
+// Continue button
+document.getElementById('continueButton').addEventListener('click', () => {
+    // Store file info in session storage (actual upload would happen server-side)
+    const fileInfo = uploadedFiles.map(f => ({ name: f.name, size: f.size }));
+    sessionStorage.setItem('uploadedFiles', JSON.stringify(fileInfo));
+
+    // Navigate to format selection
+    window.location.href = '/format-selection?project_id=' + projectId;
+});
+
+// Skip link
+document.getElementById('skipLink').addEventListener('click', (e) => {
+    e.preventDefault();
+    sessionStorage.setItem('uploadedFiles', JSON.stringify([]));
+    window.location.href = '/format-selection?project_id=' + projectId;
+});
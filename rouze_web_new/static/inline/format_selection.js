@@ -0,0 +1,179 @@
+// Get project ID from URL
+const urlParams = new URLSearchParams(window.location.search);
+const projectId = urlParams.get('project_id') || 'UNKNOWN';
+document.getElementById('projectIdDisplay').textContent = projectId;
+
+// Tier data
+const tierData = {
+    1: { 
+        name: 'Quick Intelligence', 
+        price: 750, 
+        timeline: '24-48 hours',
+        pdfPages: '10 pages',
+        dashboardDays: '90 days',
+        pptxSlides: null,
+        htmlReport: false
+    },
+    2: { 
+        name: 'Strategic Intelligence', 
+        price: 1500, 
+        timeline: '5-7 days',
+        pdfPages: '20 pages',
+        dashboardDays: '90 days',
+        pptxSlides: '15+ slides',
+        htmlReport: true
+    },
+    3: { 
+        name: 'Predictive Intelligence', 
+        price: 3500, 
+        timeline: '10-14 days',
+        pdfPages: '30 pages',
+        dashboardDays: '120 days',
+        pptxSlides: '30+ slides',
+        htmlReport: true
+    }
+};
+
+// Current selection state
+let selectedTier = 2;
+let selectedAddons = [];
+
+// Tier selection
+document.querySelectorAll('.tier-card').forEach(card => {
+    card.addEventListener('click', function() {
+        // Update selection
+        document.querySelectorAll('.tier-card').forEach(c => c.classList.remove('selected'));
+        this.classList.add('selected');
+        this.querySelector('.tier-radio').checked = true;
+        selectedTier = parseInt(this.dataset.tier);
+
+        // Update deliverables
+        updateDeliverables();
+
+        // Update summary
+        updateSummary();
+    });
+});
+
+// Add-on selection
+document.querySelectorAll('.addon-item').forEach(item => {
+    item.addEventListener('click', function(e) {
+        if (e.target.tagName !== 'INPUT') {
+            const checkbox = this.querySelector('.addon-checkbox');
+            checkbox.checked = !checkbox.checked;
+        }
+
+        this.classList.toggle('selected', this.querySelector('.addon-checkbox').checked);
+
+        // Update addons list
+        const addonValue = this.dataset.addon;
+        const addonPrice = parseInt(this.dataset.price);
+
+        if (this.querySelector('.addon-checkbox').checked) {
+            if (!selectedAddons.find(a => a.value === addonValue)) {
+                selectedAddons.push({ value: addonValue, price: addonPrice, name: this.querySelector('.addon-name').textContent });
+            }
+        } else {
+            selectedAddons = selectedAddons.filter(a => a.value !== addonValue);
+        }
+
+        updateSummary();
+        updateDeliverables();
+    });
+});
+
+// Update deliverables based on tier
+function updateDeliverables() {
+    const tier = tierData[selectedTier];
+
+    // Update PDF status
+    document.getElementById('pdfStatus').textContent = tier.pdfPages;
+
+    // Update dashboard status
+    const hasExtension = selectedAddons.find(a => a.value === 'dashboard-extension');
+    if (hasExtension) {
+        document.getElementById('dashboardStatus').textContent = '12 months';
+    } else {
+        document.getElementById('dashboardStatus').textContent = tier.dashboardDays;
+    }
+
+    // Update PowerPoint
+    const pptxItem = document.querySelector('[data-format="pptx"]');
+    if (selectedTier >= 2) {
+        pptxItem.classList.add('included');
+        pptxItem.classList.remove('not-included');
+        document.getElementById('pptxStatus').textContent = tier.pptxSlides;
+    } else {
+        pptxItem.classList.remove('included');
+        pptxItem.classList.add('not-included');
+        document.getElementById('pptxStatus').textContent = 'Tier 2+';
+    }
+
+    // Update Interactive HTML
+    const htmlItem = document.querySelector('[data-format="html"]');
+    if (selectedTier >= 2) {
+        htmlItem.classList.add('included');
+        htmlItem.classList.remove('not-included');
+        document.getElementById('htmlStatus').textContent = 'Included';
+    } else {
+        htmlItem.classList.remove('included');
+        htmlItem.classList.add('not-included');
+        document.getElementById('htmlStatus').textContent = 'Tier 2+';
+    }
+}
+
+// Update order summary
+function updateSummary() {
+    const summaryItems = document.getElementById('summaryItems');
+    const totalPriceEl = document.getElementById('totalPrice');
+
+    let total = tierData[selectedTier].price;
+    let html = `
+        <div class="summary-item">
+            <span class="summary-item-name">${tierData[selectedTier].name}</span>
+            <span class="summary-item-price">$${tierData[selectedTier].price.toLocaleString()}</span>
+        </div>
+    `;
+
+    selectedAddons.forEach(addon => {
+        total += addon.price;
+        html += `
+            <div class="summary-item">
+                <span class="summary-item-name">${addon.name}</span>
+                <span class="summary-item-price">+$${addon.price}</span>
+            </div>
+        `;
+    });
+
+    summaryItems.innerHTML = html;
+    totalPriceEl.textContent = '$' + total.toLocaleString();
+}
+
+// Checkout button
+document.getElementById('checkoutButton').addEventListener('click', () => {
+    // Build checkout params
+    const checkoutData = {
+        projectId: projectId,
+        tier: selectedTier,
+        tierName: tierData[selectedTier].name,
+        tierPrice: tierData[selectedTier].price,
+        addons: selectedAddons,
+        total: tierData[selectedTier].price + selectedAddons.reduce((sum, a) => sum + a.price, 0)
+    };
+
+    // Store in session storage
+    sessionStorage.setItem('checkoutData', JSON.stringify(checkoutData));
+
+    // Navigate to checkout
+    const params = new URLSearchParams({
+        project_id: projectId,
+        tier: selectedTier,
+        total: checkoutData.total
+    });
+
+    window.location.href = '/checkout?' + params.toString();
+});
+
+// Initialize
+updateDeliverables();
+updateSummary();
@@ -0,0 +1,90 @@
+// ROI Calculator
+function calculateROI() {
+    const decisionValue = parseInt(document.getElementById('decision-value').value);
+    const tierCost = parseInt(document.getElementById('tier').value);
+
+    const savings = decisionValue;
+    const roi = Math.round((savings - tierCost) / tierCost * 100);
+
+    document.getElementById('savings-display').textContent = 'You save: $' + savings.toLocaleString();
+    document.getElementById('roi-display').textContent = 'ROI: ' + roi.toLocaleString() + '%';
+}
+
+document.getElementById('revenue').addEventListener('change', calculateROI);
+document.getElementById('decision-value').addEventListener('change', calculateROI);
+document.getElementById('tier').addEventListener('change', calculateROI);
+
+// Custom Builder
+const selectedItems = {
+    setup: [],
+    monthly: [],
+    quarterly: [],
+    addon: []
+};
+
+document.querySelectorAll('.builder-option').forEach(option => {
+    option.addEventListener('click', function() {
+        const type = this.dataset.type;
+        const price = parseInt(this.dataset.price);
+        const name = this.dataset.name;
+
+        if (this.classList.contains('selected')) {
+            this.classList.remove('selected');
+            selectedItems[type] = selectedItems[type].filter(item => item.name !== name);
+        } else {
+            this.classList.add('selected');
+            selectedItems[type].push({ name, price, type });
+        }
+
+        updateSummary();
+    });
+});
+
+function updateSummary() {
+    const summaryItems = document.getElementById('summary-items');
+    const allItems = [...selectedItems.setup, ...selectedItems.monthly, ...selectedItems.quarterly, ...selectedItems.addon];
+
+    if (allItems.length === 0) {
+        summaryItems.innerHTML = '<p class="summary-empty">Select components to build your package</p>';
+        document.getElementById('setup-total').textContent = '$0';
+        document.getElementById('monthly-total').textContent = '$0/mo';
+        document.getElementById('quarterly-total').textContent = '$0/qtr';
+        document.getElementById('grand-total').textContent = '$0';
+        document.getElementById('builder-cta').disabled = true;
+        document.getElementById('builder-cta').textContent = 'Select Components to Continue';
+        return;
+    }
+
+    let html = '';
+    allItems.forEach(item => {
+        let priceLabel = '';
+        if (item.type === 'setup') priceLabel = '$' + item.price.toLocaleString();
+        else if (item.type === 'monthly' || item.type === 'addon') priceLabel = '$' + item.price.toLocaleString() + '/mo';
+        else if (item.type === 'quarterly') priceLabel = '$' + item.price.toLocaleString() + '/qtr';
+
+        html += '<div class="summary-item"><span>' + item.name + '</span><span>' + priceLabel + '</span></div>';
+    });
+    summaryItems.innerHTML = html;
+
+    const setupTotal = selectedItems.setup.reduce((sum, item) => sum + item.price, 0);
+    const monthlyTotal = selectedItems.monthly.reduce((sum, item) => sum + item.price, 0) + 
+                         selectedItems.addon.reduce((sum, item) => sum + item.price, 0);
+    const quarterlyTotal = selectedItems.quarterly.reduce((sum, item) => sum + item.price, 0);
+
+    // First month = setup + first month + first quarter prorated
+    const firstMonthTotal = setupTotal + monthlyTotal + Math.round(quarterlyTotal / 3);
+
+    document.getElementById('setup-total').textContent = '$' + setupTotal.toLocaleString();
+    document.getElementById('monthly-total').textContent = '$' + monthlyTotal.toLocaleString() + '/mo';
+    document.getElementById('quarterly-total').textContent = '$' + quarterlyTotal.toLocaleString() + '/qtr';
+    document.getElementById('grand-total').textContent = '$' + firstMonthTotal.toLocaleString();
+
+    document.getElementById('builder-cta').disabled = false;
+    document.getElementById('builder-cta').textContent = 'Start Package - $' + firstMonthTotal.toLocaleString();
+}
+
+document.getElementById('builder-cta').addEventListener('click', function() {
+    if (!this.disabled) {
+        window.location.href = '/vertical-selector?package=custom';
+    }
+});
@@ -0,0 +1,142 @@
+// Toggle selected state for radio items
+document.querySelectorAll('.radio-item').forEach(item => {
+    item.addEventListener('click', function() {
+        const name = this.querySelector('input[type="radio"]').name;
+        document.querySelectorAll(`input[name="${name}"]`).forEach(input => {
+            input.closest('.radio-item').classList.remove('selected');
+        });
+        this.classList.add('selected');
+        this.querySelector('input[type="radio"]').checked = true;
+
+        // Handle conditional fields
+        if (name === 'business_type') {
+            const otherField = document.getElementById('business_type_other');
+            if (this.querySelector('input').value === 'other') {
+                otherField.classList.add('visible');
+            } else {
+                otherField.classList.remove('visible');
+            }
+        }
+
+        if (name === 'business_decision') {
+            const otherField = document.getElementById('business_decision_other');
+            if (this.querySelector('input').value === 'other') {
+                otherField.classList.add('visible');
+            } else {
+                otherField.classList.remove('visible');
+            }
+        }
+    });
+});
+
+// Toggle selected state for checkbox items
+document.querySelectorAll('.checkbox-item input[type="checkbox"]').forEach(checkbox => {
+    checkbox.addEventListener('change', function() {
+        this.closest('.checkbox-item').classList.toggle('selected', this.checked);
+    });
+});
+
+// Form validation and submission
+document.getElementById('realestateForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    let isValid = true;
+
+    // Clear previous errors
+    document.querySelectorAll('.question.error').forEach(q => q.classList.remove('error'));
+
+    // Validate required radio buttons
+    const requiredRadios = ['business_type', 'investment_horizon', 'strategic_priority', 'decision_timeline', 'business_decision'];
+    requiredRadios.forEach(name => {
+        if (!document.querySelector(`input[name="${name}"]:checked`)) {
+            const question = document.querySelector(`input[name="${name}"]`).closest('.question');
+            question.classList.add('error');
+            isValid = false;
+        }
+    });
+
+    // Validate required selects
+    const requiredSelects = ['geographic_focus', 'portfolio_size'];
+    requiredSelects.forEach(name => {
+        const select = document.querySelector(`select[name="${name}"]`);
+        if (!select.value) {
+            select.closest('.question').classList.add('error');
+            isValid = false;
+        }
+    });
+
+    // Validate required checkboxes (at least one selected)
+    const requiredCheckboxGroups = ['property_types', 'location_factors', 'timing_signals', 'market_concerns', 'data_sources'];
+    requiredCheckboxGroups.forEach(name => {
+        if (!document.querySelector(`input[name="${name}"]:checked`)) {
+            const question = document.querySelector(`input[name="${name}"]`).closest('.question');
+            question.classList.add('error');
+            isValid = false;
+        }
+    });
+
+    // Validate early warning signals (2-4 required)
+    const earlyWarningChecked = document.querySelectorAll('input[name="early_warning"]:checked').length;
+    if (earlyWarningChecked < 2 || earlyWarningChecked > 4) {
+        document.querySelector('input[name="early_warning"]').closest('.question').classList.add('error');
+        isValid = false;
+    }
+
+    // Validate market signals (3-5 required)
+    const signalChecked = document.querySelectorAll('input[name="market_signals"]:checked').length;
+    if (signalChecked < 3 || signalChecked > 5) {
+        document.querySelector('input[name="market_signals"]').closest('.question').classList.add('error');
+        isValid = false;
+    }
+
+    if (isValid) {
+        // Collect form data
+        const formData = new FormData(this);
+        const data = {};
+        formData.forEach((value, key) => {
+            if (data[key]) {
+                if (Array.isArray(data[key])) {
+                    data[key].push(value);
+                } else {
+                    data[key] = [data[key], value];
+                }
+            } else {
+                data[key] = value;
+            }
+        });
+
+        // Generate project ID
+        const projectId = 'RE-' + Date.now().toString(36).toUpperCase();
+
+        // Store in session storage for next step
+        sessionStorage.setItem('questionnaireData', JSON.stringify({
+            vertical: 'realestate',
+            projectId: projectId,
+            responses: data,
+            timestamp: new Date().toISOString()
+        }));
+
+        // Redirect to data upload page
+        window.location.href = '/upload?project_id=' + projectId;
+    } else {
+        // Scroll to first error
+        const firstError = document.querySelector('.question.error');
+        if (firstError) {
+            firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        }
+    }
+});
+
+// Update progress bar as user scrolls through sections
+const sections = document.querySelectorAll('.form-section');
+const progressFill = document.querySelector('.progress-fill');
+
+window.addEventListener('scroll', function() {
+    const scrollTop = window.scrollY;
+    const docHeight = document.documentElement.scrollHeight - window.innerHeight;
+    const scrollPercent = (scrollTop / docHeight) * 100;
+
+    // Base progress is 33% (step 1 of 3), add scroll progress within questionnaire
+    const progress = 33 + (scrollPercent * 0.2);
+    progressFill.style.width = Math.min(progress, 50) + '%';
+});
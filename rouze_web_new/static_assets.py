@@ -0,0 +1,271 @@
+"""
+ROUZE STATIC ASSETS
+Fingerprinted, minified and precompressed CSS/JS for the templates
+
+Build (run on deploy, see render.yaml):
+
+    python3 scripts/build_assets.py             # static/ -> static/build/ + manifest.json
+    python3 scripts/build_assets.py --rewrite   # first move inline <style>/<script> blocks
+                                                # out of templates/ into static/inline/
+
+The build minifies every .css/.js file under static/ (conservatively:
+comments and redundant whitespace only), names the result after a hash
+of its content and writes .gz (and .br, if the `brotli` package is
+installed) copies next to it.
+
+At runtime asset_url('inline/faq.css') is available in templates. It
+returns the hashed URL from the manifest, or the plain static URL before
+a build. Hashed files never change, so they are served with a one-year
+`immutable` Cache-Control and in the best encoding the client accepts.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+import textwrap
+
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, 'static')
+TEMPLATE_DIR = os.path.join(APP_DIR, 'templates')
+BUILD_SUBDIR = 'build'
+INLINE_SUBDIR = 'inline'
+MANIFEST_NAME = 'manifest.json'
+ASSET_EXTENSIONS = ('.css', '.js', '.svg')
+IMMUTABLE_MAX_AGE = 365 * 86400
+
+_INLINE_BLOCK = re.compile(r'(?P<indent>[ \t]*)<(?P<tag>style|script)>(?P<body>.*?)</(?P=tag)>', re.S)
+_STATIC_URL_FOR = re.compile(r"url_for\(\s*'static'\s*,\s*filename\s*=\s*")
+_CSS_TOKEN = re.compile(r'((?i:url)\(\s*[^"\'\s)][^)]*\)|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')|(/\*.*?\*/)|(\s+)', re.S)
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*|:\s+')
+
+
+# ----------------------------------------------------------------------
+# Minification
+# ----------------------------------------------------------------------
+
+def minify_css(text):
+    """Drop comments and collapse whitespace; string literals and unquoted url(...) values are left untouched"""
+    parts, position = [], 0
+
+    def squeeze(chunk):
+        chunk = _CSS_PUNCTUATION.sub(lambda m: m.group(1) or ':', chunk)
+        return chunk.replace(';}', '}')
+
+    plain = []
+    for match in _CSS_TOKEN.finditer(text):
+        plain.append(text[position:match.start()])
+        position = match.end()
+        string, comment, space = match.groups()
+        if string:
+            parts.append(squeeze(''.join(plain)))
+            parts.append(string)
+            plain = []
+        elif space:
+            plain.append(' ')
+        # Comments are dropped
+    plain.append(text[position:])
+    parts.append(squeeze(''.join(plain)))
+    return ''.join(parts).strip()
+
+
+def minify_js(text):
+    """Line-level only: strip indentation and blank lines (statements and ASI are unchanged)"""
+    return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+
+
+_MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _asset_name(template):
+    stem = os.path.splitext(template)[0]
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', stem).strip('_') or 'page'
+
+
+def _free_name(static_dir, base, ext, body):
+    """inline/<base><ext>, numbered if that file already holds something else"""
+    n = 1
+    while True:
+        name = f'{INLINE_SUBDIR}/{base}{ext}' if n == 1 else f'{INLINE_SUBDIR}/{base}-{n}{ext}'
+        try:
+            with open(os.path.join(static_dir, name), 'r', encoding='utf-8') as f:
+                if f.read() == body + '\n':
+                    return name
+        except FileNotFoundError:
+            return name
+        n += 1
+
+
+def extract_inline(template_dir=TEMPLATE_DIR, static_dir=STATIC_DIR):
+    """
+    Move inline <style>/<script> blocks out of the templates into static/inline/
+
+    Blocks with Jinja markup are left in place. Identical blocks on several
+    pages become one shared file. Returns {template: [asset names]}.
+    """
+    templates = sorted(name for name in os.listdir(template_dir) if name.endswith('.html'))
+    assets = {}  # (extension, content) -> asset name
+    rewritten = {}
+
+    for template in templates:
+        path = os.path.join(template_dir, template)
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        used = []
+
+        def replace(match):
+            body = textwrap.dedent(match.group('body')).strip('\n')
+            if not body.strip() or '{{' in body or '{%' in body:
+                return match.group(0)
+            ext = '.css' if match.group('tag') == 'style' else '.js'
+            name = assets.get((ext, body))
+            if name is None:
+                name = assets[(ext, body)] = _free_name(static_dir, _asset_name(template), ext, body)
+                _write(os.path.join(static_dir, name), (body + '\n').encode('utf-8'))
+            used.append(name)
+            indent = match.group('indent')
+            if ext == '.css':
+                return f'{indent}<link rel="stylesheet" href="{{{{ asset_url(\'{name}\') }}}}">'
+            return f'{indent}<script src="{{{{ asset_url(\'{name}\') }}}}"></script>'
+
+        new_html = _INLINE_BLOCK.sub(replace, html)
+        new_html = _STATIC_URL_FOR.sub('asset_url(', new_html)
+        if new_html != html:
+            _write(path, new_html.encode('utf-8'))
+            rewritten[template] = used
+    return rewritten
+
+
+def build(static_dir=STATIC_DIR):
+    """Minify, fingerprint and precompress every asset under `static_dir`; returns the manifest"""
+    build_dir = os.path.join(static_dir, BUILD_SUBDIR)
+    manifest = {}
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root) == os.path.abspath(static_dir):
+            dirs[:] = [d for d in dirs if d != BUILD_SUBDIR]
+        for filename in sorted(files):
+            stem, ext = os.path.splitext(filename)
+            if ext not in ASSET_EXTENSIONS:
+                continue
+            source = os.path.join(root, filename)
+            logical = os.path.relpath(source, static_dir).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+            minify = _MINIFIERS.get(ext)
+            if minify:
+                data = minify(data.decode('utf-8')).encode('utf-8')
+
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            hashed = f'{BUILD_SUBDIR}/{os.path.dirname(logical)}/{stem}.{digest}{ext}'.replace('//', '/')
+            target = os.path.join(static_dir, hashed)
+            if not os.path.exists(target):
+                _write(target, data)
+                _write(f'{target}.gz', gzip.compress(data, 9, mtime=0))
+                if brotli is not None:
+                    _write(f'{target}.br', brotli.compress(data, quality=11))
+            manifest[logical] = hashed
+
+    _write(os.path.join(build_dir, MANIFEST_NAME),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+# ----------------------------------------------------------------------
+# Runtime
+# ----------------------------------------------------------------------
+
+class _Manifest:
+    """build/manifest.json, re-read when it changes if templates auto-reload"""
+
+    def __init__(self, app):
+        self.app = app
+        self.path = os.path.join(app.static_folder, BUILD_SUBDIR, MANIFEST_NAME)
+        self.mtime = None
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self.mtime, self.entries = None, {}
+            return
+        if mtime != self.mtime:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+            self.mtime = mtime
+
+    def get(self, filename):
+        if self.app.config.get('TEMPLATES_AUTO_RELOAD') or self.app.debug:
+            self.load()
+        return self.entries.get(filename)
+
+
+def init_assets(app):
+    """Register asset_url() for templates and the route serving hashed build files"""
+    manifest = _Manifest(app)
+    build_dir = os.path.join(app.static_folder, BUILD_SUBDIR)
+
+    def asset_url(filename):
+        return url_for('static', filename=manifest.get(filename) or filename)
+
+    def built_asset(filename):
+        mimetype = mimetypes.guess_type(filename)[0]
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if (request.accept_encodings.quality(encoding) > 0
+                    and os.path.isfile(os.path.join(build_dir, filename + suffix))):
+                response = send_from_directory(build_dir, filename + suffix, mimetype=mimetype,
+                                               max_age=IMMUTABLE_MAX_AGE)
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = send_from_directory(build_dir, filename, mimetype=mimetype,
+                                           max_age=IMMUTABLE_MAX_AGE)
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+    app.add_template_global(asset_url)
+    app.add_url_rule(f'{app.static_url_path}/{BUILD_SUBDIR}/<path:filename>', 'built_asset', built_asset)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ROUZE static asset build')
+    parser.add_argument('--rewrite', action='store_true',
+                        help='Move inline <style>/<script> blocks from templates/ into static/inline/ first')
+    args = parser.parse_args(argv)
+
+    if args.rewrite:
+        rewritten = extract_inline()
+        print(f"✅ Moved inline assets out of {len(rewritten)} templates")
+    manifest = build()
+    print(f"✅ Built {len(manifest)} assets into static/{BUILD_SUBDIR}/")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
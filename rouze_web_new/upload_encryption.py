@@ -0,0 +1,307 @@
+"""
+ROUZE UPLOAD ENCRYPTION
+Streaming authenticated encryption for client files at rest
+
+Every file gets its own random 256-bit data key (DEK), wrapped with the
+master key and stored in the file header. The body is a sequence of
+AES-256-GCM segments of at most SEGMENT_SIZE plaintext bytes:
+
+    header   MAGIC | version | key id (8) | wrap nonce (12) | wrapped DEK (48) | nonce prefix (7)
+    segment  ciphertext length (4, big-endian) | ciphertext + tag
+
+Segment nonces are prefix | counter (4) | last-segment flag (1), and the
+header is the associated data of every segment. Reordering, dropping or
+truncating segments, or swapping headers between files, fails
+authentication. Memory use is one segment in each direction, whatever
+the file size.
+
+Master key: ROUZE_UPLOAD_MASTER_KEY (urlsafe base64, 32 bytes), else a
+key file generated on first use at ENCRYPTION_KEY_FILE.
+"""
+
+import base64
+import hashlib
+import hmac
+import io
+import os
+import struct
+import tempfile
+import time
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from config_upload_security import ENCRYPTION_KEY_FILE
+
+MAGIC = b'RZEN'
+VERSION = 1
+SEGMENT_SIZE = 64 * 1024
+TAG_SIZE = 16
+NONCE_PREFIX_SIZE = 7
+MAX_SEGMENTS = 2 ** 32 - 1
+
+_HEADER = struct.Struct('>4sB8s12s48s7s')
+_LENGTH = struct.Struct('>I')
+
+HEADER_SIZE = _HEADER.size
+
+_master_key = None
+
+
+class DecryptionError(Exception):
+    """File is corrupt, truncated, tampered with, or under a different master key"""
+
+
+KEY_FILE_WAIT_SECONDS = 5.0
+
+
+def _read_key_file():
+    """Key from ENCRYPTION_KEY_FILE, or None while it is missing or incomplete"""
+    try:
+        with open(ENCRYPTION_KEY_FILE, 'rb') as f:
+            key = base64.urlsafe_b64decode(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+    return key if len(key) == 32 else None
+
+
+def _create_key_file():
+    """
+    Publish a new key atomically: written to a private temp file, then
+    hard-linked into place. os.link fails if another worker got there
+    first, in which case their key is used.
+    """
+    key = AESGCM.generate_key(bit_length=256)
+    directory = os.path.dirname(ENCRYPTION_KEY_FILE) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.upload_master.')  # Mode 0600
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(base64.urlsafe_b64encode(key))
+            f.flush()
+            os.fsync(f.fileno())
+        os.link(tmp, ENCRYPTION_KEY_FILE)
+    except FileExistsError:
+        return None
+    finally:
+        os.unlink(tmp)
+    print(f"⚠️  Generated upload master key at {ENCRYPTION_KEY_FILE} (set ROUZE_UPLOAD_MASTER_KEY in production)")
+    return key
+
+
+def load_master_key():
+    """Master key from the environment, else from (or generated into) the key file"""
+    global _master_key
+    if _master_key is not None:
+        return _master_key
+
+    encoded = os.environ.get('ROUZE_UPLOAD_MASTER_KEY')
+    if encoded:
+        key = base64.urlsafe_b64decode(encoded)
+    else:
+        key = _read_key_file()
+        if key is None and not os.path.exists(ENCRYPTION_KEY_FILE):
+            key = _create_key_file()
+        deadline = time.monotonic() + KEY_FILE_WAIT_SECONDS
+        while key is None:
+            # Another worker's key (or a file written by hand) is not readable yet
+            if time.monotonic() >= deadline:
+                raise ValueError(f'Upload master key file {ENCRYPTION_KEY_FILE} is unreadable')
+            time.sleep(0.05)
+            key = _read_key_file()
+
+    if len(key) != 32:
+        raise ValueError('Upload master key must be 32 bytes')
+    _master_key = key
+    return key
+
+
+def derive_key(label):
+    """Independent 32-byte subkey of the master key for other uses (e.g. blob names)"""
+    return hmac.new(load_master_key(), label, hashlib.sha256).digest()
+
+
+def _key_id(master_key):
+    return hashlib.sha256(master_key).digest()[:8]
+
+
+def _nonce(prefix, counter, last):
+    if counter > MAX_SEGMENTS:
+        raise OverflowError('File too large for one encryption stream')
+    return prefix + struct.pack('>IB', counter, 1 if last else 0)
+
+
+def new_header(master_key=None):
+    """Fresh header and its (AESGCM, nonce prefix) for a new file"""
+    master_key = master_key or load_master_key()
+    dek = AESGCM.generate_key(bit_length=256)
+    wrap_nonce = os.urandom(12)
+    key_id = _key_id(master_key)
+    wrapped = AESGCM(master_key).encrypt(wrap_nonce, dek, MAGIC + bytes([VERSION]) + key_id)
+    prefix = os.urandom(NONCE_PREFIX_SIZE)
+    header = _HEADER.pack(MAGIC, VERSION, key_id, wrap_nonce, wrapped, prefix)
+    return header, AESGCM(dek), prefix
+
+
+def read_header(f, master_key=None):
+    """Parse and unwrap the header at the current position of `f`"""
+    header = f.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise DecryptionError('Missing encryption header')
+    magic, version, key_id, wrap_nonce, wrapped, prefix = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise DecryptionError('Not a ROUZE encrypted file')
+    master_key = master_key or load_master_key()
+    if key_id != _key_id(master_key):
+        raise DecryptionError('File was encrypted under a different master key')
+    try:
+        dek = AESGCM(master_key).decrypt(wrap_nonce, wrapped, magic + bytes([version]) + key_id)
+    except InvalidTag:
+        raise DecryptionError('Data key failed authentication')
+    return header, AESGCM(dek), prefix
+
+
+def is_encrypted(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class EncryptingWriter:
+    """
+    File-like writer that encrypts into `f` segment by segment
+
+    close() writes the final (authenticated end-of-stream) segment.
+    flush_segment() seals buffered bytes as a non-final segment, so a
+    resumable upload can stop after any chunk and continue later with
+    EncryptingWriter.resume().
+    """
+
+    def __init__(self, f, aead, nonce_prefix, header, counter=0):
+        self.f = f
+        self.aead = aead
+        self.nonce_prefix = nonce_prefix
+        self.header = header
+        self.counter = counter
+        self.plaintext_bytes = 0
+        self._buffer = bytearray()
+        self._closed = False
+
+    @classmethod
+    def create(cls, f, master_key=None):
+        header, aead, prefix = new_header(master_key)
+        f.write(header)
+        return cls(f, aead, prefix, header)
+
+    @classmethod
+    def resume(cls, f, counter, offset, master_key=None):
+        """Continue a stream whose first `counter` segments end at byte `offset`"""
+        f.seek(0)
+        header, aead, prefix = read_header(f, master_key)
+        f.seek(offset)
+        f.truncate()
+        return cls(f, aead, prefix, header, counter)
+
+    def _emit(self, data, last=False):
+        ciphertext = self.aead.encrypt(_nonce(self.nonce_prefix, self.counter, last), data, self.header)
+        self.f.write(_LENGTH.pack(len(ciphertext)))
+        self.f.write(ciphertext)
+        self.counter += 1
+
+    def write(self, data):
+        self._buffer += data
+        self.plaintext_bytes += len(data)
+        if len(self._buffer) >= SEGMENT_SIZE:
+            view = memoryview(self._buffer)
+            full = len(self._buffer) - len(self._buffer) % SEGMENT_SIZE
+            for start in range(0, full, SEGMENT_SIZE):
+                self._emit(view[start:start + SEGMENT_SIZE])
+            view.release()
+            del self._buffer[:full]
+        return len(data)
+
+    def flush_segment(self):
+        if self._buffer:
+            self._emit(self._buffer)
+            self._buffer.clear()
+
+    def close(self):
+        if not self._closed:
+            self._emit(self._buffer, last=True)
+            self._buffer.clear()
+            self._closed = True
+
+
+class DecryptingReader(io.RawIOBase):
+    """Raw binary stream of the plaintext; wrap in io.BufferedReader / TextIOWrapper as needed"""
+
+    def __init__(self, f, master_key=None):
+        self.f = f
+        self.header, self.aead, self.nonce_prefix = read_header(f, master_key)
+        self.counter = 0
+        self._segment = b''
+        self._position = 0
+        self._done = False
+
+    def _next_segment(self):
+        length_bytes = self.f.read(_LENGTH.size)
+        if len(length_bytes) != _LENGTH.size:
+            raise DecryptionError('Encrypted file is truncated')
+        (length,) = _LENGTH.unpack(length_bytes)
+        if length > SEGMENT_SIZE + TAG_SIZE:
+            raise DecryptionError('Corrupt segment length')
+        ciphertext = self.f.read(length)
+
+        for last in (False, True):
+            try:
+                plaintext = self.aead.decrypt(_nonce(self.nonce_prefix, self.counter, last),
+                                              ciphertext, self.header)
+            except InvalidTag:
+                continue
+            self.counter += 1
+            if last:
+                self._done = True
+                if self.f.read(1):
+                    raise DecryptionError('Data after the final segment')
+            return plaintext
+        raise DecryptionError(f'Segment {self.counter} failed authentication')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self._position >= len(self._segment):
+            if self._done:
+                return 0
+            self._segment = self._next_segment()
+            self._position = 0
+        n = min(len(buffer), len(self._segment) - self._position)
+        buffer[:n] = self._segment[self._position:self._position + n]
+        self._position += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self.f.close()
+        super().close()
+
+
+def open_decrypted(path, mode='rb', master_key=None, allow_plaintext=True, encoding='utf-8'):
+    """
+    Open an uploaded file for streaming reads, decrypting if needed
+
+    `allow_plaintext` lets files stored before encryption was switched on
+    be read as-is. Use mode='r' for text (e.g. csv.reader).
+    """
+    f = open(path, 'rb')
+    if f.read(len(MAGIC)) != MAGIC:
+        if not allow_plaintext:
+            f.close()
+            raise DecryptionError(f'{path} is not encrypted')
+        f.seek(0)
+        stream = f
+    else:
+        f.seek(0)
+        stream = io.BufferedReader(DecryptingReader(f, master_key), buffer_size=SEGMENT_SIZE)
+    if 'b' in mode:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding, newline='')
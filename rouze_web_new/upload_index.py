@@ -0,0 +1,137 @@
+"""
+ROUZE UPLOAD INDEX
+Metadata for every stored upload: SQLite (WAL) plus an in-process LRU
+
+Status polls, quota checks and per-client listings are indexed lookups
+and never touch the upload folder. The LRU is shared by all threads in a
+worker. It is dropped whenever SQLite's PRAGMA data_version reports a
+commit from another connection (another thread or gunicorn worker), so
+every worker sees other workers' writes on its next read.
+
+Statuses: uploading -> received -> deleting -> deleted, or rejected.
+"""
+
+import time
+
+from config_upload_security import MAX_TOTAL_UPLOADS_PER_CLIENT, UPLOAD_INDEX_DB
+from sqlite_store import VersionedCache, connect, transaction
+
+CACHE_SIZE = 4096
+RESERVATION_TTL = 3600  # 'uploading' rows older than this (crashed worker) stop counting
+UNMETERED_CLIENTS = {'anonymous'}  # No client to attribute these to, so no quota
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    file_id TEXT PRIMARY KEY,
+    client_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    size INTEGER,
+    sha256 TEXT,
+    file_ext TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS uploads_client ON uploads(client_id, status, created_at);
+"""
+
+# Files that count against the quota: stored, or still being uploaded
+_ACTIVE = "(status = 'received' OR (status = 'uploading' AND updated_at > ?))"
+
+_COLUMNS = ('file_id', 'client_id', 'status', 'size', 'sha256', 'file_ext',
+            'created_at', 'updated_at', 'expires_at')
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+_cache = VersionedCache(CACHE_SIZE)
+
+
+def _db():
+    return connect(UPLOAD_INDEX_DB, _SCHEMA)
+
+
+def _row_dict(row):
+    return dict(zip(_COLUMNS, row)) if row else None
+
+
+def _write(sql, params):
+    conn = _db()
+    conn.execute(sql, params)
+    _cache.clear()  # Our own commits don't bump our connection's data_version
+
+
+def reserve(file_id, client_id, file_ext=None):
+    """
+    Claim a quota slot for a new upload (atomically across workers)
+
+    Raises QuotaExceeded when the client already has
+    MAX_TOTAL_UPLOADS_PER_CLIENT active uploads.
+    """
+    now = time.time()
+    with transaction(_db()) as conn:
+        if client_id not in UNMETERED_CLIENTS:
+            active = conn.execute(f'SELECT COUNT(*) FROM uploads WHERE client_id = ? AND {_ACTIVE}',
+                                  (client_id, now - RESERVATION_TTL)).fetchone()[0]
+            if active >= MAX_TOTAL_UPLOADS_PER_CLIENT:
+                raise QuotaExceeded(
+                    f'Upload limit reached ({MAX_TOTAL_UPLOADS_PER_CLIENT} files). '
+                    f'Delete an existing file to upload another.')
+        conn.execute(
+            'INSERT INTO uploads (file_id, client_id, status, file_ext, created_at, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)', (file_id, client_id, 'uploading', file_ext, now, now))
+    _cache.clear()
+
+
+def complete(file_id, size, sha256, expires_at=None):
+    _write("UPDATE uploads SET status = 'received', size = ?, sha256 = ?, expires_at = ?, "
+           "updated_at = ? WHERE file_id = ?", (size, sha256, expires_at, time.time(), file_id))
+
+
+def set_status(file_id, status):
+    _write('UPDATE uploads SET status = ?, updated_at = ? WHERE file_id = ?',
+           (status, time.time(), file_id))
+
+
+def set_expiry(file_id, expires_at):
+    _write('UPDATE uploads SET expires_at = ?, updated_at = ? WHERE file_id = ?',
+           (expires_at, time.time(), file_id))
+
+
+def mark_deleted(file_id):
+    """File is gone from disk (rejected uploads keep their 'rejected' status)"""
+    _write("UPDATE uploads SET status = 'deleted', updated_at = ? WHERE file_id = ? AND status != 'rejected'",
+           (time.time(), file_id))
+
+
+def get_upload(file_id):
+    conn = _db()
+    return _cache.get(conn, ('upload', file_id), lambda: _row_dict(conn.execute(
+        f"SELECT {', '.join(_COLUMNS)} FROM uploads WHERE file_id = ?", (file_id,)).fetchone()))
+
+
+def active_count(client_id):
+    conn = _db()
+    return _cache.get(conn, ('active', client_id), lambda: conn.execute(
+        f'SELECT COUNT(*) FROM uploads WHERE client_id = ? AND {_ACTIVE}',
+        (client_id, time.time() - RESERVATION_TTL)).fetchone()[0])
+
+
+def quota_remaining(client_id):
+    if client_id in UNMETERED_CLIENTS:
+        return None
+    return max(0, MAX_TOTAL_UPLOADS_PER_CLIENT - active_count(client_id))
+
+
+def list_uploads(client_id, include_deleted=False):
+    conn = _db()
+    sql = f"SELECT {', '.join(_COLUMNS)} FROM uploads WHERE client_id = ?"
+    params = [client_id]
+    if not include_deleted:
+        sql += f' AND {_ACTIVE}'
+        params.append(time.time() - RESERVATION_TTL)
+    sql += ' ORDER BY created_at DESC'
+    return _cache.get(conn, ('list', client_id, include_deleted),
+                      lambda: [_row_dict(row) for row in conn.execute(sql, params)])
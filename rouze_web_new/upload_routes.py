@@ -3,22 +3,56 @@ ROUZE FILE UPLOAD HANDLER
 Secure file upload with privacy & legal compliance
 """
 
-from flask import request, jsonify, render_template
+from flask import request, jsonify, render_template, session as browser_session
 from werkzeug.utils import secure_filename
 import os
 import json
 from datetime import datetime
 import secrets
+from audit_log import record as record_audit_entry
+from chunked_upload import (
+    CHUNK_SIZE,
+    UploadError,
+    check_client_id,
+    create_session,
+    file_extension,
+    finalize_session,
+    load_session,
+    save_stream,
+    write_chunk
+)
+from retention import cancel as cancel_retention, schedule as schedule_retention
+from secure_delete import enqueue_deletion, get_job
+from upload_validation import ValidationError, validate_upload
+import blob_store
+import upload_index
+from metrics import init_metrics
 from config_upload_security import (
     secure_filename_generator, 
     UPLOAD_FOLDER,
-    ALLOWED_EXTENSIONS,
-    MAX_FILE_SIZE,
+    STAGING_FOLDER,
+    DEFAULT_DELETION_POLICY,
+    MAX_TOTAL_UPLOADS_PER_CLIENT,
     GDPR_COMPLIANCE
 )
 
+MAX_SESSION_UPLOADS = 50
+
+def remember_upload(file_id):
+    """Record that this browser session uploaded `file_id` (upload sessions are unrelated)"""
+    uploaded = browser_session.get('uploaded_files', [])
+    browser_session['uploaded_files'] = (uploaded + [file_id])[-MAX_SESSION_UPLOADS:]
+
+def session_owns_upload(file_id):
+    """True if `file_id` was uploaded in this session and is still stored"""
+    if file_id not in browser_session.get('uploaded_files', []):
+        return False
+    upload = upload_index.get_upload(file_id)
+    return upload is not None and upload['status'] == 'received'
+
 def register_upload_routes(app):
     """Register all upload-related routes"""
+    init_metrics(app)  # No-op if the app is already instrumented
     
     @app.route('/upload/data', methods=['GET', 'POST'])
     def upload_data():
@@ -52,34 +86,60 @@ def register_upload_routes(app):
             if not file.filename:
                 return jsonify({'error': 'Invalid filename'}), 400
             
-            file_ext = file.filename.split('.')[-1].lower()
-            if file_ext not in ALLOWED_EXTENSIONS:
-                return jsonify({
-                    'error': f'File type .{file_ext} not allowed. Use: {", ".join(ALLOWED_EXTENSIONS)}'
-                }), 400
+            try:
+                file_ext = file_extension(file.filename)
+            except UploadError as e:
+                return jsonify({'error': str(e)}), e.status
             
-            # STEP 4: Check file size
-            file.seek(0, os.SEEK_END)
-            file_size = file.tell()
-            file.seek(0)
-            
-            if file_size > MAX_FILE_SIZE:
-                return jsonify({
-                    'error': f'File too large. Max: 10MB, Yours: {file_size / 1024 / 1024:.2f}MB'
-                }), 400
-            
-            # STEP 5: Generate secure filename (anonymize)
+            # STEP 4: Generate secure filename (anonymize)
             client_id = request.form.get('client_id', 'anonymous')
+            try:
+                check_client_id(client_id)
+            except UploadError as e:
+                return jsonify({'error': str(e)}), e.status
             safe_filename = secure_filename_generator(file.filename, client_id)
             
-            # STEP 6: Create uploads folder if doesn't exist
-            os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+            # STEP 5: Claim a quota slot (MAX_TOTAL_UPLOADS_PER_CLIENT)
+            try:
+                upload_index.reserve(safe_filename, client_id, file_ext)
+            except upload_index.QuotaExceeded as e:
+                return jsonify({'error': str(e)}), 429
             
-            # STEP 7: Save file
-            filepath = os.path.join(UPLOAD_FOLDER, safe_filename)
-            file.save(filepath)
+            # Anything below that fails must release the reserved slot
+            try:
+                # STEP 6: Stream file to staging (size limit enforced while copying)
+                staged_path = os.path.join(STAGING_FOLDER, 'complete', safe_filename)
+                os.makedirs(os.path.join(STAGING_FOLDER, 'complete'), exist_ok=True)
+                try:
+                    file_size, file_hash = save_stream(file.stream, staged_path)
+                except UploadError as e:
+                    upload_index.set_status(safe_filename, 'rejected')
+                    return jsonify({'error': str(e)}), e.status
             
-            # STEP 8: Log upload (audit trail)
+                # STEP 7: Validate + profile in one streaming pass
+                try:
+                    profile = validate_upload(staged_path, file_ext, safe_filename)
+                except ValidationError as e:
+                    upload_index.set_status(safe_filename, 'rejected')
+                    enqueue_deletion(staged_path, action='file_rejected', client_id=client_id)
+                    return jsonify({'error': str(e)}), 400
+            
+                # STEP 8: Store (content-addressed: repeat uploads share one blob)
+                blob_store.store(staged_path, safe_filename, file_hash, client_id)
+                filepath = os.path.join(UPLOAD_FOLDER, safe_filename)
+            
+                # STEP 9: Schedule retention (deleted when the client's policy expires)
+                expires_at = schedule_retention(
+                    filepath, request.form.get('deletion_policy', DEFAULT_DELETION_POLICY),
+                    client_id=client_id)
+                upload_index.complete(safe_filename, file_size, file_hash, expires_at)
+            except Exception:
+                upload_index.set_status(safe_filename, 'rejected')
+                raise
+            
+            remember_upload(safe_filename)
+            
+            # STEP 10: Log upload (audit trail)
             audit_log_entry(
                 client_id=client_id,
                 action='file_upload',
@@ -88,29 +148,159 @@ def register_upload_routes(app):
                 original_filename=file.filename
             )
             
-            # STEP 9: Return success
+            # STEP 11: Return success
             return jsonify({
                 'success': True,
                 'message': 'File uploaded successfully. Your data is encrypted.',
                 'file_id': safe_filename,
+                'sha256': file_hash,
+                'profile': profile_summary(profile),
                 'next_step': 'We will analyze your data within 24 hours.'
             }), 200
     
+    @app.route('/upload/chunked', methods=['POST'])
+    def chunked_upload_init():
+        """
+        Start a resumable upload
+        Body (JSON): filename, size, client_id, gdpr_consent
+        """
+        
+        data = request.get_json(silent=True) or {}
+        if str(data.get('gdpr_consent')).lower() != 'true':
+            return jsonify({
+                'error': 'You must agree to data privacy terms to upload'
+            }), 400
+        
+        try:
+            check_client_id(data.get('client_id', 'anonymous'))
+        except UploadError as e:
+            return jsonify({'error': str(e)}), e.status
+        
+        # Early quota check; the slot itself is claimed at finalize
+        if upload_index.quota_remaining(data.get('client_id', 'anonymous')) == 0:
+            return jsonify({
+                'error': f'Upload limit reached ({MAX_TOTAL_UPLOADS_PER_CLIENT} files). '
+                         f'Delete an existing file to upload another.'
+            }), 429
+        
+        try:
+            session = create_session(
+                client_id=data.get('client_id', 'anonymous'),
+                original_filename=data.get('filename'),
+                total_size=data.get('size'),
+                deletion_policy=data.get('deletion_policy', DEFAULT_DELETION_POLICY)
+            )
+        except UploadError as e:
+            return jsonify({'error': str(e), **e.details}), e.status
+        
+        return jsonify({
+            'upload_id': session['upload_id'],
+            'offset': 0,
+            'chunk_size': CHUNK_SIZE
+        }), 201
+    
+    @app.route('/upload/chunked/<upload_id>', methods=['GET'])
+    def chunked_upload_status(upload_id):
+        """Resume point for an interrupted upload"""
+        
+        try:
+            session = load_session(upload_id)
+        except UploadError as e:
+            return jsonify({'error': str(e)}), e.status
+        
+        return jsonify({
+            'upload_id': upload_id,
+            'offset': session['received'],
+            'size': session['size']
+        }), 200
+    
+    @app.route('/upload/chunked/<upload_id>', methods=['PUT'])
+    def chunked_upload_chunk(upload_id):
+        """Append raw request body at ?offset=N"""
+        
+        offset = request.args.get('offset', type=int)
+        if offset is None:
+            return jsonify({'error': 'offset query parameter required'}), 400
+        
+        try:
+            session = write_chunk(upload_id, offset, request.stream)
+        except UploadError as e:
+            return jsonify({'error': str(e), **e.details}), e.status
+        
+        return jsonify({
+            'upload_id': upload_id,
+            'offset': session['received'],
+            'size': session['size']
+        }), 200
+    
+    @app.route('/upload/chunked/<upload_id>/finalize', methods=['POST'])
+    def chunked_upload_finalize(upload_id):
+        """Verify the upload is complete and hand it to the upload folder"""
+        
+        try:
+            safe_filename, staged_path, session = finalize_session(upload_id)
+        except UploadError as e:
+            return jsonify({'error': str(e), **e.details}), e.status
+        
+        try:
+            upload_index.reserve(safe_filename, session['client_id'], session['file_ext'])
+        except upload_index.QuotaExceeded as e:
+            enqueue_deletion(staged_path, action='file_rejected', client_id=session['client_id'])
+            return jsonify({'error': str(e)}), 429
+        
+        try:
+            try:
+                profile = validate_upload(staged_path, session['file_ext'], safe_filename)
+            except ValidationError as e:
+                upload_index.set_status(safe_filename, 'rejected')
+                enqueue_deletion(staged_path, action='file_rejected', client_id=session['client_id'])
+                return jsonify({'error': str(e)}), 400
+        
+            blob_store.store(staged_path, safe_filename, session['sha256'], session['client_id'])
+            filepath = os.path.join(UPLOAD_FOLDER, safe_filename)
+            expires_at = schedule_retention(
+                filepath, session.get('deletion_policy', DEFAULT_DELETION_POLICY),
+                client_id=session['client_id'])
+            upload_index.complete(safe_filename, session['size'], session['sha256'], expires_at)
+        except Exception:
+            upload_index.set_status(safe_filename, 'rejected')
+            raise
+        
+        remember_upload(safe_filename)
+        
+        audit_log_entry(
+            client_id=session['client_id'],
+            action='file_upload',
+            filename=safe_filename,
+            file_size=session['size'],
+            original_filename=session['original_filename']
+        )
+        
+        return jsonify({
+            'success': True,
+            'message': 'File uploaded successfully. Your data is encrypted.',
+            'file_id': safe_filename,
+            'sha256': session['sha256'],
+            'profile': profile_summary(profile),
+            'next_step': 'We will analyze your data within 24 hours.'
+        }), 200
+    
     @app.route('/upload/status/<file_id>', methods=['GET'])
     def upload_status(file_id):
         """Check status of uploaded file"""
         
-        # Verify file exists and belongs to client
-        filepath = os.path.join(UPLOAD_FOLDER, file_id)
-        
-        if not os.path.exists(filepath):
+        upload = upload_index.get_upload(file_id)
+        if upload is None:
+            return legacy_upload_status(file_id)
+        if upload['status'] in ('deleted', 'rejected'):
             return jsonify({'error': 'File not found'}), 404
         
         return jsonify({
             'file_id': file_id,
-            'status': 'received',
-            'created': datetime.fromtimestamp(os.path.getctime(filepath)).isoformat(),
-            'size': os.path.getsize(filepath),
+            'status': upload['status'],
+            'created': datetime.fromtimestamp(upload['created_at']).isoformat(),
+            'size': upload['size'],
+            'expires': datetime.fromtimestamp(upload['expires_at']).isoformat() if upload['expires_at'] else None,
             'next_step': 'Analysis begins'
         }), 200
     
@@ -122,31 +312,69 @@ def register_upload_routes(app):
         """
         
         filepath = os.path.join(UPLOAD_FOLDER, file_id)
-        
-        if not os.path.exists(filepath):
+        upload = upload_index.get_upload(file_id)
+        if upload is None:
+            # Stored before the upload index existed
+            if not os.path.exists(filepath):
+                return jsonify({'error': 'File not found'}), 404
+        elif upload['status'] not in ('received', 'uploading'):
             return jsonify({'error': 'File not found'}), 404
+        else:
+            upload_index.set_status(file_id, 'deleting')
         
-        try:
-            # Secure deletion (overwrite before deleting)
-            with open(filepath, 'wb') as f:
-                f.write(os.urandom(os.path.getsize(filepath)))
-            
-            # Delete file
-            os.remove(filepath)
-            
-            # Log deletion
-            audit_log_entry(
-                action='file_deleted',
-                filename=file_id
-            )
-            
-            return jsonify({
-                'success': True,
-                'message': 'File permanently deleted'
-            }), 200
+        # Secure deletion (chunked overwrite + delete) runs in the background;
+        # the audit entry is written once the file is actually gone
+        job_id = enqueue_deletion(filepath, action='file_deleted')
+        cancel_retention(filepath)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Deletion scheduled. The file will be permanently deleted shortly.',
+            'job_id': job_id,
+            'status_url': f'/upload/delete/status/{job_id}'
+        }), 202
+    
+    @app.route('/upload/delete/status/<job_id>', methods=['GET'])
+    def delete_status(job_id):
+        """Progress of a deletion request"""
         
-        except Exception as e:
-            return jsonify({'error': f'Deletion failed: {str(e)}'}), 500
+        job = get_job(job_id)
+        if job is None:
+            return jsonify({'error': 'Deletion job not found'}), 404
+        
+        return jsonify({
+            'job_id': job_id,
+            'status': job['status'],
+            'error': job['error'] if job['status'] == 'failed' else None,
+            'updated': datetime.fromtimestamp(job['updated_at']).isoformat()
+        }), 200
+
+def legacy_upload_status(file_id):
+    """Status for files stored before the upload index existed"""
+    
+    filepath = os.path.join(UPLOAD_FOLDER, file_id)
+    
+    if not os.path.exists(filepath):
+        return jsonify({'error': 'File not found'}), 404
+    
+    return jsonify({
+        'file_id': file_id,
+        'status': 'received',
+        'created': datetime.fromtimestamp(os.path.getctime(filepath)).isoformat(),
+        'size': os.path.getsize(filepath),
+        'next_step': 'Analysis begins'
+    }), 200
+
+def profile_summary(profile):
+    """Compact data stats for the upload response (full profile stays on disk)"""
+    return {
+        'rows': profile['rows'],
+        'tables': {
+            name: [{'name': column['name'], 'type': column['type'], 'nulls': column['nulls']}
+                   for column in table['columns']]
+            for name, table in profile['tables'].items()
+        }
+    }
 
 def audit_log_entry(client_id=None, action=None, filename=None, file_size=None, original_filename=None):
     """
@@ -163,24 +391,5 @@ def audit_log_entry(client_id=None, action=None, filename=None, file_size=None,
         'file_size': file_size
     }
     
-    # Append to audit log
-    log_file = 'uploads/audit_log.json'
-    
-    try:
-        # Read existing log
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as f:
-                logs = json.load(f)
-        else:
-            logs = []
-        
-        # Append new entry
-        logs.append(log_entry)
-        
-        # Write back
-        with open(log_file, 'w') as f:
-            json.dump(logs, f, indent=2)
-    
-    except Exception as e:
-        print(f"Failed to write audit log: {e}")
-
+    # Append to audit log (queued; written in batches by the audit writer thread)
+    record_audit_entry(log_entry)
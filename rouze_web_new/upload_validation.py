@@ -0,0 +1,378 @@
+"""
+ROUZE UPLOAD VALIDATION
+One streaming pass over an upload: enforce FILE_VALIDATION_RULES and
+profile every column
+
+    csv    csv.reader over the decrypted text stream
+    xlsx   openpyxl read-only row iterator (uploads rejected if it is missing)
+    json   incremental parse of a top-level array, item by item
+
+Reading stops as soon as a limit is exceeded. The same pass builds a
+per-column profile: value types, nulls, numeric min/max, and approximate
+distinct counts from a HyperLogLog sketch (about 1.6% error, 4KB per
+column, allocated on the column's first non-null value). Memory use
+therefore does not grow with the number of rows, and max_columns bounds
+it per file.
+
+Profiles hold client column names and values (min/max), so they are
+stored encrypted like the uploads themselves.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import math
+import os
+
+from config_upload_security import FILE_VALIDATION_RULES, MAX_FILE_SIZE, PROFILE_FOLDER
+from upload_encryption import EncryptingWriter, open_decrypted
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+JSON_CHUNK_SIZE = 64 * 1024
+NULL_VALUES = {'', 'null', 'none', 'na', 'n/a', 'nan', '-'}
+HLL_PRECISION = 12
+
+csv.field_size_limit(MAX_FILE_SIZE)
+
+
+class ValidationError(Exception):
+    """Upload breaks one of FILE_VALIDATION_RULES"""
+
+
+class _NotAnArray(ValueError):
+    pass
+
+
+class HyperLogLog:
+    """Approximate distinct counter with 2**precision one-byte registers"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        h = int.from_bytes(hashlib.blake2b(value.encode('utf-8', 'surrogatepass'),
+                                           digest_size=8).digest(), 'big')
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # Small-range (linear counting) correction
+        return int(round(estimate))
+
+
+def _infer(value):
+    """(type name, numeric value or None) for one cell"""
+    if value is None:
+        return 'null', None
+    if isinstance(value, bool):
+        return 'bool', None
+    if isinstance(value, (int, float)):
+        return ('int' if isinstance(value, int) else 'float'), value
+    if not isinstance(value, str):
+        return ('object' if isinstance(value, (dict, list)) else type(value).__name__), None
+
+    text = value.strip()
+    if text.lower() in NULL_VALUES:
+        return 'null', None
+    if text.lower() in ('true', 'false'):
+        return 'bool', None
+    try:
+        return 'int', int(text.replace(',', ''))
+    except ValueError:
+        pass
+    try:
+        number = float(text.replace(',', ''))
+        if math.isfinite(number):
+            return 'float', number
+    except ValueError:
+        pass
+    return 'str', None
+
+
+class ColumnProfile:
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.types = {}
+        self.min = None
+        self.max = None
+        self.distinct = None  # HyperLogLog, created on the first non-null value
+
+    def add(self, value):
+        self.count += 1
+        kind, number = _infer(value)
+        self.types[kind] = self.types.get(kind, 0) + 1
+        if kind == 'null':
+            self.nulls += 1
+            return
+        if number is not None:
+            if self.min is None or number < self.min:
+                self.min = number
+            if self.max is None or number > self.max:
+                self.max = number
+        if self.distinct is None:
+            self.distinct = HyperLogLog()
+        self.distinct.add(value if isinstance(value, str) else json.dumps(value, default=str))
+
+    def to_dict(self):
+        non_null = {kind: n for kind, n in self.types.items() if kind != 'null'}
+        return {
+            'name': self.name,
+            'type': max(non_null, key=non_null.get) if non_null else 'null',
+            'types': self.types,
+            'count': self.count,
+            'nulls': self.nulls,
+            'min': self.min,
+            'max': self.max,
+            'distinct_approx': self.distinct.count() if self.distinct is not None else 0,
+        }
+
+
+class TableProfile:
+    """Column profiles for a stream of rows (lists by position, or dicts by key)"""
+
+    def __init__(self, header=None, max_columns=None):
+        self.max_columns = max_columns
+        self.columns = []
+        self._by_name = {}
+        self.rows = 0
+        for name in header or []:
+            self._column(name)
+
+    def _column(self, name):
+        column = self._by_name.get(name)
+        if column is None:
+            if self.max_columns and len(self.columns) >= self.max_columns:
+                raise ValidationError(f'Too many columns: limit is {self.max_columns:,}')
+            column = self._by_name[name] = ColumnProfile(name)
+            self.columns.append(column)
+        return column
+
+    def add_row(self, row):
+        self.rows += 1
+        if isinstance(row, dict):
+            for name, value in row.items():
+                self._column(str(name)).add(value)
+            return
+        for i, value in enumerate(row):
+            column = self.columns[i] if i < len(self.columns) else self._column(f'column_{i + 1}')
+            column.add(value)
+
+    def to_dict(self):
+        return {'rows': self.rows, 'columns': [column.to_dict() for column in self.columns]}
+
+
+def _check_rows(rows, rules, where=''):
+    max_rows = rules.get('max_rows')
+    if max_rows and rows > max_rows:
+        raise ValidationError(f'Too many rows{where}: limit is {max_rows:,}')
+
+
+def _profile_csv(path, rules):
+    with open_decrypted(path, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValidationError('CSV file is empty')
+        profile = TableProfile(header, rules.get('max_columns'))
+        for row in reader:
+            if not row:
+                continue
+            profile.add_row(row)
+            _check_rows(profile.rows, rules)
+    return {'tables': {'csv': profile.to_dict()}}
+
+
+def _profile_xlsx(path, rules):
+    if openpyxl is None:
+        # Without it no XLSX rule could be enforced, so don't accept the file unchecked
+        raise ValidationError('Excel uploads are not available right now; please upload CSV or JSON')
+
+    # XLSX is a zip archive and needs random access, so the upload is
+    # decrypted into memory (never to disk), capped at the upload limit
+    with io.BytesIO() as plain:
+        with open_decrypted(path) as f:
+            while True:
+                chunk = f.read(JSON_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if plain.tell() + len(chunk) > MAX_FILE_SIZE:
+                    raise ValidationError(f'Excel file too large: limit is {MAX_FILE_SIZE / 1024 / 1024:.0f}MB')
+                plain.write(chunk)
+        plain.seek(0)
+        try:
+            workbook = openpyxl.load_workbook(plain, read_only=True, data_only=True)
+        except Exception as e:
+            raise ValidationError(f'Not a valid Excel workbook: {e}')
+        try:
+            max_sheets = rules.get('max_sheets')
+            if max_sheets and len(workbook.sheetnames) > max_sheets:
+                raise ValidationError(f'Too many sheets: limit is {max_sheets}')
+            tables, total_rows = {}, 0
+            for sheet in workbook.worksheets:
+                rows = sheet.iter_rows(values_only=True)
+                header = next(rows, None)
+                profile = TableProfile([str(h) if h is not None else f'column_{i + 1}'
+                                        for i, h in enumerate(header or [])], rules.get('max_columns'))
+                for row in rows:
+                    if all(value is None for value in row):
+                        continue
+                    profile.add_row(row)
+                    total_rows += 1
+                    _check_rows(total_rows, rules, ' across sheets')
+                tables[sheet.title] = profile.to_dict()
+        finally:
+            workbook.close()
+    return {'tables': tables}
+
+
+def _iter_json_array(f):
+    """Yield the items of a top-level JSON array without decoding it all at once"""
+    decoder = json.JSONDecoder()
+    buffer, eof, position = '', False, 0
+
+    def fill():
+        nonlocal buffer, eof, position
+        chunk = f.read(JSON_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def skip_space():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n':
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            fill()
+
+    fill()
+    skip_space()
+    if buffer[position:position + 1] != '[':
+        raise _NotAnArray()
+    position += 1
+    expect_item = None  # None = first item may be ']'
+    while True:
+        skip_space()
+        if position >= len(buffer):
+            raise ValueError('unexpected end of JSON')
+        char = buffer[position]
+        if char == ']' and expect_item is not True:
+            position += 1
+            skip_space()
+            if position < len(buffer):
+                raise ValueError('extra data after JSON array')
+            return
+        if expect_item is False:
+            if char != ',':
+                raise ValueError(f"expected ',' at offset {position}")
+            position += 1
+            expect_item = True
+            continue
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # A number at the buffer's edge may be cut short; make sure it ended
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+        position = end
+        expect_item = False
+        yield item
+
+
+def _profile_json(path, rules):
+    max_size = rules.get('max_size')
+    if max_size and os.path.getsize(path) > max_size + 4096:  # Ciphertext adds a little overhead
+        raise ValidationError(f'JSON file too large: limit is {max_size / 1024 / 1024:.0f}MB')
+
+    profile = TableProfile(max_columns=rules.get('max_columns'))
+    with open_decrypted(path, 'r', encoding='utf-8-sig') as f:
+        try:
+            for item in _iter_json_array(f):
+                profile.add_row(item if isinstance(item, dict) else {'value': item})
+                _check_rows(profile.rows, rules)
+            not_array = False
+        except _NotAnArray:
+            not_array = True
+        except ValueError as e:
+            raise ValidationError(f'Invalid JSON: {e}')
+
+    if not_array:
+        # Top-level object (bounded by max_size): validate it whole, profile its 'data' list if any
+        with open_decrypted(path, 'r', encoding='utf-8-sig') as f:
+            try:
+                document = json.load(f)
+            except ValueError as e:
+                raise ValidationError(f'Invalid JSON: {e}')
+        rows = document.get('data') if isinstance(document, dict) else None
+        for item in rows if isinstance(rows, list) else [document]:
+            profile.add_row(item if isinstance(item, dict) else {'value': item})
+            _check_rows(profile.rows, rules)
+    return {'tables': {'json': profile.to_dict()}}
+
+
+_PROFILERS = {
+    'csv': _profile_csv,
+    'xlsx': _profile_xlsx,
+    'json': _profile_json,
+}
+
+
+def validate_upload(path, file_ext, file_id=None):
+    """
+    Validate and profile one stored upload (profile saved under `file_id`,
+    default the file's name)
+
+    Returns the profile dict (also written, encrypted, to PROFILE_FOLDER); raises
+    ValidationError if the file breaks its FILE_VALIDATION_RULES.
+    """
+    profiler = _PROFILERS.get(file_ext)
+    if profiler is None:
+        result = {'tables': {}, 'skipped': f'No validation rules for .{file_ext}'}
+    else:
+        try:
+            result = profiler(path, FILE_VALIDATION_RULES.get(file_ext, {}))
+        except UnicodeDecodeError:
+            raise ValidationError('File is not valid UTF-8 text')
+        except csv.Error as e:
+            raise ValidationError(f'Malformed CSV: {e}')
+
+    result['file_id'] = file_id or os.path.basename(path)
+    result['rows'] = sum(table['rows'] for table in result['tables'].values())
+    os.makedirs(PROFILE_FOLDER, exist_ok=True)
+    with open(profile_path(result['file_id']), 'wb') as f:
+        writer = EncryptingWriter.create(f)
+        writer.write(json.dumps(result).encode('utf-8'))
+        writer.close()
+    return result
+
+
+def profile_path(file_id):
+    return os.path.join(PROFILE_FOLDER, f'{file_id}.json')
+
+
+def load_profile(file_id):
+    try:
+        with open_decrypted(profile_path(file_id), 'r') as f:  # Plaintext profiles predate encryption
+            return json.load(f)
+    except FileNotFoundError:
+        return None
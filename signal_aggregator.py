@@ -0,0 +1,134 @@
+"""
+ROUZE SIGNAL AGGREGATOR
+Single-pass engagement metrics and bounded top-K over a signal stream
+
+Exact counts, sums and means are kept for the whole corpus; the top-K
+lists use a size-K min-heap per ranking key, so a pass over n posts
+costs O(n log k) time and O(k) memory.
+"""
+
+import heapq
+
+DEFAULT_TOP_K = 10
+DEFAULT_RANK_BY = ('score', 'comments')
+
+RANKING_KEYS = {
+    'score': lambda signal: signal['score'],
+    'comments': lambda signal: signal['comments'],
+    'engagement': lambda signal: signal['score'] + signal['comments'],
+}
+
+
+class SignalAggregator:
+    """Accumulates metrics for one vertical; partial aggregators can be merged"""
+
+    def __init__(self, top_k=DEFAULT_TOP_K, rank_by=DEFAULT_RANK_BY):
+        unknown = [key for key in rank_by if key not in RANKING_KEYS]
+        if unknown:
+            raise ValueError(f"Unknown ranking key(s): {', '.join(unknown)}. "
+                             f"Use: {', '.join(RANKING_KEYS)}")
+        if top_k < 0:
+            raise ValueError('top_k must be >= 0')
+
+        self.top_k = top_k
+        self.rank_by = tuple(rank_by)
+        self.total_signals = 0   # Every post seen
+        self.count = 0           # Posts with a title (the ones the metrics cover)
+        self.total_score = 0
+        self.total_comments = 0
+        # Heap entries: (rank value, score, comments, title) - fully ordered,
+        # so ties resolve the same way however the corpus was partitioned
+        self._heaps = {key: [] for key in self.rank_by}
+
+    def add(self, signal):
+        self.total_signals += 1
+
+        title = signal['title']
+        if not title:
+            return
+
+        score = signal['score']
+        comments = signal['comments']
+        self.count += 1
+        self.total_score += score
+        self.total_comments += comments
+
+        if not self.top_k:
+            return
+        for key, heap in self._heaps.items():
+            entry = (RANKING_KEYS[key](signal), score, comments, title)
+            if len(heap) < self.top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    def update(self, signals):
+        """Consume an iterable of signal records"""
+        for signal in signals:
+            self.add(signal)
+        return self
+
+    def merge(self, other):
+        """Fold another partial aggregate (same top_k / rank_by) into this one"""
+        if other.top_k != self.top_k or other.rank_by != self.rank_by:
+            raise ValueError('Cannot merge aggregators with different top_k/rank_by')
+
+        self.total_signals += other.total_signals
+        self.count += other.count
+        self.total_score += other.total_score
+        self.total_comments += other.total_comments
+        for key, heap in self._heaps.items():
+            merged = heapq.nlargest(self.top_k, heap + other._heaps[key])
+            heapq.heapify(merged)
+            self._heaps[key] = merged
+        return self
+
+    @property
+    def total_engagement(self):
+        return self.total_score + self.total_comments
+
+    @property
+    def mean_score(self):
+        return self.total_score / self.count if self.count else 0.0
+
+    @property
+    def mean_comments(self):
+        return self.total_comments / self.count if self.count else 0.0
+
+    @property
+    def mean_engagement(self):
+        return self.total_engagement / self.count if self.count else 0.0
+
+    def top(self, key='score'):
+        """Top-K records for a ranking key, best first"""
+        if key not in self._heaps:
+            raise ValueError(f"Aggregator does not rank by '{key}'")
+        return [
+            {'title': title, 'score': score, 'comments': comments}
+            for _, score, comments, title in sorted(self._heaps[key], reverse=True)
+        ]
+
+    def to_dict(self):
+        """JSON-serializable state (used by the checkpoint cache)"""
+        return {
+            'top_k': self.top_k,
+            'rank_by': list(self.rank_by),
+            'total_signals': self.total_signals,
+            'count': self.count,
+            'total_score': self.total_score,
+            'total_comments': self.total_comments,
+            'heaps': {key: [list(entry) for entry in heap] for key, heap in self._heaps.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        aggregator = cls(top_k=state['top_k'], rank_by=tuple(state['rank_by']))
+        aggregator.total_signals = state['total_signals']
+        aggregator.count = state['count']
+        aggregator.total_score = state['total_score']
+        aggregator.total_comments = state['total_comments']
+        for key in aggregator.rank_by:
+            heap = [tuple(entry) for entry in state['heaps'].get(key, [])]
+            heapq.heapify(heap)
+            aggregator._heaps[key] = heap
+        return aggregator
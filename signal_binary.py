@@ -0,0 +1,323 @@
+"""
+ROUZE SIGNAL BINARY CACHE
+Compiles reddit_*.json dumps into a compact binary file that analyses
+open with mmap for zero-copy access
+
+File layout (native little-endian, every section 8-byte aligned):
+
+    header    magic, version, record count, source size + mtime_ns,
+              section count
+    sections  (name, offset, length) table, then the section bytes:
+                score     int64[n]
+                comments  int64[n]
+                created   int64[n]
+                sub_id    uint32[n]     index into the subreddit table
+                id_ix     uint64[n+1]   offsets into the post id heap
+                id        UTF-8 heap
+                title_ix  uint64[n+1]   offsets into the title heap
+                title     UTF-8 heap
+                body_ix   uint64[n+1]
+                body      UTF-8 heap
+                sub_ix    uint64[m+1]   offsets into the subreddit heap
+                sub       UTF-8 heap
+
+Numeric columns are exposed as memoryviews straight over the mapping, so
+opening a cached file costs a header read, and concurrent analysis
+processes share the same page-cache pages. Text is decoded only for
+the fields a caller reads: records(with_body=False), as used by the
+aggregation path, never touches the body heap.
+
+Usage:
+    python3 signal_binary.py                    # compile signals/*.json
+    python3 signal_binary.py signals/reddit_saas_startups.json
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+from signal_reader import detect_format, iter_signals
+
+DEFAULT_BINARY_DIR = '.signal_cache/binary'
+MAGIC = b'RZSIG\x00\x00\x01'
+VERSION = 2
+BUFFER_ROWS = 64 * 1024
+
+_HEADER = struct.Struct('<8sIIQQqI4x')
+_SECTION = struct.Struct('<8sQQ')
+
+# (section name, array typecode or None for raw UTF-8 bytes)
+SECTIONS = (
+    ('score', 'q'),
+    ('comments', 'q'),
+    ('created', 'q'),
+    ('sub_id', 'I'),
+    ('id_ix', 'Q'),
+    ('id', None),
+    ('title_ix', 'Q'),
+    ('title', None),
+    ('body_ix', 'Q'),
+    ('body', None),
+    ('sub_ix', 'Q'),
+    ('sub', None),
+)
+
+
+def binary_path(source, binary_dir=DEFAULT_BINARY_DIR):
+    name = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(binary_dir, f"{name}.sigbin")
+
+
+def _pad(size):
+    return -size % 8
+
+
+class _ColumnSpill:
+    """Buffers one column in a typed array and spills it to a temp file"""
+
+    def __init__(self, typecode, directory):
+        self.typecode = typecode
+        self.buffer = array(typecode) if typecode else bytearray()
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.length = 0
+
+    def append(self, value):
+        if self.typecode:
+            self.buffer.append(value)
+            if len(self.buffer) >= BUFFER_ROWS:
+                self.flush()
+        else:
+            self.buffer += value
+            if len(self.buffer) >= BUFFER_ROWS * 64:
+                self.flush()
+
+    def flush(self):
+        data = self.buffer.tobytes() if self.typecode else bytes(self.buffer)
+        self.file.write(data)
+        self.length += len(data)
+        del self.buffer[:]
+
+
+def compile_signals(source, output=None):
+    """
+    Compile one signal dump into the binary format
+
+    Streams the source once; columns spill to temp files, so memory stays
+    flat apart from the (small) subreddit table. Returns the output path.
+    """
+    if sys.byteorder != 'little':
+        raise RuntimeError('Binary signal cache requires a little-endian host')
+
+    output = output or binary_path(source)
+    directory = os.path.dirname(output) or '.'
+    os.makedirs(directory, exist_ok=True)
+    stat = os.stat(source)
+
+    columns = {name: _ColumnSpill(typecode, directory) for name, typecode in SECTIONS}
+    subreddit_ids = {}
+    id_end = title_end = body_end = 0
+    columns['id_ix'].append(0)
+    columns['title_ix'].append(0)
+    columns['body_ix'].append(0)
+    count = 0
+
+    try:
+        for signal in iter_signals(source):
+            subreddit_id = subreddit_ids.setdefault(signal['subreddit'], len(subreddit_ids))
+            post_id = signal['id'].encode('utf-8')
+            title = signal['title'].encode('utf-8')
+            body = signal['body'].encode('utf-8')
+            id_end += len(post_id)
+            title_end += len(title)
+            body_end += len(body)
+
+            columns['score'].append(signal['score'])
+            columns['comments'].append(signal['comments'])
+            columns['created'].append(signal['created_utc'])
+            columns['sub_id'].append(subreddit_id)
+            columns['id_ix'].append(id_end)
+            columns['id'].append(post_id)
+            columns['title_ix'].append(title_end)
+            columns['title'].append(title)
+            columns['body_ix'].append(body_end)
+            columns['body'].append(body)
+            count += 1
+
+        sub_end = 0
+        columns['sub_ix'].append(0)
+        for subreddit in subreddit_ids:  # dicts keep insertion (= id) order
+            encoded = subreddit.encode('utf-8')
+            sub_end += len(encoded)
+            columns['sub_ix'].append(sub_end)
+            columns['sub'].append(encoded)
+
+        for column in columns.values():
+            column.flush()
+
+        table_size = _HEADER.size + _SECTION.size * len(SECTIONS)
+        offset = table_size + _pad(table_size)
+        entries = []
+        for name, _ in SECTIONS:
+            length = columns[name].length
+            entries.append((name, offset, length))
+            offset += length + _pad(length)
+
+        tmp_path = f"{output}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as out:
+            out.write(_HEADER.pack(MAGIC, VERSION, len(SECTIONS), count,
+                                   stat.st_size, stat.st_mtime_ns, 0))
+            for name, section_offset, length in entries:
+                out.write(_SECTION.pack(name.encode(), section_offset, length))
+            out.write(b'\0' * _pad(table_size))
+            for name, _, length in entries:
+                spill = columns[name].file
+                spill.seek(0)
+                shutil.copyfileobj(spill, out)
+                out.write(b'\0' * _pad(length))
+        os.replace(tmp_path, output)
+    finally:
+        for column in columns.values():
+            column.file.close()
+
+    return output
+
+
+class SignalBinary:
+    """Read-only, memory-mapped view of a compiled signal file"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        (magic, version, n_sections, self.count,
+         self.source_size, self.source_mtime_ns, _) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            view.release()
+            self._mmap.close()
+            raise ValueError(f"Not a v{VERSION} signal binary: {path}")
+
+        typecodes = dict(SECTIONS)
+        self._views = [view]
+        self._sections = {}
+        for i in range(n_sections):
+            raw_name, offset, length = _SECTION.unpack_from(
+                self._mmap, _HEADER.size + i * _SECTION.size)
+            name = raw_name.rstrip(b'\0').decode()
+            section = view[offset:offset + length]
+            if typecodes.get(name):
+                section = section.cast(typecodes[name])
+            self._views.append(section)
+            self._sections[name] = section
+
+        # Zero-copy numeric columns
+        self.score = self._sections['score']
+        self.comments = self._sections['comments']
+        self.created_utc = self._sections['created']
+        self.subreddit_id = self._sections['sub_id']
+        self._subreddits = [self._text('sub', i) for i in range(len(self._sections['sub_ix']) - 1)]
+
+    def is_fresh_for(self, source):
+        """True if compiled from the current version of `source`"""
+        stat = os.stat(source)
+        return stat.st_size == self.source_size and stat.st_mtime_ns == self.source_mtime_ns
+
+    def _text(self, heap, index):
+        offsets = self._sections[f"{heap}_ix"]
+        return bytes(self._sections[heap][offsets[index]:offsets[index + 1]]).decode('utf-8')
+
+    def __len__(self):
+        return self.count
+
+    def post_id(self, index):
+        return self._text('id', index)
+
+    def title(self, index):
+        return self._text('title', index)
+
+    def body(self, index):
+        return self._text('body', index)
+
+    def subreddit(self, index):
+        return self._subreddits[self.subreddit_id[index]]
+
+    def record(self, index, with_body=True):
+        """Row `index` as a normalized signal record ('body' is '' unless with_body)"""
+        return {
+            'id': self.post_id(index),
+            'title': self.title(index),
+            'body': self.body(index) if with_body else '',
+            'subreddit': self.subreddit(index),
+            'score': self.score[index],
+            'comments': self.comments[index],
+            'created_utc': self.created_utc[index],
+        }
+
+    def records(self, with_body=True):
+        for index in range(self.count):
+            yield self.record(index, with_body)
+
+    def __iter__(self):
+        return self.records()
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_binary(source, binary_dir=DEFAULT_BINARY_DIR, compile_missing=True):
+    """
+    Open the compiled form of `source`, (re)compiling it when missing or stale
+
+    Returns None if there is no fresh binary and compile_missing is False.
+    """
+    path = binary_path(source, binary_dir)
+    if os.path.exists(path):
+        try:
+            binary = SignalBinary(path)
+        except (ValueError, struct.error):
+            binary = None
+        if binary is not None:
+            if binary.is_fresh_for(source):
+                return binary
+            binary.close()
+    if not compile_missing:
+        return None
+    return SignalBinary(compile_signals(source, path))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sources = argv or sorted(
+        os.path.join('signals', name) for name in os.listdir('signals')
+        if name.startswith('reddit_') and name.endswith('.json')
+    )
+    failures = 0
+    for source in sources:
+        if detect_format(source) != 'json':
+            print(f"⏭️  Skipping {source} (JSONL files are appended to; analyze them directly)")
+            continue
+        try:
+            output = compile_signals(source)
+            print(f"✅ {source} → {output} ({os.path.getsize(output):,} bytes)")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {source}: {e}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
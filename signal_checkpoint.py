@@ -0,0 +1,156 @@
+"""
+ROUZE SIGNAL CHECKPOINTS
+Persisted per-file partial aggregates so re-analysis only pays for new data
+
+Each entry is keyed by file path and records size, mtime and a content
+hash alongside the file's SignalAggregator state:
+
+    JSON   sha256 of the whole file. An unchanged size/mtime skips the
+           file outright; a touched-but-identical file is re-hashed
+           (a read, not a parse) and still skipped.
+    JSONL  treated as append-only. The checkpoint covers the bytes up to
+           the last complete line (`offset`) and stores a fingerprint of
+           that prefix (sha256 of its first and last 64KB). If the file
+           grew and the fingerprint still matches, only bytes after
+           `offset` are parsed.
+"""
+
+import hashlib
+import json
+import os
+
+from signal_aggregator import SignalAggregator
+from signal_reader import detect_format
+
+DEFAULT_CACHE_PATH = '.signal_cache/checkpoints.json'
+CACHE_VERSION = 1
+FINGERPRINT_BLOCK = 64 * 1024
+HASH_CHUNK = 1024 * 1024
+
+
+def file_sha256(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def prefix_fingerprint(filepath, offset):
+    """sha256 over the first and last FINGERPRINT_BLOCK bytes of [0, offset)"""
+    digest = hashlib.sha256(str(offset).encode())
+    with open(filepath, 'rb') as f:
+        digest.update(f.read(min(offset, FINGERPRINT_BLOCK)))
+        if offset > FINGERPRINT_BLOCK:
+            tail_start = max(FINGERPRINT_BLOCK, offset - FINGERPRINT_BLOCK)
+            f.seek(tail_start)
+            digest.update(f.read(offset - tail_start))
+    return digest.hexdigest()
+
+
+def last_line_end(filepath, start, end):
+    """Offset just past the last newline in [start, end), or start if there is none"""
+    with open(filepath, 'rb') as f:
+        pos = end
+        while pos > start:
+            block_start = max(start, pos - FINGERPRINT_BLOCK)
+            f.seek(block_start)
+            block = f.read(pos - block_start)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                return block_start + newline + 1
+            pos = block_start
+    return start
+
+
+class CheckpointCache:
+    """JSON-file cache of per-file aggregates, written atomically on save()"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self._dirty = False
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self.entries = data.get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable checkpoint cache {path}: {e}")
+
+    @staticmethod
+    def _key(filepath):
+        return os.path.abspath(filepath)
+
+    def resume_point(self, filepath, top_k, rank_by):
+        """
+        Decide how much of a file still needs parsing
+
+        Returns (aggregator, offset):
+            (aggregate, None)   file unchanged - reuse the aggregate as is
+            (aggregate, offset) JSONL grew - parse from offset and merge
+            (None, 0)           no usable checkpoint - parse everything
+        """
+        entry = self.entries.get(self._key(filepath))
+        if (not entry or entry['top_k'] != top_k
+                or tuple(entry['rank_by']) != tuple(rank_by)):
+            return None, 0
+
+        stat = os.stat(filepath)
+        aggregator = SignalAggregator.from_dict(entry['aggregate'])
+
+        if entry['format'] == 'jsonl':
+            offset = entry['offset']
+            if (stat.st_size >= offset
+                    and prefix_fingerprint(filepath, offset) == entry['fingerprint']):
+                return aggregator, offset
+            return None, 0
+
+        if stat.st_size != entry['size']:
+            return None, 0
+        if stat.st_mtime_ns == entry['mtime_ns']:
+            return aggregator, None
+        if file_sha256(filepath) == entry['sha256']:
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self._dirty = True
+            return aggregator, None
+        return None, 0
+
+    def record(self, filepath, aggregator, stat, offset=None):
+        """
+        Store a file's aggregate
+
+        `stat` is the os.stat taken before parsing; `offset` is the end of
+        the covered prefix for JSONL files (None for JSON documents).
+        """
+        fmt = detect_format(filepath)
+        entry = {
+            'format': fmt,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'top_k': aggregator.top_k,
+            'rank_by': list(aggregator.rank_by),
+            'aggregate': aggregator.to_dict(),
+        }
+        if fmt == 'jsonl':
+            entry['offset'] = offset
+            entry['fingerprint'] = prefix_fingerprint(filepath, offset)
+        else:
+            entry['sha256'] = file_sha256(filepath)
+
+        self.entries[self._key(filepath)] = entry
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
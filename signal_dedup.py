@@ -0,0 +1,207 @@
+"""
+ROUZE SIGNAL DEDUPLICATION
+Near-duplicate detection across signal files with MinHash + LSH
+
+The same post shows up in several dumps (healthcare_adverse_events and
+healthcare_market_research, saas_startups and saas_market_analysis)
+and gets crossposted, which inflates engagement totals. Each title is
+reduced to a MinHash signature over character shingles; signatures are
+split into bands and only posts sharing a band bucket are compared, so
+clustering is roughly linear in the number of posts instead of
+quadratic. Candidate pairs are confirmed by estimated Jaccard similarity
+and merged with union-find.
+"""
+
+import random
+import re
+import zlib
+from array import array
+
+from signal_aggregator import SignalAggregator
+from signal_reader import iter_signals
+
+try:
+    import numpy as np
+except ImportError:  # Optional: vectorizes signature computation
+    np = None
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.7
+DEFAULT_SHINGLE_SIZE = 5
+MAX_BUCKET_CANDIDATES = 32   # Cap comparisons per bucket for very common titles
+
+_PRIME = (1 << 31) - 1       # Keeps a * hash + b below 2**63 for the numpy path
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_title(title):
+    return _NON_WORD.sub(' ', title.lower()).strip()
+
+
+def shingles(text, size=DEFAULT_SHINGLE_SIZE):
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class NearDuplicateDetector:
+    """Incrementally clusters titles; add() returns the post's index"""
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                 threshold=DEFAULT_THRESHOLD, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._np_a = np.array(self._a, dtype=np.uint64)
+            self._np_b = np.array(self._b, dtype=np.uint64)
+
+        self._signatures = array('I')      # num_perm values per post, flattened
+        self._parent = array('I')          # union-find forest
+        self._exact = {}                   # normalized title -> first post index
+        self._buckets = [{} for _ in range(bands)]
+
+    def __len__(self):
+        return len(self._parent)
+
+    def signature(self, text):
+        hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(text, self.shingle_size)]
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)[:, None]
+            return ((values * self._np_a + self._np_b) % _PRIME).min(axis=0).tolist()
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in zip(self._a, self._b)]
+
+    def _find(self, index):
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def _union(self, left, right):
+        left, right = self._find(left), self._find(right)
+        if left != right:
+            # Lower index wins so the root is always the earliest post
+            self._parent[max(left, right)] = min(left, right)
+
+    def similarity(self, left, right):
+        """Estimated Jaccard similarity from two stored signatures"""
+        n = self.num_perm
+        a = self._signatures[left * n:(left + 1) * n]
+        b = self._signatures[right * n:(right + 1) * n]
+        return sum(x == y for x, y in zip(a, b)) / n
+
+    def add(self, title):
+        index = len(self._parent)
+        self._parent.append(index)
+        text = normalize_title(title)
+
+        exact = self._exact.get(text)
+        if exact is not None:
+            # Identical titles: reuse the signature, skip LSH entirely
+            n = self.num_perm
+            self._signatures.extend(self._signatures[exact * n:(exact + 1) * n])
+            self._union(exact, index)
+            return index
+        self._exact[text] = index
+
+        signature = self.signature(text)
+        self._signatures.extend(signature)
+
+        candidates = set()
+        for band, buckets in enumerate(self._buckets):
+            key = tuple(signature[band * self.rows:(band + 1) * self.rows])
+            members = buckets.setdefault(key, [])
+            candidates.update(members)
+            if len(members) < MAX_BUCKET_CANDIDATES:
+                members.append(index)
+
+        for candidate in candidates:
+            if self._find(candidate) != self._find(index) and \
+                    self.similarity(candidate, index) >= self.threshold:
+                self._union(candidate, index)
+        return index
+
+    def cluster_ids(self):
+        """Cluster id (index of the earliest member) for every post"""
+        return [self._find(index) for index in range(len(self._parent))]
+
+
+def deduplicate(sources, top_k=10, **detector_options):
+    """
+    Cluster near-duplicate posts across several signal files
+
+    `sources` is an ordered {label: filepath}. Returns a dict with raw and
+    deduplicated SignalAggregators for the whole corpus and per label, the
+    near-duplicate clusters, and how many clusters each pair of labels
+    shares (the cross-vertical overlap).
+    """
+    detector = NearDuplicateDetector(**detector_options)
+    labels, posts = [], []
+    label_names = list(sources)
+    raw = {label: SignalAggregator(top_k=top_k) for label in label_names}
+
+    for label_id, (label, filepath) in enumerate(sources.items()):
+        for signal in iter_signals(filepath):
+            raw[label].add(signal)
+            if not signal['title']:
+                continue
+            detector.add(signal['title'])
+            labels.append(label_id)
+            posts.append((signal['score'], signal['comments'], signal['title']))
+
+    cluster_ids = detector.cluster_ids()
+    members = {}
+    for index, cluster_id in enumerate(cluster_ids):
+        members.setdefault(cluster_id, []).append(index)
+
+    def best(indexes):
+        # Representative = highest-engagement copy (earliest on ties)
+        return max(indexes, key=lambda i: (posts[i][0] + posts[i][1], -i))
+
+    def as_signal(index):
+        score, comments, title = posts[index]
+        return {'title': title, 'score': score, 'comments': comments}
+
+    corpus = SignalAggregator(top_k=top_k)
+    per_label = {label: SignalAggregator(top_k=top_k) for label in label_names}
+    overlaps = {}
+    clusters = []
+
+    for cluster in members.values():
+        corpus.add(as_signal(best(cluster)))
+        by_label = {}
+        for index in cluster:
+            by_label.setdefault(labels[index], []).append(index)
+        for label_id, indexes in by_label.items():
+            per_label[label_names[label_id]].add(as_signal(best(indexes)))
+
+        if len(cluster) > 1:
+            clusters.append([posts[i][2] for i in cluster])
+            present = sorted(by_label)
+            for i, left in enumerate(present):
+                for right in present[i + 1:]:
+                    pair = (label_names[left], label_names[right])
+                    overlaps[pair] = overlaps.get(pair, 0) + 1
+
+    raw_corpus = SignalAggregator(top_k=top_k)
+    for aggregator in raw.values():
+        raw_corpus.merge(aggregator)
+
+    return {
+        'raw': raw_corpus,
+        'deduplicated': corpus,
+        'raw_by_label': raw,
+        'deduplicated_by_label': per_label,
+        'clusters': clusters,
+        'overlaps': overlaps,
+    }
@@ -0,0 +1,137 @@
+"""
+ROUZE SIGNAL ENGINE
+Fans signal files (and byte-range chunks of large JSONL files) out
+across a process pool and merges the partial aggregates
+
+Partials are merged in task order, and SignalAggregator ties resolve on
+the full record, so the result is identical for any worker count.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from signal_aggregator import DEFAULT_RANK_BY, DEFAULT_TOP_K, SignalAggregator
+from signal_binary import open_binary
+from signal_checkpoint import last_line_end
+from signal_reader import detect_format, iter_signal_range, iter_signals
+
+DEFAULT_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+def chunk_ranges(filepath, start, end, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Cut the JSONL byte range [start, end) into (filepath, start, end) tasks"""
+    return [(filepath, offset, min(offset + chunk_bytes, end))
+            for offset in range(start, end, chunk_bytes)]
+
+
+def run_task(task, top_k=DEFAULT_TOP_K, rank_by=DEFAULT_RANK_BY, binary_dir=None):
+    """
+    Aggregate a single task; module-level so worker processes can import it
+
+    With binary_dir set, whole JSON documents are read through the
+    memory-mapped binary cache (compiled on first use) instead of parsed.
+    """
+    filepath, start, end = task
+    aggregator = SignalAggregator(top_k=top_k, rank_by=rank_by)
+    if end is not None:
+        return aggregator.update(iter_signal_range(filepath, start, end))
+    if binary_dir:
+        with open_binary(filepath, binary_dir) as binary:
+            return aggregator.update(binary.records(with_body=False))  # Aggregates never read the body
+    return aggregator.update(iter_signals(filepath))
+
+
+def _run_task_safely(args):
+    task, top_k, rank_by, binary_dir = args
+    try:
+        return run_task(task, top_k, rank_by, binary_dir)
+    except Exception as e:
+        return e
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def analyze_files(filepaths, workers=None, top_k=DEFAULT_TOP_K, rank_by=DEFAULT_RANK_BY,
+                  chunk_bytes=DEFAULT_CHUNK_BYTES, cache=None, binary_dir=None):
+    """
+    Aggregate each file in parallel
+
+    JSONL files larger than chunk_bytes are cut into byte ranges; JSON
+    documents have no cheap record boundaries and stay one task each.
+    With a CheckpointCache, unchanged files are not parsed at all and
+    grown JSONL files are parsed from their last checkpoint; the cache
+    is updated but not saved (call cache.save()). With binary_dir, JSON
+    documents are read through the mmap binary cache (see signal_binary).
+
+    Returns {filepath: SignalAggregator or the Exception raised while
+    parsing it}. Missing files are left out; callers report them.
+    """
+    filepaths = [path for path in dict.fromkeys(filepaths) if os.path.exists(path)]
+
+    results = {}
+    stats = {}
+    committed_ends = {}
+    tasks = []
+    committed = []  # Per task: does it fall inside the prefix the checkpoint covers?
+    to_record = []
+
+    for filepath in filepaths:
+        stat = stats[filepath] = os.stat(filepath)
+        base, offset = cache.resume_point(filepath, top_k, rank_by) if cache else (None, 0)
+        if base is None:
+            base = SignalAggregator(top_k=top_k, rank_by=rank_by)
+            offset = 0
+        elif offset is None:
+            results[filepath] = base
+            continue  # Unchanged since the checkpoint
+        results[filepath] = base
+
+        if detect_format(filepath) != 'jsonl':
+            tasks.append((filepath, 0, None))
+            committed.append(True)
+            to_record.append(filepath)
+            continue
+
+        # Checkpoints only cover complete lines; a partially written last
+        # line is parsed for this run but re-read next time
+        end = last_line_end(filepath, offset, stat.st_size) if cache else stat.st_size
+        committed_ends[filepath] = end
+        if end > offset or not offset:
+            to_record.append(filepath)
+        for task in chunk_ranges(filepath, offset, end, chunk_bytes):
+            tasks.append(task)
+            committed.append(True)
+        if end < stat.st_size:
+            tasks.append((filepath, end, stat.st_size))
+            committed.append(False)
+
+    workers = min(workers or default_workers(), len(tasks)) or 1
+    jobs = [(task, top_k, rank_by, binary_dir) for task in tasks]
+    if workers == 1:
+        partials = [_run_task_safely(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_run_task_safely, jobs))
+
+    failed = set()
+    for (filepath, _, _), partial, task_committed in zip(tasks, partials, committed):
+        if isinstance(partial, Exception) and filepath not in failed:
+            if not task_committed:
+                continue  # A line still being written; picked up once it is complete
+            failed.add(filepath)
+            results[filepath] = partial
+
+    # Checkpoint the committed prefix first, then fold in uncommitted tails
+    for is_committed in (True, False):
+        for (filepath, _, _), partial, task_committed in zip(tasks, partials, committed):
+            if (task_committed == is_committed and filepath not in failed
+                    and not isinstance(partial, Exception)):
+                results[filepath].merge(partial)
+        if is_committed and cache:
+            for filepath in to_record:
+                if filepath not in failed:
+                    cache.record(filepath, results[filepath], stats[filepath],
+                                 committed_ends.get(filepath))
+    return results
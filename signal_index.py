@@ -0,0 +1,332 @@
+"""
+ROUZE SIGNAL INDEX
+On-disk inverted index over signal titles and bodies (SQLite)
+
+Query syntax:
+    fda recall               both terms (implicit AND)
+    churn OR cancel          either term
+    "shopify fees" AND app   phrase plus term
+AND binds tighter than OR; terms are case-insensitive. Results can be
+restricted to a vertical and/or subreddit and come back highest score
+first.
+
+The index updates incrementally: unchanged files are skipped, grown
+JSONL files are indexed from their last offset, and anything else that
+changed is re-indexed from scratch.
+
+Usage:
+    python3 signal_index.py build [FILE ...]
+    python3 signal_index.py search '"shopify fees" OR chargeback' --vertical ecommerce
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from array import array
+
+from signal_checkpoint import last_line_end, prefix_fingerprint
+from signal_reader import detect_format, iter_signal_range, iter_signals, vertical_of
+
+DEFAULT_INDEX_PATH = '.signal_cache/signal_index.db'
+BATCH_SIZE = 2000
+BODY_POSITION_GAP = 1 << 20  # Body positions start here so phrases never span title->body
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    vertical TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    indexed_offset INTEGER,
+    fingerprint TEXT
+);
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    vertical TEXT NOT NULL,
+    subreddit TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    created_utc INTEGER NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_path ON docs(path);
+CREATE INDEX IF NOT EXISTS docs_vertical_score ON docs(vertical, score);
+CREATE INDEX IF NOT EXISTS docs_subreddit_score ON docs(subreddit, score);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings(doc_id);
+"""
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def _term_positions(signal):
+    """{term: array of positions} over title then body"""
+    positions = {}
+    for position, term in enumerate(tokenize(signal['title'])):
+        positions.setdefault(term, array('I')).append(position)
+    for position, term in enumerate(tokenize(signal['body']), BODY_POSITION_GAP):
+        positions.setdefault(term, array('I')).append(position)
+    return positions
+
+
+def parse_query(query):
+    """
+    Parse into OR-groups of AND-clauses; each clause is a tuple of terms
+    (one term, or several for a phrase)
+    """
+    groups = [[]]
+    for phrase, word in _QUERY_TOKEN.findall(query):
+        if word == 'OR':
+            groups.append([])
+            continue
+        if word == 'AND':
+            continue
+        terms = tuple(tokenize(phrase if phrase else word))
+        if terms:
+            groups[-1].append(terms)
+    return [group for group in groups if group]
+
+
+class SignalIndex:
+    """Inverted index stored in a single SQLite file"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- indexing ------------------------------------------------------
+
+    def _remove_file(self, filepath):
+        self.conn.execute(
+            'DELETE FROM postings WHERE doc_id IN (SELECT doc_id FROM docs WHERE path = ?)',
+            (filepath,))
+        self.conn.execute('DELETE FROM docs WHERE path = ?', (filepath,))
+        self.conn.execute('DELETE FROM files WHERE path = ?', (filepath,))
+
+    def _add_signals(self, filepath, vertical, signals):
+        count = 0
+        docs, postings = [], []
+        next_id = self.conn.execute('SELECT COALESCE(MAX(doc_id), 0) + 1 FROM docs').fetchone()[0]
+
+        def flush():
+            self.conn.executemany('INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?, ?, ?)', docs)
+            self.conn.executemany('INSERT INTO postings VALUES (?, ?, ?)', postings)
+            docs.clear()
+            postings.clear()
+
+        for signal in signals:
+            doc_id = next_id + count
+            count += 1
+            docs.append((doc_id, filepath, vertical, signal['subreddit'], signal['score'],
+                         signal['comments'], signal['created_utc'], signal['title']))
+            for term, positions in _term_positions(signal).items():
+                postings.append((term, doc_id, positions.tobytes()))
+            if len(docs) >= BATCH_SIZE:
+                flush()
+        flush()
+        return count
+
+    def update_file(self, filepath):
+        """Bring one file's postings up to date; returns the number of posts indexed"""
+        stat = os.stat(filepath)
+        row = self.conn.execute(
+            'SELECT size, mtime_ns, indexed_offset, fingerprint FROM files WHERE path = ?',
+            (filepath,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return 0
+
+        vertical = vertical_of(filepath)
+        is_jsonl = detect_format(filepath) == 'jsonl'
+        start = 0
+        if (row and is_jsonl and row[2] is not None and stat.st_size >= row[2]
+                and prefix_fingerprint(filepath, row[2]) == row[3]):
+            start = row[2]  # Append-only growth: index just the new lines
+
+        with self.conn:
+            if not start:
+                self._remove_file(filepath)
+            if is_jsonl:
+                end = last_line_end(filepath, start, stat.st_size)
+                added = self._add_signals(filepath, vertical, iter_signal_range(filepath, start, end))
+                fingerprint = prefix_fingerprint(filepath, end)
+            else:
+                end, fingerprint = None, None
+                added = self._add_signals(filepath, vertical, iter_signals(filepath))
+            self.conn.execute(
+                'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)',
+                (filepath, vertical, stat.st_size, stat.st_mtime_ns, end, fingerprint))
+        return added
+
+    def update(self, filepaths):
+        """Index new/changed files and drop files that no longer exist"""
+        filepaths = list(filepaths)
+        results = {}
+        for filepath in filepaths:
+            try:
+                results[filepath] = self.update_file(filepath)
+            except Exception as e:  # One bad dump should not block the rest
+                results[filepath] = e
+        known = [path for (path,) in self.conn.execute('SELECT path FROM files')]
+        with self.conn:
+            for path in known:
+                if path not in filepaths and not os.path.exists(path):
+                    self._remove_file(path)
+        return results
+
+    # ---- querying ------------------------------------------------------
+
+    def _docs_with(self, term):
+        return {doc_id for (doc_id,) in self.conn.execute(
+            'SELECT doc_id FROM postings WHERE term = ?', (term,))}
+
+    def _load_hits(self, doc_ids):
+        """Fill the temp `hits` table with `doc_ids` (for joins and IN lookups)"""
+        self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS hits (doc_id INTEGER PRIMARY KEY)')
+        self.conn.execute('DELETE FROM hits')
+        self.conn.executemany('INSERT INTO hits VALUES (?)', ((doc_id,) for doc_id in doc_ids))
+
+    def _phrase_docs(self, terms, candidates):
+        """Docs in `candidates` where `terms` appear at consecutive positions"""
+        # One query per distinct term over all candidates, not one per (term, doc)
+        self._load_hits(candidates)
+        positions_by_term = {}
+        for term in set(terms):
+            positions_by_term[term] = {
+                doc_id: blob for doc_id, blob in self.conn.execute(
+                    'SELECT doc_id, positions FROM postings '
+                    'WHERE term = ? AND doc_id IN (SELECT doc_id FROM hits)', (term,))}
+
+        matches = set()
+        for doc_id in candidates:
+            starts = set(array('I', positions_by_term[terms[0]][doc_id]))
+            for offset, term in enumerate(terms[1:], 1):
+                positions = set(array('I', positions_by_term[term][doc_id]))
+                starts = {p for p in starts if p + offset in positions}
+                if not starts:
+                    break
+            if starts:
+                matches.add(doc_id)
+        return matches
+
+    def _clause_docs(self, clause):
+        # Intersect rarest-first so the working set shrinks fast
+        term_docs = sorted((self._docs_with(term) for term in set(clause)), key=len)
+        docs = term_docs[0]
+        for other in term_docs[1:]:
+            docs &= other
+        if len(clause) > 1 and docs:
+            docs = self._phrase_docs(clause, docs)
+        return docs
+
+    def matching_docs(self, query):
+        result = set()
+        for group in parse_query(query):
+            docs = None
+            for clause in sorted(group, key=len, reverse=True):
+                clause_docs = self._clause_docs(clause)
+                docs = clause_docs if docs is None else docs & clause_docs
+                if not docs:
+                    break
+            result |= docs or set()
+        return result
+
+    def search(self, query, vertical=None, subreddit=None, limit=20):
+        """Matching posts as dicts, highest score first"""
+        doc_ids = self.matching_docs(query)
+        if not doc_ids:
+            return []
+
+        self._load_hits(doc_ids)
+
+        sql = ('SELECT d.vertical, d.subreddit, d.score, d.comments, d.created_utc, d.title, d.path '
+               'FROM hits h JOIN docs d ON d.doc_id = h.doc_id WHERE 1 = 1')
+        params = []
+        if vertical:
+            sql += ' AND d.vertical = ?'
+            params.append(vertical)
+        if subreddit:
+            sql += ' AND d.subreddit = ?'
+            params.append(subreddit)
+        sql += ' ORDER BY d.score DESC, d.doc_id LIMIT ?'
+        params.append(limit)
+
+        columns = ('vertical', 'subreddit', 'score', 'comments', 'created_utc', 'title', 'path')
+        return [dict(zip(columns, row)) for row in self.conn.execute(sql, params)]
+
+
+def default_signal_files(directory='signals'):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(('.json', '.jsonl', '.ndjson'))
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ROUZE signal keyword index')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Index new or changed signal files')
+    build.add_argument('files', nargs='*', help='Signal files (default: everything in signals/)')
+
+    search = commands.add_parser('search', help='Query the index')
+    search.add_argument('query')
+    search.add_argument('--vertical')
+    search.add_argument('--subreddit')
+    search.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args(argv)
+
+    with SignalIndex(args.index) as index:
+        if args.command == 'build':
+            for filepath, result in index.update(args.files or default_signal_files()).items():
+                if isinstance(result, Exception):
+                    print(f"❌ {filepath}: {result}")
+                else:
+                    print(f"✅ {filepath}: {result} new posts indexed")
+            return 0
+
+        started = time.perf_counter()
+        hits = index.search(args.query, vertical=args.vertical,
+                            subreddit=args.subreddit, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"🔎 {len(hits)} result(s) for {args.query!r} in {elapsed_ms:.1f} ms")
+        for i, hit in enumerate(hits, 1):
+            print(f"   {i}. [{hit['score']} upvotes] ({hit['vertical']}/r/{hit['subreddit']}) "
+                  f"{hit['title'][:70]}")
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
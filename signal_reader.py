@@ -0,0 +1,245 @@
+"""
+ROUZE SIGNAL READER
+Streaming, constant-memory reader for Reddit signal dumps
+
+Supported layouts:
+    [ {post}, {post}, ... ]                                  bare list
+    { "data": [ {post}, ... ] }                              data list
+    { "data": { "children": [ {"data": {post}}, ... ] } }    Reddit listing
+    one JSON post (or listing child) per line                JSONL
+"""
+
+import json
+import os
+import re
+
+CHUNK_SIZE = 64 * 1024
+MAX_RECORD_SIZE = 64 * 1024 * 1024  # Give up on a single element larger than this
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _JSONStream:
+    """Incremental cursor over a text file that decodes one JSON value at a time"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size=None):
+        """Drop the consumed prefix and append the next chunk; False at EOF"""
+        if self._eof:
+            return False
+        chunk = self._f.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, msg):
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self):
+        """Next non-whitespace character, or '' at EOF"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise self._error(f"Expecting '{ch}'")
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input as needed"""
+        if not self.peek():
+            raise self._error('Expecting value')
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                pending = len(self._buf) - self._pos
+                if pending > MAX_RECORD_SIZE or not self._fill(max(pending, self._chunk_size)):
+                    raise
+                continue
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+    def array_items(self):
+        """Yield the elements of the array at the cursor one by one"""
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            ch = self.peek()
+            self._pos += 1
+            if ch == ']':
+                return
+            if ch != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def object_keys(self):
+        """Yield the keys of the object at the cursor; the caller consumes each value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            ch = self.peek()
+            self._pos += 1
+            if ch == '}':
+                return
+            if ch != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+
+def _iter_json_items(f):
+    """Yield raw post objects from any of the three JSON layouts"""
+    stream = _JSONStream(f)
+    ch = stream.peek()
+
+    if ch == '[':
+        yield from stream.array_items()
+        return
+    if ch != '{':
+        stream.value()  # Scalar document (or raises on empty/invalid input)
+        return
+
+    for key in stream.object_keys():
+        if key != 'data':
+            stream.value()
+            continue
+
+        inner = stream.peek()
+        if inner == '[':
+            yield from stream.array_items()
+        elif inner == '{':
+            for inner_key in stream.object_keys():
+                if inner_key == 'children' and stream.peek() == '[':
+                    for child in stream.array_items():
+                        yield child.get('data', {}) if isinstance(child, dict) else child
+                else:
+                    stream.value()
+        else:
+            stream.value()
+
+
+def _iter_jsonl_items(f):
+    """Yield raw post objects from a JSONL file, unwrapping listing children"""
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        yield _unwrap_child(json.loads(line))
+
+
+def _unwrap_child(item):
+    """JSONL exports may hold whole listing children ({"kind": .., "data": {post}})"""
+    if isinstance(item, dict) and 'kind' in item and isinstance(item.get('data'), dict):
+        return item['data']
+    return item
+
+
+def _to_int(value):
+    """Coerce score/comment/timestamp fields from messy dumps to int"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(float(value))
+        except ValueError:
+            return 0
+    if isinstance(value, (list, tuple)):
+        return len(value)  # Some exports embed the comment list itself
+    return 0
+
+
+def normalize_signal(item):
+    """Map a raw Reddit post to the flat signal record used by the analyses"""
+    return {
+        'id': str(item.get('id') or item.get('name') or ''),
+        'title': item.get('title') or '',
+        'body': item.get('selftext', item.get('body', '')) or '',
+        'subreddit': item.get('subreddit') or '',
+        'score': _to_int(item.get('score', 0)),
+        'comments': _to_int(item.get('comments', item.get('num_comments', 0))),
+        'created_utc': _to_int(item.get('created_utc', item.get('created', 0))),
+    }
+
+
+def vertical_of(filepath):
+    """reddit_healthcare_adverse_events.json -> healthcare"""
+    name = os.path.splitext(os.path.basename(filepath))[0]
+    if name.startswith('reddit_'):
+        name = name[len('reddit_'):]
+    return name.split('_', 1)[0] or 'unknown'
+
+
+def detect_format(filepath):
+    """'jsonl' for line-delimited files, 'json' otherwise"""
+    return 'jsonl' if filepath.lower().endswith(JSONL_EXTENSIONS) else 'json'
+
+
+def iter_signals(filepath, fmt='auto'):
+    """
+    Yield one normalized signal record at a time
+
+    Memory stays bounded by the largest single post, not the file size.
+    Non-object items are skipped. Raises json.JSONDecodeError on invalid input.
+    """
+    if fmt == 'auto':
+        fmt = detect_format(filepath)
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        items = _iter_jsonl_items(f) if fmt == 'jsonl' else _iter_json_items(f)
+        for item in items:
+            if isinstance(item, dict):
+                yield normalize_signal(item)
+
+
+
+def iter_signal_range(filepath, start, end):
+    """
+    Yield records for the JSONL lines that start inside the byte range [start, end)
+
+    Adjacent ranges partition a file exactly, so chunks can be parsed
+    independently (e.g. in separate processes) without splitting a line.
+    """
+    with open(filepath, 'rb') as f:
+        if start > 0:
+            # Skip the tail of a line owned by the previous range; when the
+            # byte before start is a newline this consumes just that byte
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            item = _unwrap_child(json.loads(line))
+            if isinstance(item, dict):
+                yield normalize_signal(item)
@@ -0,0 +1,225 @@
+"""
+ROUZE SIGNAL STORE
+Compact columnar, array-backed storage for a vertical's signals
+
+Each post costs three int64 columns (score, comments, created_utc), a
+uint32 subreddit id and a UTF-8 slice of the title heap - roughly
+40 bytes plus the title text, versus ~700 bytes for a dict record.
+Statistics run over whole columns: the arrays are viewed zero-copy as
+numpy arrays and computed vectorized (numpy is in requirements.txt).
+Without numpy, C-level builtins (sum/sorted) over the typed arrays give
+the same results more slowly.
+"""
+
+import heapq
+import math
+import sys
+from array import array
+
+from signal_reader import iter_signals
+
+try:
+    import numpy as np
+except ImportError:  # Listed in requirements.txt; the pure-Python fallback is only slower
+    np = None
+
+NUMERIC_COLUMNS = ('score', 'comments', 'created_utc')
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+class StringTable:
+    """Interned strings for low-cardinality fields (subreddits): stored once, referenced by id"""
+
+    def __init__(self):
+        self._ids = {}
+        self.values = []
+
+    def intern(self, value):
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self.values)
+            self._ids[value] = string_id
+            self.values.append(value)
+        return string_id
+
+    def id_of(self, value):
+        return self._ids.get(value)
+
+    def __getitem__(self, string_id):
+        return self.values[string_id]
+
+    def __len__(self):
+        return len(self.values)
+
+    def nbytes(self):
+        return (sys.getsizeof(self._ids) + sys.getsizeof(self.values)
+                + sum(sys.getsizeof(value) for value in self.values))
+
+
+class StringHeap:
+    """Append-only UTF-8 heap with an offset index, for high-cardinality text (titles)"""
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+
+    def append(self, value):
+        self._data += value.encode('utf-8')
+        self._offsets.append(len(self._data))
+        return len(self._offsets) - 2
+
+    def __getitem__(self, index):
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def nbytes(self):
+        return len(self._data) + self._offsets.itemsize * len(self._offsets)
+
+
+def _percentile(sorted_values, q):
+    """Linear interpolation between closest ranks (numpy's default method)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+class SignalStore:
+    """Columnar signal table: one typed array per field, row i = post i"""
+
+    def __init__(self):
+        self.score = array('q')
+        self.comments = array('q')
+        self.created_utc = array('q')
+        self.subreddit_id = array('I')
+        self.titles = StringHeap()
+        self.subreddits = StringTable()
+
+    @classmethod
+    def from_signals(cls, signals):
+        store = cls()
+        for signal in signals:
+            store.append(signal)
+        return store
+
+    @classmethod
+    def from_files(cls, filepaths):
+        """Load one or more signal files (e.g. a whole vertical) into a single store"""
+        store = cls()
+        for filepath in filepaths:
+            for signal in iter_signals(filepath):
+                store.append(signal)
+        return store
+
+    def append(self, signal):
+        self.score.append(signal['score'])
+        self.comments.append(signal['comments'])
+        self.created_utc.append(signal['created_utc'])
+        self.subreddit_id.append(self.subreddits.intern(signal['subreddit']))
+        self.titles.append(signal['title'])
+
+    def __len__(self):
+        return len(self.score)
+
+    def record(self, index):
+        """Materialize row `index` as a signal dict (for display only)"""
+        return {
+            'title': self.titles[index],
+            'subreddit': self.subreddits[self.subreddit_id[index]],
+            'score': self.score[index],
+            'comments': self.comments[index],
+            'created_utc': self.created_utc[index],
+        }
+
+    def nbytes(self):
+        """Approximate memory held by the store"""
+        columns = (self.score, self.comments, self.created_utc, self.subreddit_id)
+        return (sum(column.itemsize * len(column) for column in columns)
+                + self.titles.nbytes() + self.subreddits.nbytes())
+
+    # ---- statistics ----------------------------------------------------
+
+    def column(self, name):
+        """A numeric column; a zero-copy numpy view when numpy is available"""
+        if name not in NUMERIC_COLUMNS:
+            raise ValueError(f"Unknown column '{name}'. Use: {', '.join(NUMERIC_COLUMNS)}")
+        values = getattr(self, name)
+        if np is not None:
+            return np.frombuffer(values, dtype=np.int64) if len(values) else np.zeros(0, np.int64)
+        return values
+
+    def total(self, name):
+        return int(self.column(name).sum()) if np is not None else sum(self.column(name))
+
+    def mean(self, name):
+        return self.total(name) / len(self) if len(self) else 0.0
+
+    def percentiles(self, name, qs=DEFAULT_PERCENTILES):
+        """{q: value} using linear interpolation"""
+        if not len(self):
+            return {q: 0.0 for q in qs}
+        if np is not None:
+            values = np.percentile(self.column(name), qs)
+            return {q: float(value) for q, value in zip(qs, values)}
+        ordered = sorted(self.column(name))
+        return {q: float(_percentile(ordered, q)) for q in qs}
+
+    def engagement_ratio(self):
+        """Comments per upvote across the store (how discussion-heavy the demand is)"""
+        score = self.total('score')
+        return self.total('comments') / score if score else 0.0
+
+    def summary(self, qs=DEFAULT_PERCENTILES):
+        return {
+            'count': len(self),
+            'mean_score': self.mean('score'),
+            'mean_comments': self.mean('comments'),
+            'total_engagement': self.total('score') + self.total('comments'),
+            'engagement_ratio': self.engagement_ratio(),
+            'score_percentiles': self.percentiles('score', qs),
+            'comments_percentiles': self.percentiles('comments', qs),
+        }
+
+    def by_subreddit(self):
+        """Group-by subreddit: count, means, total engagement and comments-per-upvote"""
+        groups = len(self.subreddits)
+        if np is not None and len(self):
+            ids = np.frombuffer(self.subreddit_id, dtype=np.uint32)
+            counts = np.bincount(ids, minlength=groups).tolist()
+            scores = np.bincount(ids, weights=self.column('score'), minlength=groups).tolist()
+            comments = np.bincount(ids, weights=self.column('comments'), minlength=groups).tolist()
+        else:
+            counts, scores, comments = [0] * groups, [0] * groups, [0] * groups
+            for subreddit_id, score, n_comments in zip(self.subreddit_id, self.score, self.comments):
+                counts[subreddit_id] += 1
+                scores[subreddit_id] += score
+                comments[subreddit_id] += n_comments
+
+        result = {}
+        for subreddit_id, count in enumerate(counts):
+            if not count:
+                continue
+            score, n_comments = int(scores[subreddit_id]), int(comments[subreddit_id])
+            result[self.subreddits[subreddit_id]] = {
+                'count': count,
+                'mean_score': score / count,
+                'mean_comments': n_comments / count,
+                'total_engagement': score + n_comments,
+                'engagement_ratio': n_comments / score if score else 0.0,
+            }
+        return result
+
+    def top(self, name='score', k=10):
+        """Row indexes of the k largest values in a column, best first"""
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        values = self.column(name)
+        if np is not None:
+            candidates = np.argpartition(values, len(values) - k)[-k:]
+            return sorted(candidates.tolist(), key=lambda i: (values[i], -i), reverse=True)
+        return heapq.nlargest(k, range(len(values)), key=values.__getitem__)
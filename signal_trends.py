@@ -0,0 +1,363 @@
+"""
+ROUZE TRENDING DEMAND DETECTOR
+Single-pass, bounded-memory trend detection over created_utc-ordered signals
+
+Per vertical it keeps:
+    • sliding time buckets (posts and engagement per bucket) over a window
+    • exponentially decayed post / engagement / keyword counters at two
+      half-lives (fast ≈ days, slow ≈ a month)
+
+A topic is "accelerating" when its fast rate runs well ahead of its slow
+rate (fast/slow ratio ≥ --acceleration) with enough recent support.
+Both counters start equal, so every ratio reads fast/slow half-life
+until the slow counter has about one slow half-life of history; until
+then nothing is flagged and the acceleration figures are withheld.
+Keyword tables are capped; the least active keywords are evicted, so
+memory does not grow with the corpus. State is saved to JSON, so new
+batches can be appended later without recomputing the history.
+
+Usage:
+    python3 signal_trends.py signals/*.jsonl
+    python3 signal_trends.py --state .signal_cache/trends.json new_batch.jsonl
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import re
+import sys
+from collections import deque
+
+from signal_reader import iter_signals, vertical_of
+
+DEFAULT_STATE_PATH = '.signal_cache/trends.json'
+DAY = 86400
+DEFAULT_BUCKET_SECONDS = DAY
+DEFAULT_WINDOW_BUCKETS = 28
+DEFAULT_FAST_HALF_LIFE = 3 * DAY
+DEFAULT_SLOW_HALF_LIFE = 30 * DAY
+DEFAULT_MAX_KEYWORDS = 5000
+DEFAULT_MIN_SUPPORT = 5.0
+DEFAULT_ACCELERATION = 2.0
+STATE_VERSION = 1
+
+_WORD = re.compile(r"[a-z][a-z0-9']+")
+STOPWORDS = frozenset("""
+a about after all also am an and any are as at be been but by can could did do does for
+from get got had has have how i if in into is it its just like me more most my new no not
+now of on one or our out so some than that the their them then there these they this to
+up us was we what when which who why will with would you your
+""".split())
+
+
+def keywords(title):
+    """Unigrams and adjacent bigrams (e.g. 'shopify fees') minus stopwords"""
+    words = [word for word in _WORD.findall(title.lower()) if word not in STOPWORDS]
+    return set(words) | {f"{left} {right}" for left, right in zip(words, words[1:])}
+
+
+class _Decayed:
+    """Exponentially decayed counter at two rates, decayed lazily on access"""
+
+    __slots__ = ('fast', 'slow', 'updated')
+
+    def __init__(self, fast=0.0, slow=0.0, updated=0):
+        self.fast = fast
+        self.slow = slow
+        self.updated = updated
+
+    def decay_to(self, now, fast_lambda, slow_lambda):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.fast *= math.exp(-fast_lambda * elapsed)
+            self.slow *= math.exp(-slow_lambda * elapsed)
+            self.updated = now
+
+    def add(self, now, amount, fast_lambda, slow_lambda):
+        self.decay_to(now, fast_lambda, slow_lambda)
+        self.fast += amount
+        self.slow += amount
+
+    def to_list(self):
+        return [self.fast, self.slow, self.updated]
+
+
+def _post_key(signal):
+    """Identity used to recognise a post seen in an earlier batch"""
+    return signal.get('id') or signal['title']
+
+
+class VerticalTrends:
+    """Rolling aggregates for one vertical"""
+
+    def __init__(self, detector):
+        self.detector = detector
+        self.started = None              # Earliest created_utc seen
+        self.watermark = 0               # Latest created_utc seen
+        self.watermark_keys = set()      # Posts counted at exactly that second (None: unknown)
+        self.buckets = deque(maxlen=detector.window_buckets)  # [start, posts, engagement]
+        self.posts = _Decayed()
+        self.engagement = _Decayed()
+        self.keywords = {}               # keyword -> _Decayed
+
+    def add(self, signal):
+        d = self.detector
+        # Input should be time-ordered; stragglers are counted at the watermark
+        now = max(signal['created_utc'], self.watermark)
+        if self.started is None:
+            self.started = now
+        if signal['created_utc'] > self.watermark:
+            self.watermark_keys = set()
+        if signal['created_utc'] == now and self.watermark_keys is not None:
+            self.watermark_keys.add(_post_key(signal))
+        self.watermark = now
+        engagement = signal['score'] + signal['comments']
+
+        bucket_start = now - now % d.bucket_seconds
+        if not self.buckets or self.buckets[-1][0] != bucket_start:
+            self.buckets.append([bucket_start, 0, 0])
+            # The window is measured in time, so quiet days age buckets out too
+            horizon = bucket_start - d.window_buckets * d.bucket_seconds
+            while self.buckets[0][0] <= horizon:
+                self.buckets.popleft()
+        self.buckets[-1][1] += 1
+        self.buckets[-1][2] += engagement
+
+        self.posts.add(now, 1, d.fast_lambda, d.slow_lambda)
+        self.engagement.add(now, engagement, d.fast_lambda, d.slow_lambda)
+        for keyword in keywords(signal['title']):
+            counter = self.keywords.get(keyword)
+            if counter is None:
+                counter = self.keywords[keyword] = _Decayed(updated=now)
+            counter.add(now, 1, d.fast_lambda, d.slow_lambda)
+
+        if len(self.keywords) > d.max_keywords * 1.25:
+            self._evict()
+
+    def _evict(self):
+        """Keep the max_keywords keywords with the most long-run activity"""
+        d = self.detector
+        for counter in self.keywords.values():
+            counter.decay_to(self.watermark, d.fast_lambda, d.slow_lambda)
+        keep = heapq.nlargest(d.max_keywords, self.keywords.items(), key=lambda item: item[1].slow)
+        self.keywords = dict(keep)
+
+    @property
+    def warm(self):
+        """True once the slow counters span about one slow half-life"""
+        return self.started is not None and self.watermark - self.started >= self.detector.slow_half_life
+
+    def _ratio(self, counter):
+        """fast rate / slow rate; both decayed counts normalized to events per second"""
+        d = self.detector
+        counter.decay_to(self.watermark, d.fast_lambda, d.slow_lambda)
+        # A steady stream seen for `age` seconds fills only 1 - e^(-lambda*age)
+        # of its steady-state count; divide that out so a young history is not
+        # read as a rising rate
+        age = self.watermark - self.started if self.started is not None else 0
+        fast_fill = -math.expm1(-d.fast_lambda * age) or 1.0
+        slow_fill = -math.expm1(-d.slow_lambda * age) or 1.0
+        slow_rate = counter.slow * d.slow_lambda / slow_fill
+        return counter.fast * d.fast_lambda / fast_fill / slow_rate if slow_rate else 0.0
+
+    def summary(self):
+        window_posts = sum(bucket[1] for bucket in self.buckets)
+        window_engagement = sum(bucket[2] for bucket in self.buckets)
+        return {
+            'watermark': self.watermark,
+            'window_posts': window_posts,
+            'window_engagement': window_engagement,
+            'posts_per_bucket': window_posts / len(self.buckets) if self.buckets else 0.0,
+            'latest_bucket_posts': self.buckets[-1][1] if self.buckets else 0,
+            'warm': self.warm,
+            'post_acceleration': self._ratio(self.posts) if self.warm else None,
+            'engagement_acceleration': self._ratio(self.engagement) if self.warm else None,
+        }
+
+    def accelerating(self, limit=10):
+        """[(keyword, fast/slow ratio, recent weight)] strongest first; empty until warm"""
+        d = self.detector
+        if not self.warm:
+            return []
+        flagged = []
+        for keyword, counter in self.keywords.items():
+            ratio = self._ratio(counter)
+            if ratio >= d.acceleration and counter.fast >= d.min_support:
+                flagged.append((keyword, ratio, counter.fast))
+        flagged.sort(key=lambda item: (-item[1], -item[2], item[0]))
+        return flagged[:limit]
+
+    def to_dict(self):
+        return {
+            'started': self.started,
+            'watermark': self.watermark,
+            'watermark_keys': sorted(self.watermark_keys) if self.watermark_keys is not None else None,
+            'buckets': list(self.buckets),
+            'posts': self.posts.to_list(),
+            'engagement': self.engagement.to_list(),
+            'keywords': {keyword: counter.to_list() for keyword, counter in self.keywords.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, detector, state):
+        trends = cls(detector)
+        trends.watermark = state['watermark']
+        trends.started = state.get('started', 0)  # Missing in older state files: assume a long history
+        keys = state.get('watermark_keys')  # Missing in older state files: treat the second as fully seen
+        trends.watermark_keys = set(keys) if keys is not None else None
+        trends.buckets.extend(state['buckets'])
+        trends.posts = _Decayed(*state['posts'])
+        trends.engagement = _Decayed(*state['engagement'])
+        trends.keywords = {keyword: _Decayed(*values) for keyword, values in state['keywords'].items()}
+        return trends
+
+
+class TrendDetector:
+    """Streams signals into per-vertical rolling aggregates"""
+
+    def __init__(self, bucket_seconds=DEFAULT_BUCKET_SECONDS, window_buckets=DEFAULT_WINDOW_BUCKETS,
+                 fast_half_life=DEFAULT_FAST_HALF_LIFE, slow_half_life=DEFAULT_SLOW_HALF_LIFE,
+                 max_keywords=DEFAULT_MAX_KEYWORDS, min_support=DEFAULT_MIN_SUPPORT,
+                 acceleration=DEFAULT_ACCELERATION):
+        if fast_half_life >= slow_half_life:
+            raise ValueError('fast_half_life must be shorter than slow_half_life')
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = window_buckets
+        self.fast_half_life = fast_half_life
+        self.slow_half_life = slow_half_life
+        self.fast_lambda = math.log(2) / fast_half_life
+        self.slow_lambda = math.log(2) / slow_half_life
+        self.max_keywords = max_keywords
+        self.min_support = min_support
+        self.acceleration = acceleration
+        self.verticals = {}
+
+    def vertical(self, name):
+        if name not in self.verticals:
+            self.verticals[name] = VerticalTrends(self)
+        return self.verticals[name]
+
+    def add(self, vertical, signal):
+        self.vertical(vertical).add(signal)
+
+    def update(self, vertical, signals, only_new=False):
+        """
+        Feed a batch; with only_new, posts already counted in a previous
+        batch are skipped: anything before the vertical's watermark, and
+        posts at the watermark second that were seen there (matched by id).
+        New posts sharing that second are still counted.
+        """
+        trends = self.vertical(vertical)
+        start = trends.watermark
+        seen = set(trends.watermark_keys) if trends.watermark_keys is not None else None
+        added = 0
+        for signal in signals:
+            if only_new and (signal['created_utc'] < start or (
+                    signal['created_utc'] == start and (seen is None or _post_key(signal) in seen))):
+                continue
+            trends.add(signal)
+            added += 1
+        return added
+
+    def _settings(self):
+        return {
+            'bucket_seconds': self.bucket_seconds,
+            'window_buckets': self.window_buckets,
+            'fast_half_life': self.fast_half_life,
+            'slow_half_life': self.slow_half_life,
+            'max_keywords': self.max_keywords,
+            'min_support': self.min_support,
+            'acceleration': self.acceleration,
+        }
+
+    def save(self, path=DEFAULT_STATE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': STATE_VERSION,
+                'settings': self._settings(),
+                'verticals': {name: trends.to_dict() for name, trends in self.verticals.items()},
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_STATE_PATH, **settings):
+        """Restore saved state, or start fresh with `settings` if there is none"""
+        if not os.path.exists(path):
+            return cls(**settings)
+        with open(path, 'r') as f:
+            state = json.load(f)
+        if state.get('version') != STATE_VERSION:
+            return cls(**settings)
+        detector = cls(**state['settings'])
+        for name, vertical_state in state['verticals'].items():
+            detector.verticals[name] = VerticalTrends.from_dict(detector, vertical_state)
+        return detector
+
+
+def iter_time_ordered(filepaths):
+    """Merge several created_utc-ordered files into one ordered stream"""
+    return heapq.merge(*(iter_signals(path) for path in filepaths),
+                       key=lambda signal: signal['created_utc'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ROUZE trending demand detector')
+    parser.add_argument('files', nargs='+', help='created_utc-ordered signal files (new batches)')
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH,
+                        help=f'Saved detector state (default {DEFAULT_STATE_PATH})')
+    parser.add_argument('--fresh', action='store_true', help='Ignore saved state and start over')
+    parser.add_argument('--acceleration', type=float, default=DEFAULT_ACCELERATION)
+    parser.add_argument('--min-support', type=float, default=DEFAULT_MIN_SUPPORT)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    settings = dict(acceleration=args.acceleration, min_support=args.min_support)
+    detector = TrendDetector(**settings) if args.fresh else TrendDetector.load(args.state, **settings)
+    detector.acceleration = args.acceleration
+    detector.min_support = args.min_support
+
+    by_vertical = {}
+    for filepath in args.files:
+        by_vertical.setdefault(vertical_of(filepath), []).append(filepath)
+
+    for vertical, filepaths in by_vertical.items():
+        try:
+            added = detector.update(vertical, iter_time_ordered(filepaths), only_new=True)
+        except (OSError, ValueError) as e:
+            print(f"❌ {vertical}: {e}")
+            continue
+
+        trends = detector.vertical(vertical)
+        summary = trends.summary()
+        print(f"\n{'='*60}")
+        print(f"📈 {vertical.upper()} DEMAND TRENDS (+{added} new posts)")
+        print(f"{'='*60}")
+        print(f"   • Posts in window: {summary['window_posts']} "
+              f"({summary['posts_per_bucket']:.1f}/bucket, latest {summary['latest_bucket_posts']})")
+        if summary['warm']:
+            print(f"   • Post-rate acceleration: {summary['post_acceleration']:.2f}x")
+            print(f"   • Engagement acceleration: {summary['engagement_acceleration']:.2f}x")
+        else:
+            days = (trends.watermark - trends.started) / DAY
+            print(f"   • Warming up: {days:.1f} of {detector.slow_half_life / DAY:.0f} days of history")
+
+        flagged = trends.accelerating(args.top)
+        if flagged:
+            print(f"\n🚀 Accelerating topics:")
+            for i, (keyword, ratio, weight) in enumerate(flagged, 1):
+                print(f"   {i}. {keyword} — {ratio:.1f}x (recent weight {weight:.1f})")
+        else:
+            print(f"\n   No accelerating topics yet")
+
+    detector.save(args.state)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())